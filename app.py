@@ -1,13 +1,29 @@
 import dash
-from dash import dcc, html, Input, Output, callback
-import plotly.express as px
+from dash import dcc, html, Input, Output, State, Patch, ClientsideFunction
+from dash.exceptions import PreventUpdate
+from functools import wraps
 import plotly.graph_objects as go
+import plotly.io as pio
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import dash_bootstrap_components as dbc
 from n8n_integration import N8nIntegration, get_n8n_integration_status
+from data_backend import cube_trend, day_range, RESOLUTION_PERCENTILES
+from dataset_registry import DatasetRegistry
+from figure_cache import CachedFigure, create_figure_cache, prepare_figure
+from selection_cache import SelectionCache
+from response_encoding import create_response_compressor, raw_json
+from live_updates import EventBroadcaster, DataWatcher
+from sla_timers import SlaTimerService, timer_lock_path
+from search_index import MAX_PREFIX_TERMS
+from data_export import available_formats, stream_csv, stream_parquet, EXPORT_FORMATS
+from flask import Response, request, stream_with_context
 import json
+import os
+from urllib.parse import parse_qs, urlencode
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
 
 # Initialize the Dash app with professional styling
 app = dash.Dash(__name__,
@@ -22,27 +38,50 @@ app.title = "IT Support Dashboard - Power BI Clone"
 n8n = N8nIntegration()
 n8n_status = get_n8n_integration_status()
 
-# Load and preprocess data
-def load_data():
-    """Load and preprocess the ticket data"""
-    try:
-        df = pd.read_csv('sample_tickets.csv')
-        df['created_date'] = pd.to_datetime(df['created_date'])
-        df['resolved_date'] = pd.to_datetime(df['resolved_date'])
-        
-        # Add derived columns for analysis
-        df['created_week'] = df['created_date'].dt.isocalendar().week
-        df['created_weekday'] = df['created_date'].dt.day_name()
-        df['created_month'] = df['created_date'].dt.strftime('%Y-%m')
-        df['days_to_resolve'] = (df['resolved_date'] - df['created_date']).dt.days
-        
-        return df
-    except FileNotFoundError:
-        # Return empty dataframe if file doesn't exist
-        return pd.DataFrame()
+# Ticket datasets served by this process, each loaded on first use through the
+# configured backend (DuckDB when available, pandas otherwise) within a memory budget
+registry = DatasetRegistry.from_environment()
+
+# Load the default dataset up front; it backs the first page load
+registry.get()
+
+# One watcher per process detects data and n8n status changes and pushes them to
+# every open dashboard over server-sent events, instead of each browser polling
+broadcaster = EventBroadcaster()
+broadcaster.publish('alert-state', n8n_status)
+# SLA warnings and breaches fire from per-ticket deadline timers, run by one
+# process among those serving the same ticket sources
+sla_timers = SlaTimerService(n8n, lock_path=timer_lock_path(registry.sources))
+data_watcher = DataWatcher(registry, broadcaster, n8n, sla_timers)
+
+# Rendered figures keyed by (chart id, filters, data version)
+figure_cache = create_figure_cache()
+
+# The page, layout, dependency and callback responses are brotli/gzip compressed
+# above a size threshold; streamed and already encoded responses pass through
+response_compressor = create_response_compressor(
+    app.config.routes_pathname_prefix + path for path in ('', '_dash-layout', '_dash-dependencies', '_dash-update-component'))
+response_compressor.init_app(app.server)
 
-# Load data
-df = load_data()
+# Client-side filtering mode: the browser receives a compact aggregate store once
+# per data version and applies the filters itself, without server round trips
+CLIENTSIDE_MODE = os.environ.get('DASHBOARD_CLIENTSIDE', '').lower() in ('1', 'true', 'yes')
+
+def server_callback(*args, **kwargs):
+    """Register a server-side callback unless client-side filtering mode replaces it"""
+    if CLIENTSIDE_MODE:
+        return lambda func: func
+    return app.callback(*args, **kwargs)
+
+# Chart callback mode: 'combined' (default) updates all six charts from one request,
+# building the figures in parallel; 'split' registers one callback per chart
+CHART_CALLBACK_MODE = os.environ.get('DASHBOARD_CHART_CALLBACKS', 'combined').lower()
+
+def chart_callback(*args, **kwargs):
+    """Register a per-chart callback in split mode; the combined callback replaces them otherwise"""
+    if CHART_CALLBACK_MODE != 'split':
+        return lambda func: func
+    return server_callback(*args, **kwargs)
 
 # Define color schemes
 PRIORITY_COLORS = {
@@ -60,140 +99,229 @@ STATUS_COLORS = {
     'Pending': '#17a2b8'
 }
 
+# Shared chart template: the layout styling common to every figure, registered
+# once and kept compact because each figure response embeds its template
+pio.templates['dashboard'] = go.layout.Template(layout=dict(
+    font={'family': 'Segoe UI', 'color': '#2a3f5f'},
+    title={'x': 0.5, 'xanchor': 'center', 'font': {'size': 18, 'family': 'Segoe UI'}},
+    plot_bgcolor='rgba(0,0,0,0)',
+    paper_bgcolor='rgba(0,0,0,0)',
+    margin=dict(l=20, r=20, t=60, b=20),
+    hoverlabel={'align': 'left'},
+    xaxis={'gridcolor': '#EBF0F8', 'linecolor': '#EBF0F8', 'zerolinecolor': '#EBF0F8',
+           'zerolinewidth': 2, 'ticks': '', 'automargin': True, 'title': {'standoff': 15}},
+    yaxis={'gridcolor': '#EBF0F8', 'linecolor': '#EBF0F8', 'zerolinecolor': '#EBF0F8',
+           'zerolinewidth': 2, 'ticks': '', 'automargin': True, 'title': {'standoff': 15}},
+    annotationdefaults={'arrowcolor': '#2a3f5f', 'arrowhead': 0, 'arrowwidth': 1}
+))
+pio.templates.default = 'dashboard'
+
+CHART_IDS = [
+    'ticket-trends-chart',
+    'priority-distribution-chart',
+    'sla-performance-chart',
+    'department-analysis-chart',
+    'weekly-trends-chart',
+    'status-distribution-chart'
+]
+
+TREND_AXIS_TITLES = {
+    'day': 'Date',
+    'week': 'Week Starting',
+    'month': 'Month'
+}
+
+# Trend rendering limits: points per trace after LTTB downsampling, and the
+# series length above which traces are drawn with WebGL instead of SVG
+TREND_MAX_RENDER_POINTS = 1500
+TREND_WEBGL_THRESHOLD = 500
+
 # Create KPI cards
-def create_kpi_card(title, value, subtitle="", color="primary"):
+def create_kpi_card(title, value, subtitle="", color="primary", card_id=None):
+    """Create a KPI card; ``card_id`` makes its value and subtitle addressable by callbacks"""
+    value_props = {'id': f'{card_id}-value'} if card_id else {}
+    subtitle_props = {'id': f'{card_id}-subtitle'} if card_id else {}
     return dbc.Card([
         dbc.CardBody([
-            html.H4(value, className="card-title text-center", style={'color': f'var(--bs-{color})', 'font-weight': 'bold'}),
+            html.H4(value, className="card-title text-center", style={'color': f'var(--bs-{color})', 'font-weight': 'bold'}, **value_props),
             html.P(title, className="card-text text-center text-muted"),
-            html.Small(subtitle, className="text-center d-block text-muted")
+            html.Small(subtitle, className="text-center d-block text-muted", **subtitle_props)
         ])
     ], className="mb-3")
 
-# Calculate KPIs
-if not df.empty:
-    total_tickets = len(df)
-    open_tickets = len(df[df['status'].isin(['Open', 'In Progress', 'Pending'])])
-    sla_compliance = (df['sla_met'].sum() / len(df) * 100) if len(df) > 0 else 0
-    avg_resolution_time = df['resolution_hours'].mean() if 'resolution_hours' in df.columns else 0
-else:
-    total_tickets = 0
-    open_tickets = 0
-    sla_compliance = 0
-    avg_resolution_time = 0
-
-# Dashboard layout
-app.layout = dbc.Container([
-    # Header
-    dbc.Row([
-        dbc.Col([
-            html.H1("IT Support Dashboard", className="text-center mb-4", style={'color': '#2c3e50'}),
-            html.Hr()
-        ])
-    ]),
-    
-    # KPI Cards Row
-    dbc.Row([
-        dbc.Col([
-            create_kpi_card("Total Tickets", f"{total_tickets:,}", "All time", "info")
-        ], width=3),
-        dbc.Col([
-            create_kpi_card("Open Tickets", f"{open_tickets:,}", "Active workload", "warning")
-        ], width=3),
-        dbc.Col([
-            create_kpi_card("SLA Compliance", f"{sla_compliance:.1f}%", "Target: 95%", "success" if sla_compliance >= 95 else "danger")
-        ], width=3),
-        dbc.Col([
-            create_kpi_card("Avg Resolution", f"{avg_resolution_time:.1f}h", "Mean time", "primary")
-        ], width=3),
-    ], className="mb-4"),
-    
-    # Filters Row
-    dbc.Row([
-        dbc.Col([
-            html.Label("Date Range:", className="fw-bold"),
-            dcc.DatePickerRange(
-                id='date-range-picker',
-                start_date=df['created_date'].min() if not df.empty else datetime.now() - timedelta(days=30),
-                end_date=df['created_date'].max() if not df.empty else datetime.now(),
-                display_format='YYYY-MM-DD'
-            )
-        ], width=3),
-        dbc.Col([
-            html.Label("Priority:", className="fw-bold"),
-            dcc.Dropdown(
-                id='priority-filter',
-                options=[{'label': 'All', 'value': 'all'}] + [{'label': p, 'value': p} for p in df['priority'].unique()] if not df.empty else [],
-                value='all',
-                clearable=False
-            )
-        ], width=3),
-        dbc.Col([
-            html.Label("Department:", className="fw-bold"),
-            dcc.Dropdown(
-                id='department-filter',
-                options=[{'label': 'All', 'value': 'all'}] + [{'label': d, 'value': d} for d in df['department'].unique()] if not df.empty else [],
-                value='all',
-                clearable=False
-            )
-        ], width=3),
-        dbc.Col([
-            html.Label("Status:", className="fw-bold"),
-            dcc.Dropdown(
-                id='status-filter',
-                options=[{'label': 'All', 'value': 'all'}] + [{'label': s, 'value': s} for s in df['status'].unique()] if not df.empty else [],
-                value='all',
-                clearable=False
-            )
-        ], width=3),
-    ], className="mb-4"),
-    
-    # Charts Row 1
-    dbc.Row([
-        dbc.Col([
-            dcc.Graph(id='ticket-trends-chart')
-        ], width=8),
-        dbc.Col([
-            dcc.Graph(id='priority-distribution-chart')
-        ], width=4),
-    ], className="mb-4"),
-    
-    # Charts Row 2
-    dbc.Row([
-        dbc.Col([
-            dcc.Graph(id='sla-performance-chart')
-        ], width=6),
-        dbc.Col([
-            dcc.Graph(id='department-analysis-chart')
-        ], width=6),
-    ], className="mb-4"),
-    
-    # Charts Row 3
-    dbc.Row([
-        dbc.Col([
-            dcc.Graph(id='weekly-trends-chart')
-        ], width=8),
-        dbc.Col([
-            dcc.Graph(id='status-distribution-chart')
-        ], width=4),
-    ], className="mb-4"),
-    
-    # Footer
-    html.Hr(),
-    html.P("IT Support Dashboard - Power BI Clone built with Plotly Dash",
-           className="text-center text-muted"),
-    
-    # Hidden div to store n8n status
-    html.Div(id='n8n-status', style={'display': 'none'}, children=json.dumps(n8n_status)),
-    
-    # Interval component for real-time updates
-    dcc.Interval(
-        id='interval-component',
-        interval=30*1000,  # Update every 30 seconds
-        n_intervals=0
-    )
+# Dashboard layout, built per page load so the filters start from the data as it is now
+def serve_layout():
+    default_backend = registry.get()
+    date_min, date_max = default_backend.date_bounds()
+    filter_options = default_backend.filter_options()
     
-], fluid=True)
+    return dbc.Container([
+        # Header
+        dbc.Row([
+            dbc.Col([
+                html.H1("IT Support Dashboard", className="text-center mb-4", style={'color': '#2c3e50'}),
+                html.Hr()
+            ])
+        ]),
+        
+        # Dataset selector, shown when this process serves more than one dataset
+        dbc.Row([
+            dbc.Col([
+                html.Label("Dataset:", className="fw-bold"),
+                dcc.Dropdown(
+                    id='dataset-select',
+                    options=[{'label': name, 'value': name} for name in registry.names],
+                    value=registry.default,
+                    clearable=False
+                )
+            ], width=3)
+        ], className="mb-4", style={} if len(registry.names) > 1 else {'display': 'none'}),
+        
+        # KPI Cards Row
+        dbc.Row([
+            dbc.Col([
+                create_kpi_card("Total Tickets", "-", "Current selection", "info", card_id='kpi-total-tickets')
+            ], width=2),
+            dbc.Col([
+                create_kpi_card("Open Tickets", "-", "Active workload", "warning", card_id='kpi-open-tickets')
+            ], width=2),
+            dbc.Col([
+                create_kpi_card("SLA Compliance", "-", "Target: 95%", "success", card_id='kpi-sla-compliance')
+            ], width=2),
+            dbc.Col([
+                create_kpi_card("Avg Resolution", "-", "Mean time", "primary", card_id='kpi-avg-resolution')
+            ], width=2),
+            dbc.Col([
+                create_kpi_card("Unique Requesters", "-", "Distinct requesters", "info", card_id='kpi-unique-requesters')
+            ], width=2),
+            dbc.Col([
+                create_kpi_card("Active Agents", "-", "Distinct assignees", "secondary", card_id='kpi-active-agents')
+            ], width=2),
+        ], className="mb-4"),
+        
+        # Filters Row
+        dbc.Row([
+            dbc.Col([
+                html.Label("Date Range:", className="fw-bold"),
+                dcc.DatePickerRange(
+                    id='date-range-picker',
+                    start_date=date_min if date_min is not None else datetime.now() - timedelta(days=30),
+                    end_date=date_max if date_max is not None else datetime.now(),
+                    display_format='YYYY-MM-DD'
+                )
+            ], width=3),
+            dbc.Col([
+                html.Label("Priority:", className="fw-bold"),
+                dcc.Dropdown(
+                    id='priority-filter',
+                    options=[{'label': 'All', 'value': 'all'}] + [{'label': p, 'value': p} for p in filter_options['priority']] if not default_backend.empty else [],
+                    value='all',
+                    clearable=False
+                )
+            ], width=3),
+            dbc.Col([
+                html.Label("Department:", className="fw-bold"),
+                dcc.Dropdown(
+                    id='department-filter',
+                    options=[{'label': 'All', 'value': 'all'}] + [{'label': d, 'value': d} for d in filter_options['department']] if not default_backend.empty else [],
+                    value='all',
+                    clearable=False
+                )
+            ], width=3),
+            dbc.Col([
+                html.Label("Status:", className="fw-bold"),
+                dcc.Dropdown(
+                    id='status-filter',
+                    options=[{'label': 'All', 'value': 'all'}] + [{'label': s, 'value': s} for s in filter_options['status']] if not default_backend.empty else [],
+                    value='all',
+                    clearable=False
+                )
+            ], width=3),
+        ], className="mb-2"),
+        
+        # Active cross-filters, set by clicking on the charts
+        dbc.Row([
+            dbc.Col([
+                html.Span(id='cross-filter-summary'),
+                dbc.Button("Clear chart filters", id='cross-filter-clear', size="sm",
+                           color="link", className="ms-2", style={'display': 'none'})
+            ], width=12)
+        ], className="mb-4"),
+        
+        # Full-text search over ticket titles and descriptions, within the current filters
+        dbc.Row([
+            dbc.Col([
+                dbc.InputGroup([
+                    dbc.InputGroupText(html.I(className="fas fa-search")),
+                    dbc.Input(id='ticket-search', type='search',
+                              placeholder="Search ticket titles and descriptions...")
+                ]),
+                html.Div(id='ticket-search-results', className="mt-2")
+            ], width=12)
+        ], className="mb-4"),
+        
+        # Charts Row 1
+        dbc.Row([
+            dbc.Col([
+                dcc.Graph(id='ticket-trends-chart')
+            ], width=8),
+            dbc.Col([
+                dcc.Graph(id='priority-distribution-chart')
+            ], width=4),
+        ], className="mb-4"),
+        
+        # Charts Row 2
+        dbc.Row([
+            dbc.Col([
+                dcc.Graph(id='sla-performance-chart')
+            ], width=6),
+            dbc.Col([
+                dcc.Graph(id='department-analysis-chart')
+            ], width=6),
+        ], className="mb-4"),
+        
+        # Charts Row 3
+        dbc.Row([
+            dbc.Col([
+                dcc.Graph(id='weekly-trends-chart')
+            ], width=8),
+            dbc.Col([
+                dcc.Graph(id='status-distribution-chart')
+            ], width=4),
+        ], className="mb-4"),
+        
+        # Footer
+        html.Hr(),
+        html.P("IT Support Dashboard - Power BI Clone built with Plotly Dash",
+               className="text-center text-muted"),
+        
+        # Structure signature of each chart's current figure, used to send Patch updates
+        *[dcc.Store(id=f'{chart_id}-structure') for chart_id in CHART_IDS],
+        
+        # Page URL; ?dataset=<name> selects the dataset
+        dcc.Location(id='url', refresh=False),
+        
+        # Cross-filter predicates from chart clicks: cube column -> value
+        dcc.Store(id='cross-filter', data={}),
+        
+        # Pre-aggregated tickets for client-side filtering mode
+        dcc.Store(id='aggregate-store'),
+        
+        # Export URL for the current filters, followed by the Export Data menu action
+        html.A(id='export-link', style={'display': 'none'}),
+        
+        # Hidden div to store n8n status, updated from the event stream
+        html.Div(id='n8n-status', style={'display': 'none'}, children=json.dumps(n8n_status)),
+        
+        # Current data version, set by assets/dashboard.js when the server pushes a new one
+        dcc.Store(id='data-version', data=registry.versions()),
+        
+        # Latest created_date of the selected dataset, to tell whether the date range runs through it
+        dcc.Store(id='latest-date', data=str(date_max) if date_max is not None else None)
+        
+    ], fluid=True)
+
+app.layout = serve_layout
 
 # Enhanced chart configurations
 def get_enhanced_chart_config():
@@ -219,132 +347,531 @@ def get_enhanced_chart_config():
         }
     }
 
-# Add n8n integration callbacks
+# Server-sent events replacing per-client polling
+@app.server.before_request
+def start_data_watcher():
+    """Start the data watcher with the first request, so only serving processes run it"""
+    if not data_watcher.is_alive():
+        try:
+            data_watcher.start()
+        except RuntimeError:
+            pass  # Started by a concurrent request
+
+@app.server.route('/_dashboard/events')
+def data_events():
+    """Stream data-version and n8n status changes to the browser"""
+    response = Response(stream_with_context(broadcaster.stream()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Keep reverse proxies from buffering the stream
+    return response
+
+# The KPI and chart callbacks of one filter change fire together; these caches let
+# the first of them compute a selection while the others wait for its result
+aggregate_cache = SelectionCache(maxsize=64)
+refined_cache = SelectionCache(maxsize=256)
+distinct_cache = SelectionCache(maxsize=64)
+
+def _discard_selections(dataset):
+    """Drop the cached selections of a dataset that was evicted or refreshed"""
+    for cache in (aggregate_cache, refined_cache, distinct_cache):
+        cache.discard(dataset)
+
+registry.add_listener(_discard_selections)
+
+def _aggregate_selection(dataset, data_version, start_date, end_date, priority, department, status):
+    return aggregate_cache.get_or_compute(
+        (dataset, data_version, start_date, end_date, priority, department, status),
+        lambda: registry.get(dataset).aggregate(start_date, end_date, priority, department, status))
+
+def _refined_selection(dataset, data_version, start_date, end_date, priority, department, status, cross_filter):
+    def refine():
+        base = _aggregate_selection(dataset, data_version, start_date, end_date, priority, department, status)
+        return registry.get(dataset).refine(base, start_date, end_date, priority, department, status, dict(cross_filter))
+    return refined_cache.get_or_compute(
+        (dataset, data_version, start_date, end_date, priority, department, status, cross_filter), refine)
+
+def get_selection_aggregates(dataset, start_date, end_date, priority, department, status, cross_filter=()):
+    """Aggregate a filter selection once and share the result across the KPI and chart callbacks"""
+    dataset = registry.resolve(dataset)
+    version = registry.get(dataset).version
+    if cross_filter:
+        # Narrowed from the cached selection's cubes rather than re-aggregated from the tickets
+        return _refined_selection(dataset, version, start_date, end_date, priority, department, status, cross_filter)
+    return _aggregate_selection(dataset, version, start_date, end_date, priority, department, status)
+
+def _distinct_counts(dataset, data_version, start_date, end_date, priority, department, status, cross_filter=()):
+    return distinct_cache.get_or_compute(
+        (dataset, data_version, start_date, end_date, priority, department, status, cross_filter),
+        lambda: registry.get(dataset).distinct_counts(start_date, end_date, priority, department, status,
+                                                      dict(cross_filter)))
+
+# Cross-filtering: clicking a bar or slice adds a predicate on the clicked category.
+# Chart id -> (cube column, clickData point attribute holding the category)
+CROSS_FILTER_SOURCES = {
+    'priority-distribution-chart': ('priority', 'label'),
+    'sla-performance-chart': ('priority', 'x'),
+    'department-analysis-chart': ('department', 'y'),
+    'weekly-trends-chart': ('created_weekday', 'x'),
+    'status-distribution-chart': ('status', 'label')
+}
+
+CROSS_FILTER_LABELS = {
+    'priority': 'Priority',
+    'department': 'Department',
+    'status': 'Status',
+    'created_weekday': 'Weekday'
+}
+
+def chart_predicates(chart_id, cross_filter):
+    """Predicates a chart is filtered by: all of them except the one it sets itself"""
+    own_column = CROSS_FILTER_SOURCES.get(chart_id, (None,))[0]
+    return tuple(sorted((column, value) for column, value in (cross_filter or {}).items()
+                        if column != own_column))
+
+def cached_figure(chart_id):
+    """Serve a chart builder from the figure cache, keyed by chart, dataset, filters and data version"""
+    def decorator(build):
+        @wraps(build)
+        def wrapper(dataset, *filters):
+            dataset = registry.resolve(dataset)
+            filters = (dataset, *filters)
+            key = figure_cache.make_key(chart_id, filters, registry.get(dataset).version)
+            return figure_cache.get_or_create(key, lambda: build(*filters))
+        return wrapper
+    return decorator
+
+def figure_response(figure, client_structure):
+    """
+    Return (figure, structure) for a chart callback
+    
+    When the browser already shows a figure with the same structure, only the
+    changed data arrays are sent as a dash.Patch. Otherwise the figure's
+    cached JSON is sent as it is.
+    """
+    if not isinstance(figure, CachedFigure):
+        figure = prepare_figure(figure)
+    
+    if figure.structure != client_structure:
+        return raw_json(figure.body, figure.figure), figure.structure
+    
+    patch = Patch()
+    for i, arrays in enumerate(figure.trace_arrays):
+        for key, value in arrays.items():
+            if key == 'marker.color':
+                patch['data'][i]['marker']['color'] = value
+            else:
+                patch['data'][i][key] = value
+    if 'uirevision' in figure.figure.get('layout', {}):
+        patch['layout']['uirevision'] = figure.figure['layout']['uirevision']
+    return patch, dash.no_update
+
+@app.server.route('/_dashboard/cache-stats')
+def cache_stats():
+    """Expose figure and selection cache hit/miss counters for monitoring"""
+    return {**figure_cache.stats(), 'selections': aggregate_cache.stats()}
+
+@app.server.route('/_dashboard/compression-stats')
+def compression_stats():
+    """Expose compressed response counts and bytes saved per encoding"""
+    return response_compressor.stats()
+
+@app.server.route('/_dashboard/sla-timers')
+def sla_timer_stats():
+    """Expose tracked tickets, pending timers and fired alert counts"""
+    return sla_timers.stats()
+
+@app.server.route('/_dashboard/datasets')
+def dataset_stats():
+    """Expose per-dataset load, hit, eviction and memory statistics"""
+    return registry.stats()
+
+@app.server.route('/_dashboard/export')
+def export_tickets():
+    """Stream the tickets matching the dashboard filters as gzip CSV or Parquet"""
+    file_format = request.args.get('format', 'csv')
+    if file_format not in available_formats():
+        return {'error': f"Unsupported export format '{file_format}'", 'formats': available_formats()}, 400
+    
+    dataset = request.args.get('dataset')
+    if dataset is not None and dataset not in registry.sources:
+        return {'error': f"Unknown dataset '{dataset}'", 'datasets': registry.names}, 404
+    
+    # Bad dates fail here rather than inside the stream, after the 200 has been sent
+    dates = {name: request.args.get(name) or None for name in ('start_date', 'end_date')}
+    for name, value in dates.items():
+        try:
+            valid = value is None or not pd.isna(pd.Timestamp(value))
+        except ValueError:
+            valid = False
+        if not valid:
+            return {'error': f"Invalid {name} '{value}'"}, 400
+    
+    chunks = registry.get(dataset).iter_select(
+        dates['start_date'],
+        dates['end_date'],
+        request.args.get('priority', 'all'),
+        request.args.get('department', 'all'),
+        request.args.get('status', 'all')
+    )
+    
+    headers = {}
+    if file_format == 'parquet':
+        body = stream_parquet(chunks)
+    else:
+        # Parquet compresses internally; CSV is gzipped on the fly when the client accepts it
+        gzip = request.accept_encodings['gzip'] > 0
+        body = stream_csv(chunks, compress=gzip)
+        if gzip:
+            headers['Content-Encoding'] = 'gzip'
+        headers['Vary'] = 'Accept-Encoding'
+    
+    filename = f"tickets_{registry.resolve(dataset)}_{datetime.now():%Y%m%d_%H%M%S}.{EXPORT_FORMATS[file_format]['extension']}"
+    headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return Response(body, mimetype=EXPORT_FORMATS[file_format]['mimetype'], headers=headers)
+
+app.clientside_callback(
+    ClientsideFunction(namespace='dashboard', function_name='exportUrl'),
+    Output('export-link', 'href'),
+    [Input('dataset-select', 'value'),
+     Input('date-range-picker', 'start_date'),
+     Input('date-range-picker', 'end_date'),
+     Input('priority-filter', 'value'),
+     Input('department-filter', 'value'),
+     Input('status-filter', 'value')]
+)
+
+# Dataset selection callbacks; the ?dataset= URL parameter and the dropdown are kept in sync
+@app.callback(
+    [Output('dataset-select', 'value'),
+     Output('url', 'search')],
+    [Input('url', 'search'),
+     Input('dataset-select', 'value')]
+)
+def sync_dataset_selection(search, dataset):
+    """Select the dataset named in the URL, and record dropdown changes in the URL"""
+    params = parse_qs((search or '').lstrip('?'))
+    if dash.callback_context.triggered_id == 'dataset-select':
+        params['dataset'] = [dataset]
+        return dash.no_update, '?' + urlencode(params, doseq=True)
+    
+    requested = registry.resolve(params.get('dataset', [None])[0])
+    return (requested if requested != dataset else dash.no_update), dash.no_update
+
 @app.callback(
-    Output('n8n-status', 'children'),
-    [Input('interval-component', 'n_intervals')],
+    [Output('date-range-picker', 'start_date'),
+     Output('date-range-picker', 'end_date'),
+     Output('latest-date', 'data'),
+     Output('priority-filter', 'options'),
+     Output('priority-filter', 'value'),
+     Output('department-filter', 'options'),
+     Output('department-filter', 'value'),
+     Output('status-filter', 'options'),
+     Output('status-filter', 'value')],
+    [Input('dataset-select', 'value'),
+     Input('data-version', 'data')],
+    [State('date-range-picker', 'end_date'),
+     State('latest-date', 'data')],
     prevent_initial_call=True
 )
-def update_n8n_status(n):
-    """Update n8n integration status"""
-    try:
-        status = get_n8n_integration_status()
-        
-        # Only trigger workflows if n8n is available and we have data
-        if status.get('available', False) and not df.empty:
-            try:
-                # Set up SLA monitoring (non-blocking)
-                n8n.setup_sla_monitoring(df)
-                
-                # Check for critical escalations (non-blocking)
-                n8n.escalate_critical_tickets(df)
-                
-            except Exception as workflow_error:
-                print(f"n8n workflow error: {workflow_error}")
-                status['workflow_error'] = str(workflow_error)
-        
-        return json.dumps(status)
-    except Exception as e:
-        print(f"n8n status error: {e}")
-        return json.dumps({
-            'available': False,
-            'error': str(e),
-            'workflows': []
-        })
-
-# Callback for filtering data
-def filter_data(start_date, end_date, priority, department, status):
-    """Filter dataframe based on user selections"""
-    if df.empty:
-        return df
-    
-    filtered_df = df.copy()
-    
-    # Date filter
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['created_date'] >= start_date) &
-            (filtered_df['created_date'] <= end_date)
-        ]
+def update_dataset_filters(dataset, data_version, end_date, latest_date):
+    """
+    Reset the filters to the full range and values of the selected dataset
     
-    # Priority filter
-    if priority != 'all':
-        filtered_df = filtered_df[filtered_df['priority'] == priority]
+    When the dataset's data changes instead, a date range that ran through its
+    latest ticket is extended to the new latest ticket; other filters are kept.
+    """
+    backend = registry.get(dataset)
+    if backend.empty:
+        if dash.callback_context.triggered_id == 'data-version':
+            raise PreventUpdate
+        return (dash.no_update, dash.no_update, None) + ([], 'all') * 3
     
-    # Department filter
-    if department != 'all':
-        filtered_df = filtered_df[filtered_df['department'] == department]
+    start, end = backend.date_bounds()
+    if dash.callback_context.triggered_id == 'data-version':
+        if latest_date is not None and str(end) == latest_date:
+            raise PreventUpdate
+        through_latest = latest_date is None or end_date is None or \
+            pd.Timestamp(end_date).date() >= pd.Timestamp(latest_date).date()
+        return (dash.no_update, end if through_latest else dash.no_update, str(end)) + (dash.no_update,) * 6
+    
+    options = backend.filter_options()
+    outputs = [start, end, str(end)]
+    for column in ('priority', 'department', 'status'):
+        outputs += [[{'label': 'All', 'value': 'all'}] + [{'label': v, 'value': v} for v in options[column]], 'all']
+    return tuple(outputs)
+
+# Cross-filter callback; registered on the server in both modes since it only
+# rewrites the predicate store, which the chart callbacks then read
+@app.callback(
+    [Output('cross-filter', 'data'),
+     Output('cross-filter-summary', 'children'),
+     Output('cross-filter-clear', 'style')],
+    [*[Input(chart_id, 'clickData') for chart_id in CROSS_FILTER_SOURCES],
+     Input('cross-filter-clear', 'n_clicks'),
+     Input('dataset-select', 'value')],
+    State('cross-filter', 'data'),
+    prevent_initial_call=True
+)
+def update_cross_filter(*args):
+    """Toggle the predicate for a clicked chart category, or clear them all"""
+    *click_data, _, _, cross_filter = args
+    cross_filter = dict(cross_filter or {})
+    triggered = dash.callback_context.triggered_id
     
-    # Status filter
-    if status != 'all':
-        filtered_df = filtered_df[filtered_df['status'] == status]
+    if triggered in ('cross-filter-clear', 'dataset-select'):
+        cross_filter = {}
+    elif triggered in CROSS_FILTER_SOURCES:
+        clicked = click_data[list(CROSS_FILTER_SOURCES).index(triggered)]
+        if not clicked or not clicked.get('points'):
+            raise PreventUpdate
+        column, attribute = CROSS_FILTER_SOURCES[triggered]
+        value = clicked['points'][0].get(attribute)
+        if value is None:
+            raise PreventUpdate
+        # Clicking the selected category again removes the predicate
+        if cross_filter.get(column) == value:
+            del cross_filter[column]
+        else:
+            cross_filter[column] = value
     
-    return filtered_df
+    badges = [
+        dbc.Badge(f"{CROSS_FILTER_LABELS[column]}: {value}", color="info", className="me-1")
+        for column, value in sorted(cross_filter.items())
+    ]
+    return cross_filter, badges, {} if cross_filter else {'display': 'none'}
 
-# Ticket trends chart callback
+# KPI cards callback
+@server_callback(
+    [Output('kpi-total-tickets-value', 'children'),
+     Output('kpi-open-tickets-value', 'children'),
+     Output('kpi-sla-compliance-value', 'children'),
+     Output('kpi-sla-compliance-value', 'style'),
+     Output('kpi-avg-resolution-value', 'children'),
+     Output('kpi-avg-resolution-subtitle', 'children')],
+    [Input('dataset-select', 'value'),
+     Input('date-range-picker', 'start_date'),
+     Input('date-range-picker', 'end_date'),
+     Input('priority-filter', 'value'),
+     Input('department-filter', 'value'),
+     Input('status-filter', 'value'),
+     Input('data-version', 'data'),
+     Input('cross-filter', 'data')]
+)
+def update_kpis(dataset, start_date, end_date, priority, department, status, data_version, cross_filter):
+    agg = get_selection_aggregates(dataset, start_date, end_date, priority, department, status,
+                                   chart_predicates(None, cross_filter))
+    
+    if agg['total'] == 0:
+        return "0", "0", "0.0%", {'color': 'var(--bs-danger)', 'font-weight': 'bold'}, "0.0h", "No resolved tickets"
+    
+    sla_color = "success" if agg['sla_compliance'] >= 95 else "danger"
+    percentiles = agg['resolution_percentiles']
+    return (
+        f"{agg['total']:,}",
+        f"{agg['open']:,}",
+        f"{agg['sla_compliance']:.1f}%",
+        {'color': f'var(--bs-{sla_color})', 'font-weight': 'bold'},
+        f"{agg['avg_resolution']:.1f}h",
+        " · ".join(f"p{p}: {percentiles[p]:.1f}h" for p in RESOLUTION_PERCENTILES)
+    )
+
+# Workload breadth KPIs come from HyperLogLog sketches the aggregate store does
+# not carry, so this callback stays on the server in client-side mode too
 @app.callback(
-    Output('ticket-trends-chart', 'figure'),
-    [Input('date-range-picker', 'start_date'),
+    [Output('kpi-unique-requesters-value', 'children'),
+     Output('kpi-active-agents-value', 'children')],
+    [Input('dataset-select', 'value'),
+     Input('date-range-picker', 'start_date'),
      Input('date-range-picker', 'end_date'),
      Input('priority-filter', 'value'),
      Input('department-filter', 'value'),
-     Input('status-filter', 'value')]
+     Input('status-filter', 'value'),
+     Input('data-version', 'data'),
+     Input('cross-filter', 'data')]
+)
+def update_workload_kpis(dataset, start_date, end_date, priority, department, status, data_version, cross_filter):
+    dataset = registry.resolve(dataset)
+    counts = _distinct_counts(dataset, registry.get(dataset).version, start_date, end_date, priority, department, status,
+                              chart_predicates(None, cross_filter))
+    return f"{counts['requesters']:,}", f"{counts['assignees']:,}"
+
+# Ticket search callback; the index lives on the server, so this runs there in every mode
+@app.callback(
+    Output('ticket-search-results', 'children'),
+    [Input('ticket-search', 'value'),
+     Input('dataset-select', 'value'),
+     Input('date-range-picker', 'start_date'),
+     Input('date-range-picker', 'end_date'),
+     Input('priority-filter', 'value'),
+     Input('department-filter', 'value'),
+     Input('status-filter', 'value'),
+     Input('cross-filter', 'data'),
+     Input('data-version', 'data')]
 )
-def update_ticket_trends(start_date, end_date, priority, department, status):
-    filtered_df = filter_data(start_date, end_date, priority, department, status)
+def update_ticket_search(query, dataset, start_date, end_date, priority, department, status, cross_filter, data_version):
+    """List the newest tickets matching the search text and the current filters"""
+    result = registry.get(dataset).search(query or '', start_date, end_date, priority, department, status,
+                            dict(chart_predicates(None, cross_filter)))
+    if result is None:
+        return None
+    # The last word is expanded to at most MAX_PREFIX_TERMS words, so a short one can miss matches
+    truncated = html.Small(f" Only the first {MAX_PREFIX_TERMS} words starting with the last word were searched; "
+                           "type more of it to find every match.",
+                           className="text-warning") if result['truncated'] else None
+    # Searches answer from the previous index, or none yet, while the index is (re)built
+    indexing = html.Small(" The search index is being updated; the newest tickets may be missing.",
+                          className="text-muted") if result['indexing'] else None
+    if result['count'] == 0:
+        return [html.Small("No matching tickets", className="text-muted"), truncated, indexing]
     
-    if filtered_df.empty:
-        return go.Figure().add_annotation(text="No data available", showarrow=False)
+    tickets = result['tickets']
+    tickets['created_date'] = tickets['created_date'].dt.strftime('%Y-%m-%d')
+    tickets.columns = [column.replace('_', ' ').title() for column in tickets.columns]
+    return [
+        html.Small(f"{result['count']:,} matching tickets" +
+                   (f", showing the newest {len(tickets)}" if result['count'] > len(tickets) else ""),
+                   className="text-muted"),
+        truncated,
+        indexing,
+        dbc.Table.from_dataframe(tickets, striped=True, hover=True, size="sm", className="mt-1")
+    ]
+
+# Ticket trends chart callback
+def lttb_downsample(x, y, threshold):
+    """Return the indices kept by largest-triangle-three-buckets downsampling"""
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
     
-    # Group by date and count tickets
-    daily_tickets = filtered_df.groupby(filtered_df['created_date'].dt.date).size().reset_index()
-    daily_tickets.columns = ['date', 'count']
+    xs = np.asarray(x).astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    ys = np.asarray(y, dtype=np.float64)
     
-    # Also get resolved tickets
-    resolved_df = filtered_df[filtered_df['resolved_date'].notna()]
-    if not resolved_df.empty:
-        daily_resolved = resolved_df.groupby(resolved_df['resolved_date'].dt.date).size().reset_index()
-        daily_resolved.columns = ['date', 'resolved_count']
+    # First and last points are always kept; the rest is split into threshold - 2 buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    
+    anchor = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x, avg_y = xs[next_start:next_end].mean(), ys[next_start:next_end].mean()
+        
+        # Keep the point forming the largest triangle with the previous pick and the next bucket's average
+        area = np.abs((xs[anchor] - avg_x) * (ys[start:end] - ys[anchor]) -
+                      (xs[anchor] - xs[start:end]) * (avg_y - ys[anchor]))
+        anchor = start + int(area.argmax())
+        keep[i + 1] = anchor
+    
+    return keep
+
+def get_zoom_range(relayout_data):
+    """Extract the x-axis range from a zoom or pan event, if any"""
+    if not relayout_data:
+        return None
+    if 'xaxis.range[0]' in relayout_data and 'xaxis.range[1]' in relayout_data:
+        return relayout_data['xaxis.range[0]'], relayout_data['xaxis.range[1]']
+    if relayout_data.get('xaxis.range'):
+        return tuple(relayout_data['xaxis.range'][:2])
+    return None
+
+def is_zoom_reset(relayout_data):
+    """Whether a relayout event returns the x-axis to its full range (double-click, the "all" button)"""
+    if not relayout_data:
+        return False
+    return bool(relayout_data.get('xaxis.autorange')) or \
+        ('xaxis.range' in relayout_data and not relayout_data['xaxis.range'])
+
+def create_trend_trace(x, y, name, color, webgl):
+    """Build a trend line, as a WebGL trace without markers when the series is large"""
+    trace_type = go.Scattergl if webgl else go.Scatter
+    return trace_type(
+        x=x,
+        y=y,
+        mode='lines' if webgl else 'lines+markers',
+        name=name,
+        line=dict(color=color, width=2),
+        marker=dict(size=6)
+    )
+
+@chart_callback(
+    [Output('ticket-trends-chart', 'figure'),
+     Output('ticket-trends-chart-structure', 'data')],
+    [Input('dataset-select', 'value'),
+     Input('date-range-picker', 'start_date'),
+     Input('date-range-picker', 'end_date'),
+     Input('priority-filter', 'value'),
+     Input('department-filter', 'value'),
+     Input('status-filter', 'value'),
+     Input('data-version', 'data'),
+     Input('cross-filter', 'data'),
+     Input('ticket-trends-chart', 'relayoutData')],
+    State('ticket-trends-chart-structure', 'data')
+)
+def update_ticket_trends(dataset, start_date, end_date, priority, department, status, data_version, cross_filter, relayout_data, client_structure):
+    zoom_range = None
+    if dash.callback_context.triggered_id == 'ticket-trends-chart':
+        zoom_range = get_zoom_range(relayout_data)
+        if zoom_range is None and not is_zoom_reset(relayout_data):
+            # Layout changes that leave the x-axis alone (autosize, legend clicks) need no new data
+            return dash.no_update, dash.no_update
+    
+    if zoom_range:
+        # Zoomed in: return full daily resolution for the visible window only
+        zoom_start, zoom_end = pd.Timestamp(zoom_range[0]), pd.Timestamp(zoom_range[1])
+        if start_date and end_date:
+            zoom_start = max(zoom_start, pd.Timestamp(start_date))
+            zoom_end = min(zoom_end, pd.Timestamp(end_date))
+        predicates = chart_predicates('ticket-trends-chart', cross_filter)
+        if predicates:
+            # Cross-filtered: slice the selection's cubes instead of querying the tickets
+            agg = get_selection_aggregates(dataset, start_date, end_date, priority, department, status, predicates)
+            trend = cube_trend(agg['cube'], agg['resolved_cube'], 'day',
+                               *day_range(str(zoom_start), str(zoom_end))) if agg['total'] else {}
+        else:
+            trend = registry.get(dataset).trend(str(zoom_start), str(zoom_end), priority, department, status, granularity='day')
+        if not trend:
+            return dash.no_update, dash.no_update
+        figure = create_trends_figure(trend, f"{start_date}|{end_date}|{priority}|{department}|{status}")
     else:
-        daily_resolved = pd.DataFrame(columns=['date', 'resolved_count'])
+        figure = build_ticket_trends(dataset, start_date, end_date, priority, department, status,
+                                 chart_predicates('ticket-trends-chart', cross_filter))
+    
+    return figure_response(figure, client_structure)
+
+@cached_figure('ticket-trends-chart')
+def build_ticket_trends(dataset, start_date, end_date, priority, department, status, cross_filter=()):
+    agg = get_selection_aggregates(dataset, start_date, end_date, priority, department, status, cross_filter)
+    
+    if agg['total'] == 0:
+        return go.Figure().add_annotation(text="No data available", showarrow=False)
+    
+    # Bucketed counts; the granularity widens with the range so the point count stays bounded
+    return create_trends_figure(agg['trend'], f"{start_date}|{end_date}|{priority}|{department}|{status}")
+
+def create_trends_figure(trend, uirevision):
+    """Build the ticket trends figure from bucketed created/resolved counts"""
+    # Cap the points sent per trace, and switch to WebGL once SVG markers would get heavy
+    webgl = len(trend['x']) > TREND_WEBGL_THRESHOLD
     
     fig = go.Figure()
     
     # Add created tickets line
-    fig.add_trace(go.Scatter(
-        x=daily_tickets['date'],
-        y=daily_tickets['count'],
-        mode='lines+markers',
-        name='Tickets Created',
-        line=dict(color='#dc3545', width=2),
-        marker=dict(size=6)
-    ))
+    keep = lttb_downsample(trend['x'], trend['created'], TREND_MAX_RENDER_POINTS)
+    fig.add_trace(create_trend_trace(trend['x'][keep], trend['created'][keep],
+                                     'Tickets Created', '#dc3545', webgl))
     
     # Add resolved tickets line
-    if not daily_resolved.empty:
-        fig.add_trace(go.Scatter(
-            x=daily_resolved['date'],
-            y=daily_resolved['resolved_count'],
-            mode='lines+markers',
-            name='Tickets Resolved',
-            line=dict(color='#28a745', width=2),
-            marker=dict(size=6)
-        ))
+    if trend['resolved'].any():
+        keep = lttb_downsample(trend['x'], trend['resolved'], TREND_MAX_RENDER_POINTS)
+        fig.add_trace(create_trend_trace(trend['x'][keep], trend['resolved'][keep],
+                                         'Tickets Resolved', '#28a745', webgl))
     
     fig.update_layout(
-        title={
-            'text': 'Ticket Trends Over Time',
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 20, 'family': 'Segoe UI'}
-        },
-        xaxis_title='Date',
+        title={'text': 'Ticket Trends Over Time', 'font': {'size': 20}},
+        xaxis_title=TREND_AXIS_TITLES[trend['granularity']],
         yaxis_title='Number of Tickets',
         hovermode='x unified',
-        template='plotly_white',
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font={'family': 'Segoe UI'},
         showlegend=True,
         legend=dict(
             orientation="h",
@@ -353,10 +880,11 @@ def update_ticket_trends(start_date, end_date, priority, department, status):
             xanchor="right",
             x=1
         ),
-        margin=dict(l=20, r=20, t=60, b=20)
+        # Keep the user's zoom when the figure is replaced with higher-resolution data
+        uirevision=uirevision
     )
     
-    # Add range selector
+    # Add range selector; the range slider re-draws every point, so large series skip it
     fig.update_layout(
         xaxis=dict(
             rangeselector=dict(
@@ -367,7 +895,7 @@ def update_ticket_trends(start_date, end_date, priority, department, status):
                     dict(step="all")
                 ])
             ),
-            rangeslider=dict(visible=True),
+            rangeslider=dict(visible=not webgl),
             type="date"
         )
     )
@@ -375,21 +903,32 @@ def update_ticket_trends(start_date, end_date, priority, department, status):
     return fig
 
 # Priority distribution chart callback
-@app.callback(
-    Output('priority-distribution-chart', 'figure'),
-    [Input('date-range-picker', 'start_date'),
+@chart_callback(
+    [Output('priority-distribution-chart', 'figure'),
+     Output('priority-distribution-chart-structure', 'data')],
+    [Input('dataset-select', 'value'),
+     Input('date-range-picker', 'start_date'),
      Input('date-range-picker', 'end_date'),
      Input('priority-filter', 'value'),
      Input('department-filter', 'value'),
-     Input('status-filter', 'value')]
+     Input('status-filter', 'value'),
+     Input('data-version', 'data'),
+     Input('cross-filter', 'data')],
+    State('priority-distribution-chart-structure', 'data')
 )
-def update_priority_distribution(start_date, end_date, priority, department, status):
-    filtered_df = filter_data(start_date, end_date, priority, department, status)
+def update_priority_distribution(dataset, start_date, end_date, priority, department, status, data_version, cross_filter, client_structure):
+    figure = build_priority_distribution(dataset, start_date, end_date, priority, department, status,
+                                         chart_predicates('priority-distribution-chart', cross_filter))
+    return figure_response(figure, client_structure)
+
+@cached_figure('priority-distribution-chart')
+def build_priority_distribution(dataset, start_date, end_date, priority, department, status, cross_filter=()):
+    agg = get_selection_aggregates(dataset, start_date, end_date, priority, department, status, cross_filter)
     
-    if filtered_df.empty:
+    if agg['total'] == 0:
         return go.Figure().add_annotation(text="No data available", showarrow=False)
     
-    priority_counts = filtered_df['priority'].value_counts()
+    priority_counts = agg['priority_counts']
     
     fig = go.Figure(data=[go.Pie(
         labels=priority_counts.index,
@@ -400,18 +939,8 @@ def update_priority_distribution(start_date, end_date, priority, department, sta
     )])
     
     fig.update_layout(
-        title={
-            'text': 'Priority Distribution',
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 18, 'family': 'Segoe UI'}
-        },
-        template='plotly_white',
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font={'family': 'Segoe UI'},
-        showlegend=True,
-        margin=dict(l=20, r=20, t=60, b=20)
+        title={'text': 'Priority Distribution'},
+        showlegend=True
     )
     
     # Add hover template
@@ -423,23 +952,32 @@ def update_priority_distribution(start_date, end_date, priority, department, sta
     return fig
 
 # SLA performance chart callback
-@app.callback(
-    Output('sla-performance-chart', 'figure'),
-    [Input('date-range-picker', 'start_date'),
+@chart_callback(
+    [Output('sla-performance-chart', 'figure'),
+     Output('sla-performance-chart-structure', 'data')],
+    [Input('dataset-select', 'value'),
+     Input('date-range-picker', 'start_date'),
      Input('date-range-picker', 'end_date'),
      Input('priority-filter', 'value'),
      Input('department-filter', 'value'),
-     Input('status-filter', 'value')]
+     Input('status-filter', 'value'),
+     Input('data-version', 'data'),
+     Input('cross-filter', 'data')],
+    State('sla-performance-chart-structure', 'data')
 )
-def update_sla_performance(start_date, end_date, priority, department, status):
-    filtered_df = filter_data(start_date, end_date, priority, department, status)
+def update_sla_performance(dataset, start_date, end_date, priority, department, status, data_version, cross_filter, client_structure):
+    figure = build_sla_performance(dataset, start_date, end_date, priority, department, status,
+                                   chart_predicates('sla-performance-chart', cross_filter))
+    return figure_response(figure, client_structure)
+
+@cached_figure('sla-performance-chart')
+def build_sla_performance(dataset, start_date, end_date, priority, department, status, cross_filter=()):
+    agg = get_selection_aggregates(dataset, start_date, end_date, priority, department, status, cross_filter)
     
-    if filtered_df.empty:
+    if agg['total'] == 0:
         return go.Figure().add_annotation(text="No data available", showarrow=False)
     
-    # Calculate SLA performance by priority
-    sla_by_priority = filtered_df.groupby('priority')['sla_met'].agg(['count', 'sum']).reset_index()
-    sla_by_priority['sla_percentage'] = (sla_by_priority['sum'] / sla_by_priority['count'] * 100)
+    sla_by_priority = agg['sla_by_priority']
     
     fig = go.Figure(data=[go.Bar(
         x=sla_by_priority['priority'],
@@ -449,26 +987,32 @@ def update_sla_performance(start_date, end_date, priority, department, status):
         textposition='auto'
     )])
     
-    # Add target line at 95%
-    fig.add_hline(y=95, line_dash="dash", line_color="red",
-                  annotation_text="Target: 95%")
+    # Target line at 95%, plus a warning over each priority below it. The shapes and
+    # annotations are passed in one layout update: add_hline and add_annotation
+    # re-validate the whole layout on every call
+    annotations = [dict(x=1, y=95, xref='x domain', yref='y', xanchor='right', yanchor='bottom',
+                        text="Target: 95%", showarrow=False)]
+    for priority, percentage in zip(sla_by_priority['priority'], sla_by_priority['sla_percentage']):
+        if percentage < 95:
+            annotations.append(dict(
+                x=priority,
+                y=percentage + 5,
+                text="⚠️ Below Target",
+                showarrow=True,
+                arrowhead=2,
+                arrowcolor="red",
+                font=dict(color="red", size=10)
+            ))
     
     fig.update_layout(
-        title={
-            'text': 'SLA Performance by Priority',
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 18, 'family': 'Segoe UI'}
-        },
+        title={'text': 'SLA Performance by Priority'},
         xaxis_title='Priority',
         yaxis_title='SLA Compliance (%)',
-        template='plotly_white',
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font={'family': 'Segoe UI'},
         yaxis=dict(range=[0, 100]),
-        margin=dict(l=20, r=20, t=60, b=20),
-        showlegend=False
+        showlegend=False,
+        shapes=[dict(type='line', xref='x domain', yref='y', x0=0, x1=1, y0=95, y1=95,
+                     line=dict(color='red', dash='dash'))],
+        annotations=annotations
     )
     
     # Add hover template
@@ -476,37 +1020,35 @@ def update_sla_performance(start_date, end_date, priority, department, status):
         hovertemplate='<b>%{x} Priority</b><br>SLA Compliance: %{y:.1f}%<br>Target: 95%<extra></extra>'
     )
     
-    # Add annotations for values below target
-    for i, (priority, percentage) in enumerate(zip(sla_by_priority['priority'], sla_by_priority['sla_percentage'])):
-        if percentage < 95:
-            fig.add_annotation(
-                x=priority,
-                y=percentage + 5,
-                text="⚠️ Below Target",
-                showarrow=True,
-                arrowhead=2,
-                arrowcolor="red",
-                font=dict(color="red", size=10)
-            )
-    
     return fig
 
 # Department analysis chart callback
-@app.callback(
-    Output('department-analysis-chart', 'figure'),
-    [Input('date-range-picker', 'start_date'),
+@chart_callback(
+    [Output('department-analysis-chart', 'figure'),
+     Output('department-analysis-chart-structure', 'data')],
+    [Input('dataset-select', 'value'),
+     Input('date-range-picker', 'start_date'),
      Input('date-range-picker', 'end_date'),
      Input('priority-filter', 'value'),
      Input('department-filter', 'value'),
-     Input('status-filter', 'value')]
+     Input('status-filter', 'value'),
+     Input('data-version', 'data'),
+     Input('cross-filter', 'data')],
+    State('department-analysis-chart-structure', 'data')
 )
-def update_department_analysis(start_date, end_date, priority, department, status):
-    filtered_df = filter_data(start_date, end_date, priority, department, status)
+def update_department_analysis(dataset, start_date, end_date, priority, department, status, data_version, cross_filter, client_structure):
+    figure = build_department_analysis(dataset, start_date, end_date, priority, department, status,
+                                       chart_predicates('department-analysis-chart', cross_filter))
+    return figure_response(figure, client_structure)
+
+@cached_figure('department-analysis-chart')
+def build_department_analysis(dataset, start_date, end_date, priority, department, status, cross_filter=()):
+    agg = get_selection_aggregates(dataset, start_date, end_date, priority, department, status, cross_filter)
     
-    if filtered_df.empty:
+    if agg['total'] == 0:
         return go.Figure().add_annotation(text="No data available", showarrow=False)
     
-    dept_counts = filtered_df['department'].value_counts()
+    dept_counts = agg['department_counts']
     
     fig = go.Figure(data=[go.Bar(
         x=dept_counts.values,
@@ -518,19 +1060,9 @@ def update_department_analysis(start_date, end_date, priority, department, statu
     )])
     
     fig.update_layout(
-        title={
-            'text': 'Tickets by Department',
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 18, 'family': 'Segoe UI'}
-        },
+        title={'text': 'Tickets by Department'},
         xaxis_title='Number of Tickets',
         yaxis_title='Department',
-        template='plotly_white',
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font={'family': 'Segoe UI'},
-        margin=dict(l=20, r=20, t=60, b=20),
         showlegend=False
     )
     
@@ -546,23 +1078,32 @@ def update_department_analysis(start_date, end_date, priority, department, statu
     return fig
 
 # Weekly trends chart callback
-@app.callback(
-    Output('weekly-trends-chart', 'figure'),
-    [Input('date-range-picker', 'start_date'),
+@chart_callback(
+    [Output('weekly-trends-chart', 'figure'),
+     Output('weekly-trends-chart-structure', 'data')],
+    [Input('dataset-select', 'value'),
+     Input('date-range-picker', 'start_date'),
      Input('date-range-picker', 'end_date'),
      Input('priority-filter', 'value'),
      Input('department-filter', 'value'),
-     Input('status-filter', 'value')]
+     Input('status-filter', 'value'),
+     Input('data-version', 'data'),
+     Input('cross-filter', 'data')],
+    State('weekly-trends-chart-structure', 'data')
 )
-def update_weekly_trends(start_date, end_date, priority, department, status):
-    filtered_df = filter_data(start_date, end_date, priority, department, status)
+def update_weekly_trends(dataset, start_date, end_date, priority, department, status, data_version, cross_filter, client_structure):
+    figure = build_weekly_trends(dataset, start_date, end_date, priority, department, status,
+                                 chart_predicates('weekly-trends-chart', cross_filter))
+    return figure_response(figure, client_structure)
+
+@cached_figure('weekly-trends-chart')
+def build_weekly_trends(dataset, start_date, end_date, priority, department, status, cross_filter=()):
+    agg = get_selection_aggregates(dataset, start_date, end_date, priority, department, status, cross_filter)
     
-    if filtered_df.empty:
+    if agg['total'] == 0:
         return go.Figure().add_annotation(text="No data available", showarrow=False)
     
-    # Group by weekday
-    weekday_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    weekday_counts = filtered_df['created_weekday'].value_counts().reindex(weekday_order, fill_value=0)
+    weekday_counts = agg['weekday_counts']
     
     fig = go.Figure(data=[go.Bar(
         x=weekday_counts.index,
@@ -573,19 +1114,9 @@ def update_weekly_trends(start_date, end_date, priority, department, status):
     )])
     
     fig.update_layout(
-        title={
-            'text': 'Weekly Incident Trends',
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 18, 'family': 'Segoe UI'}
-        },
+        title={'text': 'Weekly Incident Trends'},
         xaxis_title='Day of Week',
         yaxis_title='Number of Tickets',
-        template='plotly_white',
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font={'family': 'Segoe UI'},
-        margin=dict(l=20, r=20, t=60, b=20),
         showlegend=False
     )
     
@@ -615,21 +1146,32 @@ def update_weekly_trends(start_date, end_date, priority, department, status):
     return fig
 
 # Status distribution chart callback
-@app.callback(
-    Output('status-distribution-chart', 'figure'),
-    [Input('date-range-picker', 'start_date'),
+@chart_callback(
+    [Output('status-distribution-chart', 'figure'),
+     Output('status-distribution-chart-structure', 'data')],
+    [Input('dataset-select', 'value'),
+     Input('date-range-picker', 'start_date'),
      Input('date-range-picker', 'end_date'),
      Input('priority-filter', 'value'),
      Input('department-filter', 'value'),
-     Input('status-filter', 'value')]
+     Input('status-filter', 'value'),
+     Input('data-version', 'data'),
+     Input('cross-filter', 'data')],
+    State('status-distribution-chart-structure', 'data')
 )
-def update_status_distribution(start_date, end_date, priority, department, status):
-    filtered_df = filter_data(start_date, end_date, priority, department, status)
+def update_status_distribution(dataset, start_date, end_date, priority, department, status, data_version, cross_filter, client_structure):
+    figure = build_status_distribution(dataset, start_date, end_date, priority, department, status,
+                                       chart_predicates('status-distribution-chart', cross_filter))
+    return figure_response(figure, client_structure)
+
+@cached_figure('status-distribution-chart')
+def build_status_distribution(dataset, start_date, end_date, priority, department, status, cross_filter=()):
+    agg = get_selection_aggregates(dataset, start_date, end_date, priority, department, status, cross_filter)
     
-    if filtered_df.empty:
+    if agg['total'] == 0:
         return go.Figure().add_annotation(text="No data available", showarrow=False)
     
-    status_counts = filtered_df['status'].value_counts()
+    status_counts = agg['status_counts']
     
     fig = go.Figure(data=[go.Pie(
         labels=status_counts.index,
@@ -640,18 +1182,8 @@ def update_status_distribution(start_date, end_date, priority, department, statu
     )])
     
     fig.update_layout(
-        title={
-            'text': 'Status Distribution',
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 18, 'family': 'Segoe UI'}
-        },
-        template='plotly_white',
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font={'family': 'Segoe UI'},
-        showlegend=True,
-        margin=dict(l=20, r=20, t=60, b=20)
+        title={'text': 'Status Distribution'},
+        showlegend=True
     )
     
     # Add hover template and enhanced styling
@@ -666,5 +1198,92 @@ def update_status_distribution(start_date, end_date, priority, department, statu
     
     return fig
 
+# Combined chart callback: one request filters and aggregates each selection once,
+# then builds the six figures concurrently
+chart_executor = ThreadPoolExecutor(max_workers=len(CHART_IDS), thread_name_prefix='chart-build')
+
+CHART_UPDATES = {
+    'ticket-trends-chart': update_ticket_trends,
+    'priority-distribution-chart': update_priority_distribution,
+    'sla-performance-chart': update_sla_performance,
+    'department-analysis-chart': update_department_analysis,
+    'weekly-trends-chart': update_weekly_trends,
+    'status-distribution-chart': update_status_distribution
+}
+
+if CHART_CALLBACK_MODE != 'split':
+    @server_callback(
+        [Output(chart_id, 'figure') for chart_id in CHART_IDS] +
+        [Output(f'{chart_id}-structure', 'data') for chart_id in CHART_IDS],
+        [Input('dataset-select', 'value'),
+         Input('date-range-picker', 'start_date'),
+         Input('date-range-picker', 'end_date'),
+         Input('priority-filter', 'value'),
+         Input('department-filter', 'value'),
+         Input('status-filter', 'value'),
+         Input('data-version', 'data'),
+         Input('cross-filter', 'data'),
+         Input('ticket-trends-chart', 'relayoutData')],
+        [State(f'{chart_id}-structure', 'data') for chart_id in CHART_IDS]
+    )
+    def update_charts(dataset, start_date, end_date, priority, department, status, data_version, cross_filter,
+                      relayout_data, *client_structures):
+        """Update every chart from one request, building the figures in parallel"""
+        filters = (dataset, start_date, end_date, priority, department, status, data_version, cross_filter)
+        if dash.callback_context.triggered_id == 'ticket-trends-chart':
+            # Zooming only re-renders the trend
+            figure, structure = update_ticket_trends(*filters, relayout_data, client_structures[0])
+            others = [dash.no_update] * (len(CHART_IDS) - 1)
+            return [figure, *others, structure, *others]
+        
+        # Charts sharing a predicate set share one aggregation: the selection caches let
+        # the first build compute it while the others and the KPI callback wait for it.
+        # Each build runs in a copy of the request context so callback_context stays readable
+        futures = [
+            chart_executor.submit(contextvars.copy_context().run, CHART_UPDATES[chart_id], *filters,
+                                  *([relayout_data] if chart_id == 'ticket-trends-chart' else []), client_structure)
+            for chart_id, client_structure in zip(CHART_IDS, client_structures)
+        ]
+        figures, structures = zip(*(future.result() for future in futures))
+        return [*figures, *structures]
+
+# Client-side filtering mode callbacks; in server mode the store is never filled
+if CLIENTSIDE_MODE:
+    @app.callback(
+        Output('aggregate-store', 'data'),
+        [Input('dataset-select', 'value'),
+         Input('data-version', 'data')],
+        [State('aggregate-store', 'data')]
+    )
+    def update_aggregate_store(dataset, data_version, current_store):
+        """Ship the compact aggregate store, only when the dataset or its data version has changed"""
+        dataset = registry.resolve(dataset)
+        backend = registry.get(dataset)
+        if current_store and current_store.get('dataset') == dataset and current_store.get('version') == backend.version:
+            raise PreventUpdate
+        
+        store = backend.aggregate_store()
+        store['dataset'] = dataset
+        store['template'] = pio.templates['dashboard'].to_plotly_json()
+        return store
+    
+    app.clientside_callback(
+        ClientsideFunction(namespace='dashboard', function_name='updateFromStore'),
+        [Output('kpi-total-tickets-value', 'children'),
+         Output('kpi-open-tickets-value', 'children'),
+         Output('kpi-sla-compliance-value', 'children'),
+         Output('kpi-sla-compliance-value', 'style'),
+         Output('kpi-avg-resolution-value', 'children'),
+         Output('kpi-avg-resolution-subtitle', 'children')] +
+        [Output(chart_id, 'figure') for chart_id in CHART_IDS],
+        [Input('date-range-picker', 'start_date'),
+         Input('date-range-picker', 'end_date'),
+         Input('priority-filter', 'value'),
+         Input('department-filter', 'value'),
+         Input('status-filter', 'value'),
+         Input('aggregate-store', 'data'),
+         Input('cross-filter', 'data')]
+    )
+
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
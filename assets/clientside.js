@@ -0,0 +1,396 @@
+// Clientside callbacks. In client-side filtering mode, KPI cards and charts are
+// computed in the browser from the compact aggregate store the server ships once
+// per data version
+(function() {
+    const DAY_MS = 86400000;
+    const WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'];
+    const PRIORITY_COLORS = {'Low': '#28a745', 'Medium': '#ffc107', 'High': '#fd7e14', 'Critical': '#dc3545'};
+    const STATUS_COLORS = {
+        'Open': '#dc3545', 'In Progress': '#ffc107', 'Resolved': '#28a745', 'Closed': '#6c757d', 'Pending': '#17a2b8'
+    };
+    const TREND_AXIS_TITLES = {'day': 'Date', 'week': 'Week Starting', 'month': 'Month'};
+
+    // Day number since the Unix epoch for a picker value ('YYYY-MM-DD' or an ISO timestamp)
+    function toDay(value) {
+        const [year, month, day] = String(value).slice(0, 10).split('-').map(Number);
+        return Math.floor(Date.UTC(year, month - 1, day) / DAY_MS);
+    }
+
+    // Last day bucket a range ending at a picker value covers, like data_backend.day_range:
+    // the end is a timestamp, so a range ending at midnight stops at the previous day
+    function toEndDay(value) {
+        const text = String(value);
+        const iso = text.length <= 10 ? `${text}T00:00:00Z` : (/(Z|[+-]\d\d:?\d\d)$/i.test(text) ? text : `${text}Z`);
+        return Math.floor((Date.parse(iso) - 1) / DAY_MS);
+    }
+
+    function dayToIso(day) {
+        return new Date(day * DAY_MS).toISOString().slice(0, 10);
+    }
+
+    // Same bucket numbering as data_backend.time_buckets
+    function toBucket(day, granularity) {
+        if (granularity === 'week') {
+            return Math.floor((day + 3) / 7);
+        }
+        if (granularity === 'month') {
+            const date = new Date(day * DAY_MS);
+            return (date.getUTCFullYear() - 1970) * 12 + date.getUTCMonth();
+        }
+        return day;
+    }
+
+    function bucketStart(bucket, granularity) {
+        if (granularity === 'week') {
+            return dayToIso(bucket * 7 - 3);
+        }
+        if (granularity === 'month') {
+            const year = 1970 + Math.floor(bucket / 12);
+            return new Date(Date.UTC(year, bucket % 12, 1)).toISOString().slice(0, 10);
+        }
+        return dayToIso(bucket);
+    }
+
+    function chooseGranularity(firstDay, lastDay, maxPoints) {
+        const span = lastDay - firstDay + 1;
+        if (span <= maxPoints) {
+            return 'day';
+        }
+        if (span / 7 <= maxPoints) {
+            return 'week';
+        }
+        return 'month';
+    }
+
+    // Chart id -> the cross-filter column its clicks set; a chart is not filtered by its own predicate
+    const CROSS_FILTER_COLUMNS = {
+        'priority-distribution-chart': 'priority',
+        'sla-performance-chart': 'priority',
+        'department-analysis-chart': 'department',
+        'weekly-trends-chart': 'created_weekday',
+        'status-distribution-chart': 'status'
+    };
+
+    // Return a row predicate for the current filter selection and cross-filter predicates
+    function rowFilter(store, startDate, endDate, priority, department, status, predicates) {
+        const dims = store.dimensions;
+        const startDay = startDate && endDate ? toDay(startDate) : -Infinity;
+        const endDay = startDate && endDate ? toEndDay(endDate) : Infinity;
+        const selected = Object.assign({}, predicates);
+        const weekday = 'created_weekday' in selected ? WEEKDAYS.indexOf(selected.created_weekday) : -1;
+        delete selected.created_weekday;
+
+        // [column, code] pairs every matching row must have; an unknown value matches nothing
+        const checks = [['priority', priority], ['department', department], ['status', status]]
+            .filter(([, value]) => value && value !== 'all')
+            .concat(Object.entries(selected))
+            .map(([column, value]) => [column, dims[column].indexOf(value)]);
+
+        return (columns, i) => columns.day[i] >= startDay && columns.day[i] <= endDay &&
+            (weekday < 0 || (columns.day[i] + 3) % 7 === weekday) &&
+            checks.every(([column, code]) => columns[column][i] === code);
+    }
+
+    function excludeColumn(predicates, column) {
+        const result = Object.assign({}, predicates);
+        delete result[column];
+        return result;
+    }
+
+    function sortedEntries(counts) {
+        return Object.entries(counts).sort((a, b) => b[1] - a[1]);
+    }
+
+    function emptyFigure(template) {
+        return {
+            data: [],
+            layout: {
+                template: template,
+                annotations: [{text: 'No data available', showarrow: false}]
+            }
+        };
+    }
+
+    function aggregate(store, startDate, endDate, priority, department, status, predicates) {
+        const dims = store.dimensions;
+        const matches = rowFilter(store, startDate, endDate, priority, department, status, predicates);
+        const openCodes = new Set(store.open_statuses.map(s => dims.status.indexOf(s)));
+
+        const agg = {
+            total: 0, open: 0, slaMet: 0, resolutionHours: 0, resolved: 0,
+            priority: {}, prioritySla: {}, department: {}, status: {},
+            weekday: WEEKDAYS.map(() => 0), createdDays: new Map(), resolvedDays: new Map()
+        };
+
+        const created = store.created;
+        for (let i = 0; i < created.day.length; i++) {
+            if (!matches(created, i)) {
+                continue;
+            }
+            const count = created.count[i];
+            const priorityName = dims.priority[created.priority[i]];
+            const statusName = dims.status[created.status[i]];
+            const departmentName = dims.department[created.department[i]];
+
+            agg.total += count;
+            agg.slaMet += created.sla_met[i];
+            agg.resolutionHours += created.resolution_hours[i];
+            agg.resolved += created.resolved[i];
+            if (openCodes.has(created.status[i])) {
+                agg.open += count;
+            }
+            agg.priority[priorityName] = (agg.priority[priorityName] || 0) + count;
+            agg.prioritySla[priorityName] = (agg.prioritySla[priorityName] || 0) + created.sla_met[i];
+            agg.department[departmentName] = (agg.department[departmentName] || 0) + count;
+            agg.status[statusName] = (agg.status[statusName] || 0) + count;
+            agg.weekday[(created.day[i] + 3) % 7] += count;
+            agg.createdDays.set(created.day[i], (agg.createdDays.get(created.day[i]) || 0) + count);
+        }
+
+        const resolved = store.resolved;
+        for (let i = 0; i < resolved.day.length; i++) {
+            if (matches(resolved, i)) {
+                const day = resolved.resolved_day[i];
+                agg.resolvedDays.set(day, (agg.resolvedDays.get(day) || 0) + resolved.count[i]);
+            }
+        }
+
+        return agg;
+    }
+
+    function trendFigure(agg, store) {
+        const days = [...agg.createdDays.keys(), ...agg.resolvedDays.keys()];
+        const firstDay = Math.min(...days);
+        const lastDay = Math.max(...days);
+        const granularity = chooseGranularity(firstDay, lastDay, store.trend_max_points);
+
+        const lo = toBucket(firstDay, granularity);
+        const hi = toBucket(lastDay, granularity);
+        const created = new Array(hi - lo + 1).fill(0);
+        const resolved = new Array(hi - lo + 1).fill(0);
+        agg.createdDays.forEach((count, day) => { created[toBucket(day, granularity) - lo] += count; });
+        agg.resolvedDays.forEach((count, day) => { resolved[toBucket(day, granularity) - lo] += count; });
+        const x = created.map((_, i) => bucketStart(lo + i, granularity));
+
+        const data = [{
+            type: 'scatter', x: x, y: created, mode: 'lines+markers', name: 'Tickets Created',
+            line: {color: '#dc3545', width: 2}, marker: {size: 6}
+        }];
+        if (agg.resolvedDays.size) {
+            data.push({
+                type: 'scatter', x: x, y: resolved, mode: 'lines+markers', name: 'Tickets Resolved',
+                line: {color: '#28a745', width: 2}, marker: {size: 6}
+            });
+        }
+
+        return {
+            data: data,
+            layout: {
+                template: store.template,
+                title: {text: 'Ticket Trends Over Time', font: {size: 20}},
+                xaxis: {
+                    title: {text: TREND_AXIS_TITLES[granularity]},
+                    rangeselector: {buttons: [
+                        {count: 7, label: '7d', step: 'day', stepmode: 'backward'},
+                        {count: 30, label: '30d', step: 'day', stepmode: 'backward'},
+                        {count: 90, label: '3m', step: 'day', stepmode: 'backward'},
+                        {step: 'all'}
+                    ]},
+                    rangeslider: {visible: true},
+                    type: 'date'
+                },
+                yaxis: {title: {text: 'Number of Tickets'}},
+                hovermode: 'x unified',
+                showlegend: true,
+                legend: {orientation: 'h', yanchor: 'bottom', y: 1.02, xanchor: 'right', x: 1}
+            }
+        };
+    }
+
+    function pieFigure(counts, colors, title, template, pullOpen) {
+        const entries = sortedEntries(counts);
+        const labels = entries.map(e => e[0]);
+        const trace = {
+            type: 'pie',
+            labels: labels,
+            values: entries.map(e => e[1]),
+            marker: {colors: labels.map(l => colors[l] || '#6c757d')},
+            textinfo: 'label+percent',
+            textposition: 'auto',
+            textfont: {size: 12},
+            hovertemplate: '<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
+        };
+        if (pullOpen) {
+            trace.marker.line = {color: 'rgba(255,255,255,0.8)', width: 2};
+            trace.pull = labels.map(l => l === 'Open' ? 0.1 : 0);
+        }
+        return {data: [trace], layout: {template: template, title: {text: title}, showlegend: true}};
+    }
+
+    function slaFigure(agg, template) {
+        const priorities = Object.keys(agg.priority).sort();
+        const percentages = priorities.map(p => agg.prioritySla[p] / agg.priority[p] * 100);
+        const annotations = [{
+            text: 'Target: 95%', showarrow: false, xref: 'x domain', x: 1, xanchor: 'right',
+            yref: 'y', y: 95, yanchor: 'bottom'
+        }];
+        priorities.forEach((p, i) => {
+            if (percentages[i] < 95) {
+                annotations.push({
+                    x: p, y: percentages[i] + 5, text: '⚠️ Below Target', showarrow: true,
+                    arrowhead: 2, arrowcolor: 'red', font: {color: 'red', size: 10}
+                });
+            }
+        });
+
+        return {
+            data: [{
+                type: 'bar',
+                x: priorities,
+                y: percentages,
+                marker: {color: priorities.map(p => PRIORITY_COLORS[p] || '#6c757d')},
+                text: percentages.map(p => `${p.toFixed(1)}%`),
+                textposition: 'auto',
+                hovertemplate: '<b>%{x} Priority</b><br>SLA Compliance: %{y:.1f}%<br>Target: 95%<extra></extra>'
+            }],
+            layout: {
+                template: template,
+                title: {text: 'SLA Performance by Priority'},
+                xaxis: {title: {text: 'Priority'}},
+                yaxis: {title: {text: 'SLA Compliance (%)'}, range: [0, 100]},
+                showlegend: false,
+                shapes: [{
+                    type: 'line', xref: 'x domain', x0: 0, x1: 1, yref: 'y', y0: 95, y1: 95,
+                    line: {dash: 'dash', color: 'red'}
+                }],
+                annotations: annotations
+            }
+        };
+    }
+
+    function departmentFigure(agg, template) {
+        const entries = sortedEntries(agg.department);
+        return {
+            data: [{
+                type: 'bar',
+                orientation: 'h',
+                x: entries.map(e => e[1]),
+                y: entries.map(e => e[0]),
+                text: entries.map(e => e[1]),
+                textposition: 'auto',
+                marker: {color: '#17a2b8', line: {color: 'rgba(255,255,255,0.8)', width: 2}},
+                hovertemplate: '<b>%{y}</b><br>Tickets: %{x}<extra></extra>'
+            }],
+            layout: {
+                template: template,
+                title: {text: 'Tickets by Department'},
+                xaxis: {title: {text: 'Number of Tickets'}},
+                yaxis: {title: {text: 'Department'}},
+                showlegend: false
+            }
+        };
+    }
+
+    function weekdayFigure(agg, template) {
+        return {
+            data: [{
+                type: 'bar',
+                x: WEEKDAYS,
+                y: agg.weekday,
+                text: agg.weekday,
+                textposition: 'auto',
+                marker: {
+                    color: agg.weekday, colorscale: 'Viridis', showscale: true,
+                    colorbar: {title: {text: 'Ticket Count'}},
+                    line: {color: 'rgba(255,255,255,0.8)', width: 2}
+                },
+                hovertemplate: '<b>%{x}</b><br>Tickets: %{y}<br><extra></extra>'
+            }, {
+                type: 'scatter',
+                x: WEEKDAYS,
+                y: agg.weekday,
+                mode: 'lines',
+                name: 'Trend',
+                line: {color: 'red', width: 3, dash: 'dash'},
+                hovertemplate: 'Trend Line<extra></extra>'
+            }],
+            layout: {
+                template: template,
+                title: {text: 'Weekly Incident Trends'},
+                xaxis: {title: {text: 'Day of Week'}},
+                yaxis: {title: {text: 'Number of Tickets'}},
+                showlegend: false
+            }
+        };
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        dashboard: {
+            // Export URL for the current dataset and filters; used in every mode
+            exportUrl: function(dataset, startDate, endDate, priority, department, status) {
+                const params = new URLSearchParams({
+                    dataset: dataset,
+                    priority: priority || 'all',
+                    department: department || 'all',
+                    status: status || 'all'
+                });
+                if (startDate && endDate) {
+                    params.set('start_date', startDate);
+                    params.set('end_date', endDate);
+                }
+                return `/_dashboard/export?${params.toString()}`;
+            },
+
+            updateFromStore: function(startDate, endDate, priority, department, status, store, crossFilter) {
+                if (!store) {
+                    return window.dash_clientside.no_update;
+                }
+
+                // One pass per distinct predicate set: KPIs and the trend use all of
+                // them, each clicked chart leaves out the predicate it set itself
+                const predicates = crossFilter || {};
+                const passes = {};
+                const aggregateFor = function(chartId) {
+                    const selection = excludeColumn(predicates, CROSS_FILTER_COLUMNS[chartId]);
+                    const key = JSON.stringify(Object.entries(selection).sort());
+                    if (!(key in passes)) {
+                        passes[key] = aggregate(store, startDate, endDate, priority, department, status, selection);
+                    }
+                    return passes[key];
+                };
+                const chartFigure = function(chartId, build) {
+                    const chartAgg = aggregateFor(chartId);
+                    return chartAgg.total === 0 ? emptyFigure(store.template) : build(chartAgg);
+                };
+
+                const agg = aggregateFor(null);
+                const figures = [
+                    chartFigure('ticket-trends-chart', a => trendFigure(a, store)),
+                    chartFigure('priority-distribution-chart',
+                                a => pieFigure(a.priority, PRIORITY_COLORS, 'Priority Distribution', store.template, false)),
+                    chartFigure('sla-performance-chart', a => slaFigure(a, store.template)),
+                    chartFigure('department-analysis-chart', a => departmentFigure(a, store.template)),
+                    chartFigure('weekly-trends-chart', a => weekdayFigure(a, store.template)),
+                    chartFigure('status-distribution-chart',
+                                a => pieFigure(a.status, STATUS_COLORS, 'Status Distribution', store.template, true))
+                ];
+
+                if (agg.total === 0) {
+                    return ['0', '0', '0.0%', {'color': 'var(--bs-danger)', 'font-weight': 'bold'}, '0.0h',
+                            'No resolved tickets'].concat(figures);
+                }
+
+                const slaCompliance = agg.slaMet / agg.total * 100;
+                const avgResolution = agg.resolved ? agg.resolutionHours / agg.resolved : 0;
+                return [
+                    agg.total.toLocaleString('en-US'),
+                    agg.open.toLocaleString('en-US'),
+                    `${slaCompliance.toFixed(1)}%`,
+                    {'color': `var(--bs-${slaCompliance >= 95 ? 'success' : 'danger'})`, 'font-weight': 'bold'},
+                    `${avgResolution.toFixed(1)}h`,
+                    'Mean time'
+                ].concat(figures);
+            }
+        }
+    });
+})();
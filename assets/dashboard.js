@@ -96,7 +96,7 @@ class DashboardEnhancer {
         const indicator = document.createElement('div');
         indicator.className = 'data-indicator';
         indicator.innerHTML = `
-            <span class="status-indicator status-online"></span>
+            <span class="status-indicator ${this.connectionState || 'status-online'}"></span>
             <small>Live Data</small>
         `;
         indicator.style.cssText = `
@@ -112,19 +112,53 @@ class DashboardEnhancer {
         chartDiv.appendChild(indicator);
     }
 
-    // Real-time Updates Simulation
+    // Real-time Updates
+    // The server pushes the data version and n8n status over server-sent events;
+    // charts only re-fetch when the version actually changes
     setupRealTimeUpdates() {
-        setInterval(() => {
-            this.updateDataIndicators();
-        }, 5000);
+        if (this.eventSource || !window.EventSource) {
+            return;
+        }
+
+        this.eventSource = new EventSource('/_dashboard/events');
+
+        this.eventSource.onopen = () => this.updateDataIndicators('status-online');
+        // EventSource reconnects on its own; show the data as possibly stale meanwhile
+        this.eventSource.onerror = () => this.updateDataIndicators('status-warning');
+
+        this.eventSource.addEventListener('data-version', (e) => {
+            // Versions of the loaded datasets; compared as sent, since the payload is an object.
+            // The first message repeats the versions the page was rendered with
+            if (this.dataVersion !== undefined && e.data !== this.dataVersion) {
+                this.setDashProps('data-version', { data: JSON.parse(e.data) });
+            }
+            this.dataVersion = e.data;
+        });
+
+        this.eventSource.addEventListener('alert-state', (e) => {
+            this.setDashProps('n8n-status', { children: e.data });
+        });
     }
 
-    updateDataIndicators() {
-        const indicators = document.querySelectorAll('.status-indicator');
+    stopRealTimeUpdates() {
+        if (this.eventSource) {
+            this.eventSource.close();
+            this.eventSource = null;
+            this.updateDataIndicators('status-warning');
+        }
+    }
+
+    setDashProps(componentId, props) {
+        if (window.dash_clientside && window.dash_clientside.set_props) {
+            window.dash_clientside.set_props(componentId, props);
+        }
+    }
+
+    updateDataIndicators(state) {
+        this.connectionState = state;
+        const indicators = document.querySelectorAll('.data-indicator .status-indicator');
         indicators.forEach(indicator => {
-            // Simulate data freshness
-            const isOnline = Math.random() > 0.1;
-            indicator.className = `status-indicator ${isOnline ? 'status-online' : 'status-warning'}`;
+            indicator.className = `status-indicator ${state}`;
         });
     }
 
@@ -187,12 +221,18 @@ class DashboardEnhancer {
     }
 
     // Menu Actions
-    exportData() {
-        this.showNotification('Exporting dashboard data...', 'info');
-        // Simulate export process
-        setTimeout(() => {
-            this.showNotification('Data exported successfully!', 'success');
-        }, 2000);
+    exportData(format = 'csv') {
+        // The export link tracks the current filters (see the exportUrl clientside callback)
+        const link = document.getElementById('export-link');
+        if (!link || !link.getAttribute('href')) {
+            this.showNotification('Export is not available yet', 'error');
+            return;
+        }
+
+        const url = format === 'csv' ? link.href : `${link.href}&format=${format}`;
+        this.showNotification('Exporting filtered tickets...', 'info');
+        // The server streams the file, so the browser download starts right away
+        window.location.href = url;
     }
 
     refreshData() {
@@ -309,7 +349,7 @@ class DashboardEnhancer {
                     </label>
                     <label style="display: block; margin-bottom: 10px;">
                         <input type="checkbox" id="autoRefresh" ${currentSettings.autoRefresh ? 'checked' : ''} style="margin-right: 8px;">
-                        Auto Refresh (30s)
+                        Live Updates
                     </label>
                 </div>
 
@@ -412,10 +452,11 @@ class DashboardEnhancer {
             document.body.classList.remove('no-animations');
         }
 
-        // Handle auto refresh
+        // Handle live updates
         if (settings.autoRefresh) {
-            // Auto refresh is handled by Dash interval component
-            console.log('Auto refresh enabled');
+            this.setupRealTimeUpdates();
+        } else {
+            this.stopRealTimeUpdates();
         }
     }
 
@@ -0,0 +1,177 @@
+"""
+Chart Callback Benchmark
+Measures time-to-full-render of the six dashboard charts with one callback
+per chart (split) against the combined multi-output callback, under a
+number of concurrent users
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, List
+
+import requests
+
+CHART_IDS = [
+    'ticket-trends-chart',
+    'priority-distribution-chart',
+    'sla-performance-chart',
+    'department-analysis-chart',
+    'weekly-trends-chart',
+    'status-distribution-chart'
+]
+PRIORITIES = ['all', 'Low', 'Medium', 'High', 'Critical']
+# Browsers open at most six connections per host, so a fan-out runs at most six requests at once
+BROWSER_CONNECTIONS = 6
+
+
+def serve(mode: str, port: int):
+    """Run the dashboard with the given chart callback mode on a threaded server"""
+    os.environ['DASHBOARD_CHART_CALLBACKS'] = mode
+    from werkzeug.serving import make_server
+    import app
+
+    make_server('127.0.0.1', port, app.app.server, threaded=True).serve_forever()
+
+
+def start_server(mode: str, port: int) -> subprocess.Popen:
+    process = subprocess.Popen([sys.executable, __file__, '--serve', mode, str(port)],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(600):
+        try:
+            requests.get(f'http://127.0.0.1:{port}/_dash-dependencies', timeout=1)
+            return process
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"Dashboard server ({mode}) did not start")
+
+
+def find_component(layout, component_id: str) -> Dict:
+    """Find a component's props in the serialized layout"""
+    if isinstance(layout, dict):
+        if layout.get('props', {}).get('id') == component_id:
+            return layout['props']
+        children = layout.get('props', {}).get('children')
+        return find_component(children, component_id) if children is not None else None
+    if isinstance(layout, list):
+        for child in layout:
+            found = find_component(child, component_id)
+            if found is not None:
+                return found
+    return None
+
+
+def chart_requests(dependencies: List[Dict]) -> List[Dict]:
+    """The callback definitions that render chart figures"""
+    return [dependency for dependency in dependencies
+            if not dependency.get('clientside_function')
+            and any(f'{chart_id}.figure' in dependency['output'] for chart_id in CHART_IDS)]
+
+
+def payload(dependency: Dict, values: Dict) -> Dict:
+    """Build the /_dash-update-component body for a filter change"""
+    def prop(item):
+        return {'id': item['id'], 'property': item['property'], 'value': values.get(item['id'])}
+
+    outputs = [dict(zip(('id', 'property'), output.rsplit('.', 1)))
+               for output in dependency['output'].strip('.').split('...')]
+    return {
+        'output': dependency['output'],
+        'outputs': outputs if len(outputs) > 1 else outputs[0],
+        'inputs': [prop(item) for item in dependency['inputs']],
+        'state': [prop(item) for item in dependency.get('state', [])],
+        'changedPropIds': ['priority-filter.value']
+    }
+
+
+def run_mode(mode: str, users: int, rounds: int, port: int) -> Dict:
+    """Render the charts ``rounds`` times per user and time each full render"""
+    process = start_server(mode, port)
+    try:
+        base = f'http://127.0.0.1:{port}'
+        dependencies = chart_requests(requests.get(f'{base}/_dash-dependencies').json())
+        picker = find_component(requests.get(f'{base}/_dash-layout').json(), 'date-range-picker')
+        first, last = date.fromisoformat(picker['start_date'][:10]), date.fromisoformat(picker['end_date'][:10])
+        span = (last - first).days
+        timings, failures = [], []
+        lock = threading.Lock()
+
+        def user(index: int):
+            session = requests.Session()
+            connections = ThreadPoolExecutor(max_workers=BROWSER_CONNECTIONS)
+            for round_index in range(-1, rounds):
+                # A distinct date range per render keeps the figure and aggregate caches cold
+                offset = (index * (rounds + 1) + round_index + 1) % max(span // 2, 1)
+                values = {
+                    'date-range-picker': None,
+                    'priority-filter': PRIORITIES[(index + round_index) % len(PRIORITIES)],
+                    'department-filter': 'all',
+                    'status-filter': 'all',
+                    'cross-filter': {}
+                }
+                bodies = [payload(dependency, values) for dependency in dependencies]
+                for body in bodies:
+                    for item in body['inputs']:
+                        if item['id'] == 'date-range-picker':
+                            item['value'] = str(first + timedelta(days=offset)) \
+                                if item['property'] == 'start_date' else str(last)
+
+                start = time.perf_counter()
+                responses = list(connections.map(
+                    lambda body: session.post(f'{base}/_dash-update-component', json=body), bodies))
+                elapsed = time.perf_counter() - start
+                with lock:
+                    failures.extend(r.status_code for r in responses if r.status_code != 200)
+                    if round_index >= 0:  # The first render warms up the connection and the dataset
+                        timings.append(elapsed)
+            connections.shutdown()
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=user, args=(index,)) for index in range(users)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+
+        timings.sort()
+        return {
+            'mode': mode,
+            'users': users,
+            'requests_per_render': len(dependencies),
+            'renders': len(timings),
+            'failures': len(failures),
+            'mean_ms': statistics.mean(timings) * 1000,
+            'p50_ms': timings[len(timings) // 2] * 1000,
+            'p95_ms': timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000,
+            'renders_per_second': len(timings) / wall
+        }
+    finally:
+        process.kill()
+        process.wait()
+
+
+if __name__ == '__main__':
+    # Usage: python benchmark_charts.py [users,...] [rounds per user] [port]
+    if len(sys.argv) > 1 and sys.argv[1] == '--serve':
+        serve(sys.argv[2], int(sys.argv[3]))
+        sys.exit(0)
+
+    user_counts = [int(users) for users in (sys.argv[1] if len(sys.argv) > 1 else '1,4,16').split(',')]
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    port = int(sys.argv[3]) if len(sys.argv) > 3 else 8077
+
+    print(f"{'mode':<10}{'users':>6}{'requests':>10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'renders/s':>11}")
+    for users in user_counts:
+        for mode in ('split', 'combined'):
+            result = run_mode(mode, users, rounds, port)
+            print(f"{result['mode']:<10}{result['users']:>6}{result['requests_per_render']:>10}"
+                  f"{result['mean_ms']:>10.1f}{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}"
+                  f"{result['renders_per_second']:>11.2f}"
+                  + (f"  ({result['failures']} failed requests)" if result['failures'] else ''))
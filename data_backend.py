@@ -0,0 +1,1390 @@
+"""
+Ticket Data Backends
+Data-access layer for the IT Support Dashboard: filters and chart aggregations
+run either in pandas over an in-memory frame or inside an embedded SQL engine
+that queries the ticket file in place
+"""
+
+import copy
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from partition_store import MANIFEST_FILE, PartitionManifest, find_manifest
+from search_index import SEARCH_COLUMNS, SearchIndex
+from sketches import DistinctSketch, QuantileSketch, SEGMENT_COLUMNS, split_days
+
+try:
+    import duckdb
+except ImportError:  # DuckDB is optional; the pandas backend is always available
+    duckdb = None
+
+OPEN_STATUSES = ['Open', 'In Progress', 'Pending']
+WEEKDAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+RESOLUTION_PERCENTILES = [50, 90, 99]
+FILTER_COLUMNS = ['priority', 'department', 'status']
+# Categorical levels of the aggregate cubes; clicking a chart adds a predicate on one of them
+CUBE_LEVELS = FILTER_COLUMNS + ['created_weekday']
+
+# Trend chart buckets, finest first; the coarsest granularity that is still
+# needed to stay within TREND_MAX_POINTS is chosen per selection
+TREND_GRANULARITIES = ['day', 'week', 'month']
+TREND_MAX_POINTS = 200
+EPOCH_DAY = np.datetime64('1970-01-01', 'D')
+EPOCH_MONTH = np.datetime64('1970-01', 'M')
+
+# Columns added by add_derived_columns (plus the *_bucket columns); exports and
+# partition files carry only the source columns
+DERIVED_COLUMNS = ['created_week', 'created_weekday', 'created_month', 'days_to_resolve']
+EXPORT_CHUNK_ROWS = 50000
+SEARCH_RESULT_LIMIT = 20
+
+# Columns summarized by per-segment sketches, and the sketch kept for each
+SKETCHED_COLUMNS = {
+    'resolution_hours': QuantileSketch,
+    'requester': DistinctSketch,
+    'assignee': DistinctSketch
+}
+
+# Explicit types for columns that can be entirely empty in a single file or partition
+CSV_COLUMN_TYPES = {
+    'assignee': 'VARCHAR',
+    'resolved_date': 'TIMESTAMP',
+    'resolution_hours': 'DOUBLE',
+    'customer_satisfaction': 'DOUBLE'
+}
+
+
+def add_derived_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Parse the date columns and add the derived columns used for analysis"""
+    df['created_date'] = pd.to_datetime(df['created_date'])
+    df['resolved_date'] = pd.to_datetime(df['resolved_date'])
+
+    df['created_week'] = df['created_date'].dt.isocalendar().week
+    df['created_weekday'] = df['created_date'].dt.day_name()
+    df['created_month'] = df['created_date'].dt.strftime('%Y-%m')
+    df['days_to_resolve'] = (df['resolved_date'] - df['created_date']).dt.days
+
+    # Integer time buckets let the trend chart count with np.bincount instead of
+    # converting every timestamp to a Python date on each callback
+    for column in ('created', 'resolved'):
+        for granularity, buckets in time_buckets(df[f'{column}_date']).items():
+            df[f'{column}_{granularity}_bucket'] = buckets
+
+    return df
+
+
+def source_columns(columns) -> List[str]:
+    """Return the columns of a ticket frame that come from the source file"""
+    return [c for c in columns if c not in DERIVED_COLUMNS and not c.endswith('_bucket')]
+
+
+def time_buckets(dates: pd.Series) -> Dict[str, np.ndarray]:
+    """
+    Convert timestamps to integer bucket numbers counted from the Unix epoch
+
+    Args:
+        dates: Timestamps, possibly containing NaT
+
+    Returns:
+        Day, week (Monday-based) and month bucket arrays keyed by granularity;
+        missing dates map to -1
+    """
+    values = dates.to_numpy(dtype='datetime64[ns]')
+    missing = np.isnat(values)
+    days = values.astype('datetime64[D]').astype(np.int64)
+    buckets = {
+        'day': days,
+        # 1970-01-01 is a Thursday, so shifting by 3 days aligns weeks to Mondays
+        'week': (days + 3) // 7,
+        'month': values.astype('datetime64[M]').astype(np.int64)
+    }
+    return {granularity: np.where(missing, -1, b).astype(np.int32) for granularity, b in buckets.items()}
+
+
+def choose_granularity(first_day: int, last_day: int) -> str:
+    """Pick the finest trend granularity that keeps a day span within TREND_MAX_POINTS"""
+    span = last_day - first_day + 1
+    if span <= TREND_MAX_POINTS:
+        return 'day'
+    if span / 7 <= TREND_MAX_POINTS:
+        return 'week'
+    return 'month'
+
+
+def bucket_starts(buckets: np.ndarray, granularity: str) -> np.ndarray:
+    """Return the first day of each integer bucket as datetime64 values"""
+    if granularity == 'week':
+        return EPOCH_DAY + (buckets * 7 - 3)
+    if granularity == 'month':
+        return (EPOCH_MONTH + buckets).astype('datetime64[D]')
+    return EPOCH_DAY + buckets
+
+
+def build_trend(created: np.ndarray, resolved: np.ndarray, granularity: str,
+                created_weights: Optional[np.ndarray] = None,
+                resolved_weights: Optional[np.ndarray] = None) -> Dict:
+    """
+    Count created and resolved tickets per bucket on a shared dense axis
+
+    Args:
+        created: Created bucket per ticket (or per pre-counted group)
+        resolved: Resolved bucket per ticket, -1 for unresolved
+        granularity: 'day', 'week' or 'month'
+        created_weights: Counts per entry when the buckets are pre-aggregated
+        resolved_weights: Counts per entry when the buckets are pre-aggregated
+
+    Returns:
+        Bucket start dates and created/resolved counts
+    """
+    valid = resolved >= 0
+    resolved = resolved[valid]
+    if resolved_weights is not None:
+        resolved_weights = resolved_weights[valid]
+
+    present = [buckets for buckets in (created, resolved) if len(buckets)]
+    lo = min(buckets.min() for buckets in present)
+    hi = max(buckets.max() for buckets in present)
+    length = int(hi - lo + 1)
+
+    return {
+        'granularity': granularity,
+        'x': bucket_starts(np.arange(lo, hi + 1), granularity),
+        'created': np.bincount(created - lo, weights=created_weights, minlength=length).astype(np.int64),
+        'resolved': np.bincount(resolved - lo, weights=resolved_weights, minlength=length).astype(np.int64)
+    }
+
+
+def build_sketches(df: pd.DataFrame) -> Dict:
+    """Build the per-segment sketches of a ticket frame, keyed by the column they summarize"""
+    return {column: sketch_type.from_frame(df, column) for column, sketch_type in SKETCHED_COLUMNS.items()}
+
+
+def update_sketches(sketches: Dict, df: pd.DataFrame) -> Dict:
+    """
+    Fold new tickets into sketches from ``build_sketches``
+
+    Returns:
+        A new sketch set; the given one is left as it was for requests still reading it
+    """
+    updated = {}
+    for column, sketch in sketches.items():
+        updated[column] = copy.copy(sketch)
+        updated[column].add(df, column)
+    return updated
+
+
+def day_range(start_date, end_date) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Convert a date filter to inclusive ``created_day_bucket`` bounds
+
+    Sketch selections and the search index match dates per day, so a range
+    ending exactly at midnight (as the date picker sends it) stops at the
+    previous day, like the row filter does.
+    """
+    if not (start_date and end_date):
+        return None, None
+    start = pd.Timestamp(start_date).floor('D')
+    end = (pd.Timestamp(end_date) - pd.Timedelta(1, 'ns')).floor('D')
+    return ((np.datetime64(start, 'D') - EPOCH_DAY).astype(int),
+            (np.datetime64(end, 'D') - EPOCH_DAY).astype(int))
+
+
+def day_dates(first_day: Optional[int], last_day: Optional[int]) -> Tuple[Optional[pd.Timestamp], ...]:
+    """Convert inclusive day numbers back to dates: midnight of the first day and midnight after the last"""
+    if first_day is None or last_day is None:
+        return None, None
+    return (pd.Timestamp(EPOCH_DAY + np.timedelta64(int(first_day), 'D')),
+            pd.Timestamp(EPOCH_DAY + np.timedelta64(int(last_day) + 1, 'D')))
+
+
+def source_version(path: str) -> str:
+    """Identify the current contents of a ticket file or partitioned store by its stat signature"""
+    if os.path.isdir(path):
+        path = os.path.join(path, MANIFEST_FILE)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return '0'
+    return f'{stat.st_mtime_ns:x}-{stat.st_size:x}'
+
+
+def load_data(path: str = 'sample_tickets.csv', statuses: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Load and preprocess the ticket data
+
+    Args:
+        path: CSV or Parquet ticket file
+        statuses: Only keep tickets in these statuses (pushed into the Parquet reader)
+    """
+    try:
+        if path.endswith('.parquet'):
+            df = pd.read_parquet(path, filters=[('status', 'in', statuses)] if statuses else None)
+        else:
+            df = pd.read_csv(path)
+            if statuses:
+                df = df[df['status'].isin(statuses)].reset_index(drop=True)
+        return add_derived_columns(df)
+    except FileNotFoundError:
+        # Return empty dataframe if file doesn't exist
+        return pd.DataFrame()
+
+
+def day_buckets(days: np.ndarray, granularity: str) -> np.ndarray:
+    """Convert day bucket numbers to the bucket numbers of a coarser granularity"""
+    if granularity == 'week':
+        return (days + 3) // 7
+    if granularity == 'month':
+        return ((EPOCH_DAY + days).astype('datetime64[M]') - EPOCH_MONTH).astype(np.int64)
+    return days
+
+
+def cube_trend(cube: pd.DataFrame, resolved_cube: pd.DataFrame, granularity: Optional[str] = None,
+               first_day: Optional[int] = None, last_day: Optional[int] = None) -> Dict:
+    """
+    Build the trend of a selection from its aggregate cubes
+
+    Args:
+        cube: Created counts with a ``created_day_bucket`` index level
+        resolved_cube: Resolved counts with a ``resolved_day_bucket`` index level
+        granularity: 'day', 'week' or 'month'; chosen from the span when None
+        first_day: Optional first day bucket to keep (e.g. a zoom window)
+        last_day: Optional last day bucket to keep
+
+    Returns:
+        Trend dictionary (see ``build_trend``), empty when nothing matches
+    """
+    created = cube.index.get_level_values('created_day_bucket').to_numpy()
+    resolved = resolved_cube.index.get_level_values('resolved_day_bucket').to_numpy()
+    created_counts = cube['count'].to_numpy()
+    resolved_counts = resolved_cube['count'].to_numpy()
+
+    if first_day is not None and last_day is not None:
+        keep = (created >= first_day) & (created <= last_day)
+        created, created_counts = created[keep], created_counts[keep]
+        keep = (resolved >= first_day) & (resolved <= last_day)
+        resolved, resolved_counts = resolved[keep], resolved_counts[keep]
+
+    if not len(created) and not len(resolved):
+        return {}
+
+    if granularity is None:
+        days = np.concatenate([created, resolved])
+        granularity = choose_granularity(days.min(), days.max())
+
+    return build_trend(day_buckets(created, granularity), day_buckets(resolved, granularity), granularity,
+                       created_counts, resolved_counts)
+
+
+def filter_cube(cube: pd.DataFrame, predicates: Dict[str, str]) -> pd.DataFrame:
+    """Keep the cells of an aggregate cube matching every cross-filter predicate"""
+    mask = np.ones(len(cube), dtype=bool)
+    for column, value in predicates.items():
+        mask &= (cube.index.get_level_values(column) == value)
+    return cube[mask]
+
+
+def combine_predicates(priority: str, department: str, status: str,
+                       predicates: Optional[Dict[str, str]]) -> Optional[Tuple[Dict[str, str], Optional[int]]]:
+    """
+    Merge the dropdown filters with cross-filter predicates
+
+    Returns:
+        (categorical filters, weekday index or None), or None when a predicate
+        contradicts a dropdown and nothing can match
+    """
+    filters = dict(zip(FILTER_COLUMNS, (priority, department, status)))
+    weekday = None
+    for column, value in (predicates or {}).items():
+        if column == 'created_weekday':
+            weekday = WEEKDAY_ORDER.index(value)
+        elif filters[column] == 'all':
+            filters[column] = value
+        elif filters[column] != value:
+            return None
+    return filters, weekday
+
+
+def summarize_cube(cube: pd.DataFrame, resolved_cube: pd.DataFrame, resolution: Dict) -> Dict:
+    """
+    Derive KPI values and chart breakdowns from a grouped selection
+
+    Args:
+        cube: Counts and SLA-met sums indexed by CUBE_LEVELS plus ``created_day_bucket``
+        resolved_cube: Resolved counts indexed by CUBE_LEVELS plus ``resolved_day_bucket``
+        resolution: Resolution time summary (see ``TicketBackend.resolution_summary``)
+
+    Returns:
+        Aggregates consumed by the KPI and chart callbacks; the cubes are kept
+        so cross-filter predicates can narrow them later
+    """
+    if cube.empty:
+        return {'total': 0}
+
+    by_priority = cube.groupby(level='priority').sum()
+    status_counts = cube.groupby(level='status')['count'].sum().sort_values(ascending=False)
+
+    sla_by_priority = by_priority.sort_index().reset_index().rename(columns={'sla_met': 'sum'})
+    sla_by_priority['sla_percentage'] = sla_by_priority['sum'] / sla_by_priority['count'] * 100
+
+    total = int(by_priority['count'].sum())
+    return {
+        'total': total,
+        'open': int(status_counts.reindex(OPEN_STATUSES, fill_value=0).sum()),
+        'sla_compliance': by_priority['sla_met'].sum() / total * 100,
+        'avg_resolution': resolution['mean'],
+        'resolution_percentiles': resolution['percentiles'],
+        'trend': cube_trend(cube, resolved_cube),
+        'priority_counts': by_priority['count'].sort_values(ascending=False),
+        'sla_by_priority': sla_by_priority,
+        'department_counts': cube.groupby(level='department')['count'].sum().sort_values(ascending=False),
+        'weekday_counts': cube.groupby(level='created_weekday')['count'].sum().reindex(WEEKDAY_ORDER, fill_value=0),
+        'status_counts': status_counts,
+        'cube': cube,
+        'resolved_cube': resolved_cube
+    }
+
+
+def encode_aggregate_store(created: pd.DataFrame, resolved: pd.DataFrame, version: str) -> Dict:
+    """
+    Encode pre-aggregated ticket counts as compact columnar lists for the browser
+
+    Args:
+        created: Per (created day, priority, department, status) counts, SLA-met
+            sums, resolution hour sums and resolved counts
+        resolved: Per (created day, resolved day, priority, department, status) counts
+        version: Data version the aggregates were computed from
+
+    Returns:
+        JSON-ready store with categorical columns dictionary-encoded as integer codes
+    """
+    dimensions = {
+        column: sorted(set(created[column].dropna()) | set(resolved[column].dropna()))
+        for column in FILTER_COLUMNS
+    }
+
+    def encode(frame: pd.DataFrame) -> Dict[str, List]:
+        columns = {}
+        for column in frame.columns:
+            if column in dimensions:
+                codes = pd.Categorical(frame[column], categories=dimensions[column]).codes
+                columns[column] = codes.tolist()
+            else:
+                values = frame[column].to_numpy()
+                columns[column] = np.round(values, 3).tolist() if values.dtype.kind == 'f' else values.astype(np.int64).tolist()
+        return columns
+
+    return {
+        'version': version,
+        'dimensions': dimensions,
+        'open_statuses': OPEN_STATUSES,
+        'trend_max_points': TREND_MAX_POINTS,
+        'created': encode(created),
+        'resolved': encode(resolved)
+    }
+
+
+class TicketBackend:
+    """Interface shared by the ticket data backends"""
+
+    name = 'base'
+    # Changes whenever the underlying tickets change; part of every cache key
+    version = '0'
+    # Full-text index over every ticket and the version it was built from; a
+    # version behind ``version`` keeps answering searches until its rebuild swaps in
+    _search_index: Optional[SearchIndex] = None
+    _search_version: Optional[str] = None
+
+    def __init__(self):
+        # Guards starting the background search index build, so one runs at a time
+        self._search_lock = threading.Lock()
+        self._search_build: Optional[threading.Thread] = None
+
+    def select(self, start_date, end_date, priority: str = 'all', department: str = 'all',
+               status: str = 'all') -> pd.DataFrame:
+        """
+        Return the tickets matching a filter selection
+
+        Args:
+            start_date: Earliest ``created_date`` to include (or None)
+            end_date: Latest ``created_date`` to include (or None)
+            priority: Priority to keep, or 'all'
+            department: Department to keep, or 'all'
+            status: Status to keep, or 'all'
+
+        Returns:
+            Matching tickets with derived columns
+        """
+        raise NotImplementedError
+
+    def iter_select(self, start_date, end_date, priority: str = 'all', department: str = 'all',
+                    status: str = 'all', chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+        """
+        Yield the tickets matching a filter selection in chunks, for exports
+
+        Only the source columns are included, and the selection is never
+        materialized as a whole. At least one (possibly empty) chunk is yielded
+        so consumers always see the column layout.
+        """
+        raise NotImplementedError
+
+    def aggregate(self, start_date, end_date, priority: str = 'all', department: str = 'all',
+                  status: str = 'all') -> Dict:
+        """Return KPI values and chart aggregates for a filter selection"""
+        raise NotImplementedError
+
+    def trend(self, start_date, end_date, priority: str = 'all', department: str = 'all',
+              status: str = 'all', granularity: Optional[str] = None) -> Dict:
+        """
+        Return created and resolved counts per time bucket for a filter selection
+
+        Args:
+            granularity: 'day', 'week' or 'month'; chosen from the span when None
+
+        Returns:
+            Trend dictionary (see ``build_trend``), empty when nothing matches
+        """
+        raise NotImplementedError
+
+    def _sketches(self, start_date, end_date) -> List[Dict]:
+        """Return the sketch sets (see ``build_sketches``) covering at least a date range"""
+        raise NotImplementedError
+
+    def _loaded_sketch_sets(self) -> List[Dict]:
+        """Return every sketch set currently held in memory"""
+        raise NotImplementedError
+
+    def refine(self, aggregates: Dict, start_date, end_date, priority: str = 'all', department: str = 'all',
+               status: str = 'all', predicates: Optional[Dict[str, str]] = None) -> Dict:
+        """
+        Narrow a selection's aggregates by cross-filter predicates
+
+        Works on the cubes kept in ``aggregates`` (the result of ``aggregate``
+        for the same filters), so drilling down never rescans the tickets.
+
+        Args:
+            aggregates: Aggregates of the dropdown/date selection
+            predicates: CUBE_LEVELS column -> value, from clicks on the charts
+
+        Returns:
+            Aggregates in the same shape as ``aggregate``
+        """
+        if not predicates or aggregates['total'] == 0:
+            return aggregates
+
+        return summarize_cube(
+            filter_cube(aggregates['cube'], predicates),
+            filter_cube(aggregates['resolved_cube'], predicates),
+            self.resolution_summary(start_date, end_date, priority, department, status, predicates)
+        )
+
+    def _day_rows(self, days: List[Tuple[Optional[int], Optional[int]]], filters: Dict[str, str],
+                  weekday: Optional[int], columns: List[str]) -> pd.DataFrame:
+        """
+        Read columns of the tickets created on some days that match the filters
+
+        Args:
+            days: Inclusive ``created_day_bucket`` spans; (None, None) for every day
+            filters: Categorical column -> value to keep, or 'all'
+            weekday: Only include tickets created on this weekday (Monday = 0)
+            columns: Columns to return
+        """
+        raise NotImplementedError
+
+    def _split_selection(self, start_date, end_date, filters: Dict[str, str], weekday: Optional[int],
+                         columns: List[str]) -> Tuple[List[Dict], Tuple, pd.DataFrame]:
+        """
+        Split a selection into sketches of its whole months and the tickets of its other days
+
+        Sketches are kept per month, so the partial months at the edges of a
+        date range, and every day of a weekday selection, are read from the
+        tickets instead.
+
+        Returns:
+            (sketch sets to merge, the day span of the months to take from
+            them, ``columns`` of the remaining tickets)
+        """
+        first_day, last_day = day_range(start_date, end_date)
+        months, edges = split_days(first_day, last_day) if weekday is None else (None, [(first_day, last_day)])
+        sketches = self._sketches(start_date, end_date) if months is not None else []
+        rows = self._day_rows(edges, filters, weekday, columns) if edges else pd.DataFrame(columns=columns)
+        return sketches, months or (None, None), rows
+
+    def resolution_summary(self, start_date, end_date, priority: str = 'all', department: str = 'all',
+                           status: str = 'all', predicates: Optional[Dict[str, str]] = None) -> Dict:
+        """
+        Estimate mean and percentiles of ``resolution_hours`` for a filter selection
+
+        Merges the per-segment sketches of the whole months in the selection
+        with the tickets of its remaining days; dates are matched at day
+        resolution.
+
+        Returns:
+            {'count', 'mean', 'percentiles': {p: hours}} for RESOLUTION_PERCENTILES
+        """
+        combined = combine_predicates(priority, department, status, predicates)
+        if combined is None:
+            return QuantileSketch().summary(None, None, {}, RESOLUTION_PERCENTILES)
+        filters, weekday = combined
+        sketches, months, rows = self._split_selection(start_date, end_date, filters, weekday, ['resolution_hours'])
+        sketch = QuantileSketch.merge(s['resolution_hours'] for s in sketches)
+        return sketch.summary(*months, filters, RESOLUTION_PERCENTILES,
+                              rows['resolution_hours'].to_numpy(dtype='float64'))
+
+    def distinct_counts(self, start_date, end_date, priority: str = 'all', department: str = 'all',
+                        status: str = 'all', predicates: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+        """
+        Estimate distinct requesters and assignees for a filter selection
+
+        Merges the per-segment HyperLogLog sketches of the whole months in the
+        selection with the tickets of its remaining days; dates are matched at
+        day resolution. Estimates never exceed the selection's ticket count.
+
+        Returns:
+            {'requesters': n, 'assignees': n}
+        """
+        combined = combine_predicates(priority, department, status, predicates)
+        if combined is None:
+            return {'requesters': 0, 'assignees': 0}
+
+        filters, weekday = combined
+        sketches, months, rows = self._split_selection(start_date, end_date, filters, weekday,
+                                                       ['requester', 'assignee'])
+        return {
+            column: DistinctSketch.merge(s[source] for s in sketches).count(*months, filters, rows[source].to_numpy())
+            for column, source in (('requesters', 'requester'), ('assignees', 'assignee'))
+        }
+
+    @property
+    def search_indexed(self) -> bool:
+        """Whether the search index covers the current version"""
+        return self._search_index is not None and self._search_version == self.version
+
+    def search_index(self, wait: bool = False) -> Optional[SearchIndex]:
+        """
+        Return the full-text index over every ticket
+
+        A missing or outdated index is rebuilt on a background thread, started
+        once however many callers ask for it; until it swaps in, callers get
+        the previous index.
+
+        Args:
+            wait: Block until the index covers the current version
+
+        Returns:
+            The index, or None while the first one is still being built
+        """
+        if not self.search_indexed:
+            with self._search_lock:
+                if not self.search_indexed and (self._search_build is None or not self._search_build.is_alive()):
+                    self._search_build = threading.Thread(target=self._build_search_index, daemon=True,
+                                                          name=f'search-index-{self.name}')
+                    self._search_build.start()
+                build = self._search_build
+            if wait:
+                build.join()
+        return self._search_index
+
+    def _build_search_index(self):
+        version = self.version
+        try:
+            index = SearchIndex.from_frames(self.iter_select(None, None))
+        except Exception as e:
+            print(f"Search index error ({self.name}): {e}")
+            return
+        # Tickets refreshed during the build leave the version behind, and the next search rebuilds again
+        self._search_index, self._search_version = index, version
+
+    def search(self, query: str, start_date, end_date, priority: str = 'all', department: str = 'all',
+               status: str = 'all', predicates: Optional[Dict[str, str]] = None,
+               limit: int = SEARCH_RESULT_LIMIT) -> Optional[Dict]:
+        """
+        Find tickets whose title or description contains every query term
+
+        Matches come from the inverted index and are intersected with the
+        filter selection there, so no ticket rows are scanned; dates are
+        matched at day resolution.
+
+        Args:
+            query: Search text; the last term is matched as a prefix
+            predicates: Cross-filter predicates (see ``refine``)
+            limit: Number of tickets to return, newest first
+
+        Returns:
+            {'count': matches, 'tickets': frame of at most ``limit`` tickets,
+            'truncated': whether the last term matched too many words to search
+            them all, 'indexing': whether the index is still being built or
+            rebuilt for the latest tickets}, or None when the query has no terms
+        """
+        indexing = not self.search_indexed
+        index = self.search_index()
+        if index is None:
+            index = SearchIndex()
+        matched = index.match(query)
+        if matched is None:
+            return None
+        rows, truncated = matched
+
+        combined = combine_predicates(priority, department, status, predicates)
+        if combined is None:
+            rows = rows[:0]
+        else:
+            filters, weekday = combined
+            rows = index.select(rows, *day_range(start_date, end_date), filters, weekday)
+        return {'count': len(rows), 'tickets': index.results(rows, limit), 'truncated': truncated,
+                'indexing': indexing}
+
+    def open_tickets(self) -> pd.DataFrame:
+        """Return every ticket that is still in an open status"""
+        raise NotImplementedError
+
+    def aggregate_store(self) -> Dict:
+        """Return day x priority x department x status aggregates for client-side filtering"""
+        raise NotImplementedError
+
+    def filter_options(self) -> Dict[str, List[str]]:
+        """Return the distinct values offered by each categorical filter"""
+        raise NotImplementedError
+
+    def date_bounds(self) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+        """Return the earliest and latest ``created_date``"""
+        raise NotImplementedError
+
+    def refresh(self) -> bool:
+        """Pick up changes to the ticket source; returns True when ``version`` moved"""
+        return False
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held in process: loaded tickets, the sketches and the search index"""
+        index = self._search_index
+        sketches = sum(sketch.nbytes for sketch_set in self._loaded_sketch_sets() for sketch in sketch_set.values())
+        return sketches + (index.nbytes if index is not None else 0)
+
+    @property
+    def empty(self) -> bool:
+        return self.date_bounds()[0] is None
+
+
+class PandasBackend(TicketBackend):
+    """
+    Filters and aggregates tickets held in pandas
+
+    Backed either by a single frame or by a partitioned store, in which case
+    monthly partitions are loaded on first use and a selection only touches
+    the partitions overlapping its date range.
+    """
+
+    name = 'pandas'
+    # Source file or store directory, set when loaded with ``from_path``
+    path = None
+
+    def __init__(self, df: Optional[pd.DataFrame] = None, manifest: Optional[PartitionManifest] = None):
+        super().__init__()
+        self.manifest = manifest
+        self._df = df if df is not None else pd.DataFrame()
+        self._partitions: Dict[str, pd.DataFrame] = {}
+        # Per-segment sketches, built with the data (one set per partition when partitioned)
+        self._sketch_set: Optional[Dict] = build_sketches(self._df) if not self._df.empty else None
+        self._partition_sketches: Dict[str, Dict] = {}
+
+    @classmethod
+    def from_path(cls, path: str) -> 'PandasBackend':
+        manifest = find_manifest(path)
+        backend = cls(manifest=manifest) if manifest is not None else cls(load_data(path))
+        backend.path = path
+        backend.version = source_version(path)
+        return backend
+
+    def refresh(self):
+        if self.path is None:
+            return False
+        version = source_version(self.path)
+        if version == self.version:
+            return False
+
+        manifest = find_manifest(self.path)
+        if manifest is not None:
+            # Partitions may have been rewritten in place, so drop every cached month
+            self._partitions = {}
+            self._partition_sketches = {}
+            self.manifest = manifest
+        else:
+            previous, df = self._df, load_data(self.path)
+            appended = self._is_append(previous, df)
+            if self._sketch_set is not None and appended:
+                # New tickets only: fold them into the sketches instead of rebuilding them
+                self._sketch_set = update_sketches(self._sketch_set, df.iloc[len(previous):])
+            else:
+                self._sketch_set = build_sketches(df) if not df.empty else None
+            if self.search_indexed and appended:
+                self._search_index.add(df.iloc[len(previous):])
+                self._search_version = version
+            self._df = df
+            self.manifest = None
+        self.version = version
+        return True
+
+    def memory_bytes(self):
+        frames = [self._df, *self._partitions.values()]
+        return super().memory_bytes() + int(sum(frame.memory_usage(deep=True).sum() for frame in frames))
+
+    @staticmethod
+    def _is_append(previous: pd.DataFrame, df: pd.DataFrame) -> bool:
+        """Whether ``df`` is ``previous`` with rows appended and the sketched and searched columns unchanged"""
+        if previous.empty or len(df) < len(previous):
+            return False
+        columns = ['ticket_id'] + list(SKETCHED_COLUMNS) + SEGMENT_COLUMNS + SEARCH_COLUMNS
+        return df[columns].iloc[:len(previous)].equals(previous[columns])
+
+    def _loaded_sketch_sets(self):
+        return [s for s in [self._sketch_set, *list(self._partition_sketches.values())] if s is not None]
+
+    def _sketches(self, start_date, end_date):
+        if self.manifest is None:
+            return [self._sketch_set] if self._sketch_set is not None else []
+
+        sketches = []
+        for partition in self.manifest.prune(start_date, end_date):
+            self._load_partition(partition)
+            if partition['month'] in self._partition_sketches:
+                sketches.append(self._partition_sketches[partition['month']])
+        return sketches
+
+    def _load_partition(self, partition: Dict) -> pd.DataFrame:
+        month = partition['month']
+        if month not in self._partitions:
+            df = load_data(self.manifest.path(partition))
+            # Sketches are built with the partition, so no request waits for them later
+            if not df.empty:
+                self._partition_sketches[month] = build_sketches(df)
+            self._partitions[month] = df
+        return self._partitions[month]
+
+    def _frame(self, start_date=None, end_date=None) -> pd.DataFrame:
+        """Return the tickets that can match a date range, loading only overlapping partitions"""
+        if self.manifest is None:
+            return self._df
+
+        parts = [self._load_partition(p) for p in self.manifest.prune(start_date, end_date)]
+        parts = [p for p in parts if not p.empty]
+        if not parts:
+            return pd.DataFrame()
+        return parts[0] if len(parts) == 1 else pd.concat(parts, ignore_index=True)
+
+    @property
+    def df(self) -> pd.DataFrame:
+        return self._frame()
+
+    def _day_rows(self, days, filters, weekday, columns):
+        spans = [day_dates(first_day, last_day) for first_day, last_day in days]
+        bounded = all(start is not None for start, _ in spans)
+        df = self._frame(min(s for s, _ in spans), max(e for _, e in spans)) if bounded else self._frame()
+        if df.empty:
+            return pd.DataFrame(columns=columns)
+
+        # The day columns narrow the rows before the categorical filters run
+        created = df['created_day_bucket'].to_numpy()
+        mask = np.zeros(len(df), dtype=bool) if bounded else np.ones(len(df), dtype=bool)
+        if bounded:
+            for first_day, last_day in days:
+                mask |= (created >= first_day) & (created <= last_day)
+        if weekday is not None:
+            # Day 0 (1970-01-01) was a Thursday; weekdays count from Monday = 0
+            mask &= (created + 3) % 7 == weekday
+        rows = np.flatnonzero(mask)
+        rows = pd.DataFrame({column: df[column].to_numpy()[rows] for column in FILTER_COLUMNS + columns})
+        return rows.loc[self._mask(rows, None, None, *(filters[column] for column in FILTER_COLUMNS)), columns]
+
+    @staticmethod
+    def _mask(df: pd.DataFrame, start_date, end_date, priority, department, status) -> np.ndarray:
+        mask = np.ones(len(df), dtype=bool)
+
+        # Date filter
+        if start_date and end_date:
+            mask &= ((df['created_date'] >= start_date) & (df['created_date'] <= end_date)).to_numpy()
+
+        # Priority, department and status filters
+        for column, value in zip(FILTER_COLUMNS, (priority, department, status)):
+            if value != 'all':
+                mask &= (df[column] == value).to_numpy()
+
+        return mask
+
+    def select(self, start_date, end_date, priority='all', department='all', status='all'):
+        df = self._frame(start_date, end_date)
+        if df.empty:
+            return df
+        return df[self._mask(df, start_date, end_date, priority, department, status)]
+
+    def iter_select(self, start_date, end_date, priority='all', department='all', status='all',
+                    chunk_rows=EXPORT_CHUNK_ROWS):
+        if self.manifest is None:
+            frames = [self._df]
+        else:
+            # One partition at a time instead of concatenating the whole range
+            frames = (self._load_partition(p) for p in self.manifest.prune(start_date, end_date))
+
+        columns, yielded = [], False
+        for df in frames:
+            if df.empty:
+                continue
+            columns = source_columns(df.columns)
+            positions = np.flatnonzero(self._mask(df, start_date, end_date, priority, department, status))
+            for offset in range(0, len(positions), chunk_rows):
+                yield df.iloc[positions[offset:offset + chunk_rows]][columns]
+                yielded = True
+
+        if not yielded:
+            yield pd.DataFrame(columns=columns)
+
+    def aggregate(self, start_date, end_date, priority='all', department='all', status='all'):
+        filtered_df = self.select(start_date, end_date, priority, department, status)
+        if filtered_df.empty:
+            return {'total': 0}
+
+        # One grouped pass over the categorical columns and the day; the per-chart
+        # breakdowns are reductions of this small cube rather than new scans of the rows
+        cube = filtered_df.groupby(
+            CUBE_LEVELS + ['created_day_bucket'], sort=False
+        ).agg(count=('ticket_id', 'size'), sla_met=('sla_met', 'sum'))
+
+        resolved_df = filtered_df[filtered_df['resolved_day_bucket'] >= 0]
+        resolved_cube = resolved_df.groupby(
+            CUBE_LEVELS + ['resolved_day_bucket'], sort=False
+        ).agg(count=('ticket_id', 'size'))
+
+        resolution = self.resolution_summary(start_date, end_date, priority, department, status)
+        return summarize_cube(cube, resolved_cube, resolution)
+
+    @staticmethod
+    def _trend(filtered_df: pd.DataFrame, granularity: Optional[str] = None) -> Dict:
+        """Count created and resolved tickets per time bucket with np.bincount"""
+        if granularity is None:
+            created_days = filtered_df['created_day_bucket'].to_numpy()
+            resolved_days = filtered_df['resolved_day_bucket'].to_numpy()
+            resolved_days = resolved_days[resolved_days >= 0]
+            first_day = min(created_days.min(), resolved_days.min()) if len(resolved_days) else created_days.min()
+            last_day = max(created_days.max(), resolved_days.max()) if len(resolved_days) else created_days.max()
+            granularity = choose_granularity(first_day, last_day)
+
+        return build_trend(filtered_df[f'created_{granularity}_bucket'].to_numpy(),
+                           filtered_df[f'resolved_{granularity}_bucket'].to_numpy(),
+                           granularity)
+
+    def trend(self, start_date, end_date, priority='all', department='all', status='all', granularity=None):
+        filtered_df = self.select(start_date, end_date, priority, department, status)
+        if filtered_df.empty:
+            return {}
+        return self._trend(filtered_df, granularity)
+
+    def aggregate_store(self):
+        df = self.df
+        if df.empty:
+            return encode_aggregate_store(pd.DataFrame(columns=['day', *FILTER_COLUMNS]),
+                                          pd.DataFrame(columns=['day', 'resolved_day', *FILTER_COLUMNS]),
+                                          self.version)
+
+        keys = [df['created_day_bucket'].rename('day'), df['priority'], df['department'], df['status']]
+        created = df.groupby(keys, sort=False).agg(
+            count=('ticket_id', 'size'),
+            sla_met=('sla_met', 'sum'),
+            resolution_hours=('resolution_hours', 'sum'),
+            resolved=('resolution_hours', 'count')
+        ).reset_index()
+
+        resolved_df = df[df['resolved_day_bucket'] >= 0]
+        keys = [resolved_df['created_day_bucket'].rename('day'), resolved_df['resolved_day_bucket'].rename('resolved_day'),
+                resolved_df['priority'], resolved_df['department'], resolved_df['status']]
+        resolved = resolved_df.groupby(keys, sort=False).size().reset_index(name='count')
+
+        return encode_aggregate_store(created, resolved, self.version)
+
+    def open_tickets(self):
+        if self.manifest is None:
+            return self._df[self._df['status'].isin(OPEN_STATUSES)] if not self._df.empty else self._df
+
+        # Partitions not loaded yet are read for their open tickets only, and not kept
+        parts = []
+        for partition in self.manifest.partitions:
+            df = self._partitions.get(partition['month'])
+            if df is None:
+                parts.append(load_data(self.manifest.path(partition), OPEN_STATUSES))
+            elif not df.empty:
+                parts.append(df[df['status'].isin(OPEN_STATUSES)])
+        parts = [part for part in parts if not part.empty]
+        return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+
+    def filter_options(self):
+        if self.manifest is not None:
+            return {column: self.manifest.filter_values.get(column, []) for column in FILTER_COLUMNS}
+        if self.df.empty:
+            return {column: [] for column in FILTER_COLUMNS}
+        return {column: list(self.df[column].unique()) for column in FILTER_COLUMNS}
+
+    def date_bounds(self):
+        if self.manifest is not None:
+            return self.manifest.date_bounds()
+        if self.df.empty:
+            return None, None
+        return self.df['created_date'].min(), self.df['created_date'].max()
+
+
+class DuckDBBackend(TicketBackend):
+    """
+    Queries the tickets with DuckDB
+
+    Filter predicates and the group-bys behind each chart are pushed into the
+    engine, so only small aggregate results are materialized in Python.
+    Parquet files and partitions are queried in place. CSV is parsed once
+    per version into tables of an on-disk database in the temp directory, so
+    queries never re-parse it and tables larger than memory are paged by
+    DuckDB's buffer manager instead of held in RAM. When pointed at a
+    partitioned store, each query scans only the partitions overlapping its
+    date range, and a CSV partition is loaded on first use.
+    """
+
+    name = 'duckdb'
+
+    def __init__(self, path: str):
+        super().__init__()
+        if duckdb is None:
+            raise ImportError("duckdb is not installed")
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+
+        self.path = path
+        self.version = source_version(path)
+        self.manifest = find_manifest(path)
+        self._in_place = (self.manifest.file_format if self.manifest is not None else
+                          os.path.splitext(path)[1].lstrip('.')) == 'parquet'
+        if self._in_place:
+            self._con = duckdb.connect(database=':memory:')
+        else:
+            directory = tempfile.mkdtemp(prefix='dashboard-duckdb-')
+            self._con = duckdb.connect(database=os.path.join(directory, 'tickets.duckdb'))
+            weakref.finalize(self, _close_database, self._con, directory)
+        # Guards loading CSV partitions into tables, which concurrent callbacks may request together
+        self._lock = threading.Lock()
+        # Partition month -> table holding that CSV partition, named per load generation
+        self._partition_tables: Dict[str, str] = {}
+        self._generation = 0
+        # Row count and fingerprint of the loaded ticket table, to recognize appends on refresh
+        self._fingerprint = (0, None)
+        if self.manifest is None:
+            self._load_table()
+            self._fingerprint = self._table_fingerprint()
+        # Sketch sets keyed by partition month ('' for a single file), with the
+        # (path, version) of the file each partition's set was built from; a
+        # partition's set is built the first time a selection reaches it
+        self._sketch_lock = threading.Lock()
+        self._sketch_sources: Dict[str, Tuple[str, str]] = {}
+        self._sketch_sets: Dict[str, Dict] = {}
+        if self.manifest is None:
+            self._sketch_sets[''] = build_sketches(self._sketch_rows('tickets'))
+
+    def _load_table(self):
+        """Expose the ticket file as ``tickets``: a view over Parquet, a table parsed once from CSV"""
+        kind = 'VIEW' if self._in_place else 'TABLE'
+        self._con.execute(f"CREATE OR REPLACE {kind} tickets AS SELECT * FROM {self._scan_expression([self.path])}")
+
+    def _numbered_tickets(self) -> Tuple[str, str]:
+        """Return the tickets as a relation with a file-order row number, and that column's name"""
+        if self._in_place:
+            return self._scan_expression([self.path], row_numbers=True), 'file_row_number'
+        return 'tickets', 'rowid'
+
+    def _table_fingerprint(self, rows: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Return the row count and an order-sensitive hash of the sketched and searched columns
+
+        Args:
+            rows: Only fingerprint the first ``rows`` rows of the tickets, in file order
+        """
+        columns = ', '.join(['ticket_id', 'created_date', 'priority', 'department', 'status',
+                             *SKETCHED_COLUMNS, *SEARCH_COLUMNS])
+        relation, row_number = self._numbered_tickets()
+        where = f"WHERE {row_number} < {int(rows)}" if rows is not None else ""
+        cursor = self._con.cursor()
+        try:
+            count, digest = cursor.execute(
+                f"SELECT count(*), sum(hash({row_number}, {columns})) FROM {relation} {where}").fetchone()
+        finally:
+            cursor.close()
+        return int(count), digest
+
+    def refresh(self):
+        version = source_version(self.path)
+        if version == self.version:
+            return False
+
+        if os.path.isdir(self.path):
+            manifest = find_manifest(self.path)
+            partitions = {p['month']: p for p in manifest.partitions} if manifest is not None else {}
+            with self._sketch_lock:
+                # Months whose partition file did not change keep their sketches; rewritten
+                # months that were in use are re-sketched here, in the watcher, rather than
+                # by the next request, and the rest wait until a selection reaches them
+                sketch_sets = {}
+                for month, sketches in self._sketch_sets.items():
+                    partition = partitions.get(month)
+                    if partition is None:
+                        continue
+                    if self._sketch_sources.get(month) != self._partition_source(manifest, partition):
+                        sketches = self._partition_sketches(manifest, partition)
+                    sketch_sets[month] = sketches
+                self._sketch_sets = sketch_sets
+                self.manifest = manifest
+            with self._lock:
+                stale, self._partition_tables = list(self._partition_tables.values()), {}
+                self._generation += 1
+            # Queries already running keep reading their snapshot of the dropped tables
+            for table in stale:
+                self._con.execute(f"DROP TABLE IF EXISTS {table}")
+        else:
+            rows, digest = self._fingerprint
+            self._load_table()
+            self._fingerprint = self._table_fingerprint()
+            sketches = self._sketch_sets.get('')
+            if sketches is not None and self._fingerprint[0] >= rows and self._table_fingerprint(rows) == (rows, digest):
+                # Tickets were only appended: fold the new rows into the sketches and the search index
+                relation, row_number = self._numbered_tickets()
+                appended = add_derived_columns(self._query(
+                    f"SELECT * FROM {relation} WHERE {row_number} >= {rows} ORDER BY {row_number}"))
+                self._sketch_sets = {'': update_sketches(sketches, appended)}
+                if self.search_indexed:
+                    self._search_index.add(appended)
+                    self._search_version = version
+            else:
+                self._sketch_sets = {'': build_sketches(self._sketch_rows('tickets'))}
+        self.version = version
+        return True
+
+    @staticmethod
+    def _scan_expression(paths: List[str], row_numbers: bool = False) -> str:
+        files = ', '.join("'" + p.replace("'", "''") + "'" for p in paths)
+        if paths[0].endswith('.parquet'):
+            return f"read_parquet([{files}], union_by_name=true{', file_row_number=true' if row_numbers else ''})"
+        types = ', '.join(f"'{column}': '{sql_type}'" for column, sql_type in CSV_COLUMN_TYPES.items())
+        return f"read_csv_auto([{files}], header=true, union_by_name=true, types={{{types}}})"
+
+    def _source(self, start_date=None, end_date=None) -> Optional[str]:
+        """Return the relation to scan for a date range, or None when no partition overlaps"""
+        if self.manifest is None:
+            return 'tickets'
+
+        partitions = self.manifest.prune(start_date, end_date)
+        if not partitions:
+            return None
+        if self.manifest.file_format == 'parquet':
+            return self._scan_expression([self.manifest.path(p) for p in partitions])
+        tables = [self._partition_table(p) for p in partitions]
+        if len(tables) == 1:
+            return tables[0]
+        return '(' + ' UNION ALL BY NAME '.join(f"SELECT * FROM {table}" for table in tables) + ')'
+
+    def _partition_table(self, partition: Dict) -> str:
+        """Return the on-disk table holding a CSV partition, parsing the file on first use"""
+        month = partition['month']
+        with self._lock:
+            table = self._partition_tables.get(month)
+            if table is None:
+                table = f"tickets_{self._generation}_{month.replace('-', '_')}"
+                self._con.execute(f"CREATE TABLE {table} AS SELECT * FROM "
+                                  f"{self._scan_expression([self.manifest.path(partition)])}")
+                self._partition_tables[month] = table
+            return table
+
+    @staticmethod
+    def _where(start_date, end_date, priority, department, status, extra: Optional[str] = None):
+        """Build a parameterized WHERE clause for a filter selection"""
+        clauses, params = [], []
+
+        if start_date and end_date:
+            clauses.append("created_date >= CAST(? AS TIMESTAMP) AND created_date <= CAST(? AS TIMESTAMP)")
+            params.extend([str(start_date), str(end_date)])
+
+        for column, value in zip(FILTER_COLUMNS, (priority, department, status)):
+            if value != 'all':
+                clauses.append(f"{column} = ?")
+                params.append(value)
+
+        if extra:
+            clauses.append(extra)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def _query(self, sql: str, params: Optional[List] = None) -> pd.DataFrame:
+        # A cursor is a separate connection to the same database, which keeps
+        # concurrent Dash callbacks from sharing one connection's state
+        cursor = self._con.cursor()
+        try:
+            return cursor.execute(sql, params or []).fetchdf()
+        finally:
+            cursor.close()
+
+    def select(self, start_date, end_date, priority='all', department='all', status='all'):
+        source = self._source(start_date, end_date)
+        if source is None:
+            return pd.DataFrame()
+
+        where, params = self._where(start_date, end_date, priority, department, status)
+        return add_derived_columns(self._query(f"SELECT * FROM {source} {where}", params))
+
+    def iter_select(self, start_date, end_date, priority='all', department='all', status='all',
+                    chunk_rows=EXPORT_CHUNK_ROWS):
+        source = self._source(start_date, end_date)
+        if source is None:
+            yield pd.DataFrame()
+            return
+
+        where, params = self._where(start_date, end_date, priority, department, status)
+        cursor = self._con.cursor()
+        try:
+            cursor.execute(f"SELECT * FROM {source} {where}", params)
+            # DuckDB hands results over in vectors of 2048 rows
+            vectors = max(1, chunk_rows // 2048)
+            first = True
+            while True:
+                chunk = cursor.fetch_df_chunk(vectors)
+                if chunk.empty and not first:
+                    break
+                # Hive-style partition paths surface created_month as a column
+                yield chunk[source_columns(chunk.columns)]
+                first = False
+                if chunk.empty:
+                    break
+        finally:
+            cursor.close()
+
+    def aggregate(self, start_date, end_date, priority='all', department='all', status='all'):
+        source = self._source(start_date, end_date)
+        if source is None:
+            return {'total': 0}
+
+        where, params = self._where(start_date, end_date, priority, department, status)
+
+        # Both cubes in one pass: the first grouping set counts tickets by created
+        # day, the second by resolved day (its NULL group holds the unresolved ones)
+        levels = ', '.join(CUBE_LEVELS)
+        cells = self._query(f"""
+            SELECT priority, department, status, dayname(created_date) AS created_weekday,
+                   {self._bucket_sql('created_date', 'day')} AS created_day_bucket,
+                   {self._bucket_sql('resolved_date', 'day')} AS resolved_day_bucket,
+                   GROUPING(created_day_bucket) AS resolved_set,
+                   count(*) AS count, sum(CAST(sla_met AS INTEGER)) AS sla_met
+            FROM {source} {where}
+            GROUP BY GROUPING SETS (({levels}, created_day_bucket), ({levels}, resolved_day_bucket))
+        """, params)
+        created = cells[cells['resolved_set'] == 0]
+        if created.empty:
+            return {'total': 0}
+        resolved = cells[(cells['resolved_set'] == 1) & cells['resolved_day_bucket'].notna()]
+
+        cube = created.astype({'created_day_bucket': 'int64'}).set_index(
+            CUBE_LEVELS + ['created_day_bucket'])[['count', 'sla_met']]
+        resolved_cube = resolved.astype({'resolved_day_bucket': 'int64'}).set_index(
+            CUBE_LEVELS + ['resolved_day_bucket'])[['count']]
+
+        resolution = self.resolution_summary(start_date, end_date, priority, department, status)
+        return summarize_cube(cube, resolved_cube, resolution)
+
+    def _sketch_rows(self, source: str) -> pd.DataFrame:
+        """Read the segment and sketched columns of a source"""
+        rows = self._query(f"""
+            SELECT created_date, priority, department, status, {', '.join(SKETCHED_COLUMNS)}
+            FROM {source}
+        """)
+        rows['created_day_bucket'] = time_buckets(rows['created_date'])['day']
+        return rows
+
+    def _day_rows(self, days, filters, weekday, columns):
+        spans = [day_dates(first_day, last_day) for first_day, last_day in days]
+        bounded = all(start is not None for start, _ in spans)
+        source = self._source(min(s for s, _ in spans), max(e for _, e in spans)) if bounded else self._source()
+        if source is None:
+            return pd.DataFrame(columns=columns)
+
+        clauses, params = [], []
+        if bounded:
+            clauses.append('(' + ' OR '.join(
+                "(created_date >= CAST(? AS TIMESTAMP) AND created_date < CAST(? AS TIMESTAMP))" for _ in spans) + ')')
+            params = [str(date) for span in spans for date in span]
+        if weekday is not None:
+            clauses.append(f"isodow(created_date) = {int(weekday) + 1}")
+        where, filter_params = self._where(None, None, *(filters[column] for column in FILTER_COLUMNS),
+                                           extra=' AND '.join(clauses) or None)
+        return self._query(f"SELECT {', '.join(columns)} FROM {source} {where}", filter_params + params)
+
+    @staticmethod
+    def _partition_source(manifest: PartitionManifest, partition: Dict) -> Tuple[str, str]:
+        path = manifest.path(partition)
+        return path, source_version(path)
+
+    def _partition_sketches(self, manifest: PartitionManifest, partition: Dict) -> Dict:
+        """Build a partition's sketch set, reading only the segment and sketched columns of its file"""
+        self._sketch_sources[partition['month']] = self._partition_source(manifest, partition)
+        return build_sketches(self._sketch_rows(self._scan_expression([manifest.path(partition)])))
+
+    def _loaded_sketch_sets(self):
+        return list(self._sketch_sets.values())
+
+    def memory_bytes(self):
+        # Tables loaded into the in-memory database, plus DuckDB's buffers and hash tables
+        try:
+            engine = self._query("SELECT sum(memory_usage_bytes) AS bytes FROM duckdb_memory()")['bytes'].iloc[0]
+        except duckdb.Error:  # duckdb_memory() needs DuckDB 0.10 or newer
+            engine = 0
+        return super().memory_bytes() + int(engine or 0)
+
+    def _sketches(self, start_date, end_date):
+        manifest, sketch_sets = self.manifest, self._sketch_sets
+        if manifest is None:
+            return [sketch_sets['']] if '' in sketch_sets else []
+
+        partitions = manifest.prune(start_date, end_date)
+        if any(p['month'] not in sketch_sets for p in partitions):
+            # Concurrent callbacks reaching the same months build them once
+            with self._sketch_lock:
+                manifest = self.manifest
+                partitions = manifest.prune(start_date, end_date) if manifest is not None else []
+                sketch_sets = dict(self._sketch_sets)
+                for partition in partitions:
+                    if partition['month'] not in sketch_sets:
+                        sketch_sets[partition['month']] = self._partition_sketches(manifest, partition)
+                self._sketch_sets = sketch_sets
+        return [sketch_sets[p['month']] for p in partitions]
+
+    @staticmethod
+    def _bucket_sql(column: str, granularity: str) -> str:
+        """SQL expression matching ``time_buckets`` for one date column"""
+        day = f"date_diff('day', DATE '1970-01-01', CAST({column} AS DATE))"
+        if granularity == 'week':
+            return f"(({day}) + 3) // 7"
+        if granularity == 'month':
+            return f"(year({column}) - 1970) * 12 + month({column}) - 1"
+        return day
+
+    def _trend(self, source: str, where: str, params: List, granularity: Optional[str] = None) -> Dict:
+        """Count created and resolved tickets per time bucket inside the engine"""
+        if granularity is None:
+            created_day = self._bucket_sql('created_date', 'day')
+            resolved_day = self._bucket_sql('resolved_date', 'day')
+            span = self._query(f"""
+                SELECT least(min({created_day}), coalesce(min({resolved_day}), min({created_day}))) AS first_day,
+                       greatest(max({created_day}), coalesce(max({resolved_day}), max({created_day}))) AS last_day
+                FROM {source} {where}
+            """, params).iloc[0]
+            if pd.isna(span['first_day']):
+                return {}
+            granularity = choose_granularity(int(span['first_day']), int(span['last_day']))
+
+        counts = self._query(f"""
+            SELECT {self._bucket_sql('created_date', granularity)} AS created,
+                   coalesce({self._bucket_sql('resolved_date', granularity)}, -1) AS resolved,
+                   count(*) AS tickets
+            FROM {source} {where}
+            GROUP BY ALL
+        """, params)
+        weights = counts['tickets'].to_numpy()
+
+        if counts.empty:
+            return {}
+        return build_trend(counts['created'].to_numpy(np.int64), counts['resolved'].to_numpy(np.int64),
+                           granularity, created_weights=weights, resolved_weights=weights)
+
+    def trend(self, start_date, end_date, priority='all', department='all', status='all', granularity=None):
+        source = self._source(start_date, end_date)
+        if source is None:
+            return {}
+
+        where, params = self._where(start_date, end_date, priority, department, status)
+        return self._trend(source, where, params, granularity)
+
+    def aggregate_store(self):
+        source = self._source()
+        created_day = self._bucket_sql('created_date', 'day')
+        resolved_day = self._bucket_sql('resolved_date', 'day')
+        if source is None:
+            return encode_aggregate_store(pd.DataFrame(columns=['day', *FILTER_COLUMNS]),
+                                          pd.DataFrame(columns=['day', 'resolved_day', *FILTER_COLUMNS]),
+                                          self.version)
+
+        created = self._query(f"""
+            SELECT {created_day} AS day, priority, department, status,
+                   count(*) AS count,
+                   CAST(sum(CAST(sla_met AS INTEGER)) AS BIGINT) AS sla_met,
+                   coalesce(sum(resolution_hours), 0) AS resolution_hours,
+                   count(resolution_hours) AS resolved
+            FROM {source}
+            GROUP BY ALL
+        """)
+        resolved = self._query(f"""
+            SELECT {created_day} AS day, {resolved_day} AS resolved_day, priority, department, status,
+                   count(*) AS count
+            FROM {source}
+            WHERE resolved_date IS NOT NULL
+            GROUP BY ALL
+        """)
+        return encode_aggregate_store(created, resolved, self.version)
+
+    def open_tickets(self):
+        source = self._source()
+        if source is None:
+            return pd.DataFrame()
+
+        placeholders = ', '.join('?' for _ in OPEN_STATUSES)
+        return add_derived_columns(self._query(
+            f"SELECT * FROM {source} WHERE status IN ({placeholders})", OPEN_STATUSES
+        ))
+
+    def filter_options(self):
+        if self.manifest is not None:
+            return {column: self.manifest.filter_values.get(column, []) for column in FILTER_COLUMNS}
+        return {
+            column: self._query(f"SELECT DISTINCT {column} FROM tickets WHERE {column} IS NOT NULL")[column].tolist()
+            for column in FILTER_COLUMNS
+        }
+
+    def date_bounds(self):
+        if self.manifest is not None:
+            return self.manifest.date_bounds()
+        bounds = self._query("SELECT min(created_date) AS first, max(created_date) AS last FROM tickets").iloc[0]
+        if pd.isna(bounds['first']):
+            return None, None
+        return pd.Timestamp(bounds['first']), pd.Timestamp(bounds['last'])
+
+
+def _close_database(con, directory: str):
+    """Close a DuckDB connection and delete its on-disk database"""
+    con.close()
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def create_backend(path: Optional[str] = None, engine: Optional[str] = None) -> TicketBackend:
+    """
+    Create the ticket backend selected by configuration
+
+    Args:
+        path: Ticket file (CSV or Parquet) or partitioned store directory;
+            defaults to ``DASHBOARD_DATA_PATH``
+        engine: 'duckdb', 'pandas' or 'auto'; defaults to ``DASHBOARD_BACKEND``
+
+    Returns:
+        DuckDB backend when requested and available, otherwise the pandas backend
+    """
+    path = path or os.environ.get('DASHBOARD_DATA_PATH', 'sample_tickets.csv')
+    engine = (engine or os.environ.get('DASHBOARD_BACKEND', 'auto')).lower()
+
+    if engine in ('auto', 'duckdb'):
+        try:
+            return DuckDBBackend(path)
+        except (ImportError, FileNotFoundError) as e:
+            if engine == 'duckdb':
+                print(f"DuckDB backend unavailable, falling back to pandas: {e}")
+
+    return PandasBackend.from_path(path)
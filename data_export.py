@@ -0,0 +1,113 @@
+"""
+Ticket Export
+Streams a filtered ticket selection as gzip-compressed CSV or as Parquet, one
+chunk at a time, so large exports start immediately and memory stays flat
+"""
+
+import zlib
+from typing import Iterable, Iterator
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; CSV export is always available
+    pa = None
+    pq = None
+
+EXPORT_FORMATS = {
+    'csv': {'mimetype': 'text/csv', 'extension': 'csv'},
+    'parquet': {'mimetype': 'application/vnd.apache.parquet', 'extension': 'parquet'}
+}
+
+
+def available_formats() -> list:
+    """Return the export formats supported by the installed packages"""
+    return [name for name in EXPORT_FORMATS if name != 'parquet' or pq is not None]
+
+
+def stream_csv(chunks: Iterable[pd.DataFrame], compress: bool = True) -> Iterator[bytes]:
+    """
+    Encode ticket chunks as one CSV document
+
+    Args:
+        chunks: Dataframes sharing one column layout; the header is taken from the first
+        compress: Gzip the stream (served with ``Content-Encoding: gzip``)
+
+    Yields:
+        Encoded bytes, one piece per chunk
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None  # wbits=31: gzip container
+    header = True
+    for chunk in chunks:
+        data = chunk.to_csv(index=False, header=header).encode('utf-8')
+        header = False
+        if compressor is not None:
+            data = compressor.compress(data)
+        if data:
+            yield data
+
+    if compressor is not None:
+        yield compressor.flush()
+
+
+class _StreamSink:
+    """Write-only file object whose buffered bytes are drained between row groups"""
+
+    def __init__(self):
+        self._buffer = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._buffer.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b''.join(self._buffer)
+        self._buffer = []
+        return data
+
+
+def _arrow_schema(chunk: pd.DataFrame) -> 'pa.Schema':
+    schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+    # A column that is entirely empty in the first chunk has no type yet; later
+    # chunks may fill it, so store it as text rather than the null type
+    for i, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            schema = schema.set(i, field.with_type(pa.string()))
+    return schema
+
+
+def stream_parquet(chunks: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+    """
+    Encode ticket chunks as one Parquet file, a row group per chunk
+
+    Args:
+        chunks: Dataframes sharing one column layout
+
+    Yields:
+        Encoded bytes, one piece per row group plus the footer
+    """
+    if pq is None:
+        raise ImportError("Parquet export requires pyarrow")
+
+    sink = _StreamSink()
+    writer = None
+    for chunk in chunks:
+        if writer is None:
+            schema = _arrow_schema(chunk)
+            writer = pq.ParquetWriter(sink, schema, compression='zstd')
+        writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        data = sink.drain()
+        if data:
+            yield data
+
+    if writer is not None:
+        writer.close()
+        yield sink.drain()
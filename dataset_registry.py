@@ -0,0 +1,223 @@
+"""
+Dataset Registry
+Serves several ticket sources from one dashboard process: datasets load on
+first use, and idle ones are evicted least recently used first to stay within
+a total memory budget
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from data_backend import TicketBackend, create_backend
+
+DEFAULT_DATASET = 'default'
+
+
+def parse_dataset_sources(spec: str) -> Dict[str, str]:
+    """
+    Parse a dataset list such as ``support=data/support.csv,hr=data/hr_store``
+
+    Returns:
+        Dataset name -> ticket file or partitioned store path, in listed order
+    """
+    sources = {}
+    for entry in spec.split(','):
+        if not entry.strip():
+            continue
+        name, separator, path = entry.partition('=')
+        if not separator or not name.strip() or not path.strip():
+            raise ValueError(f"Invalid dataset entry '{entry}', expected name=path")
+        sources[name.strip()] = path.strip()
+    return sources
+
+
+class DatasetRegistry:
+    def __init__(self, sources: Dict[str, str], memory_budget_bytes: int = 2 * 1024 ** 3,
+                 default: Optional[str] = None, loader: Callable[[str], TicketBackend] = create_backend):
+        """
+        Initialize the registry
+
+        Args:
+            sources: Dataset name -> ticket file or partitioned store path
+            memory_budget_bytes: Total memory the loaded datasets may hold; the
+                least recently used datasets are evicted when a load exceeds it
+            default: Dataset shown when none is selected; it is never evicted
+            loader: Creates a backend for a path
+        """
+        if not sources:
+            raise ValueError("At least one dataset is required")
+
+        self.sources = dict(sources)
+        self.memory_budget_bytes = memory_budget_bytes
+        self.default = default if default in self.sources else next(iter(self.sources))
+        self.loader = loader
+
+        # Loaded backends, least recently used first
+        self._backends: 'OrderedDict[str, TicketBackend]' = OrderedDict()
+        self._memory: Dict[str, int] = {}
+        self._stats = {
+            name: {'loads': 0, 'hits': 0, 'evictions': 0, 'load_seconds': 0.0, 'last_used': None}
+            for name in self.sources
+        }
+        self._lock = threading.Lock()
+        self._load_locks = {name: threading.Lock() for name in self.sources}
+        # Called with a dataset name when its loaded data is dropped or replaced
+        self._listeners: List[Callable[[str], None]] = []
+
+    @classmethod
+    def from_environment(cls) -> 'DatasetRegistry':
+        """
+        Build the registry from configuration
+
+        ``DASHBOARD_DATASETS`` lists ``name=path`` pairs; without it the single
+        ``DASHBOARD_DATA_PATH`` source is served as the 'default' dataset.
+        ``DASHBOARD_MEMORY_BUDGET_MB`` sets the budget (default 2048).
+        """
+        spec = os.environ.get('DASHBOARD_DATASETS', '')
+        sources = parse_dataset_sources(spec) if spec.strip() else {
+            DEFAULT_DATASET: os.environ.get('DASHBOARD_DATA_PATH', 'sample_tickets.csv')
+        }
+        budget_mb = float(os.environ.get('DASHBOARD_MEMORY_BUDGET_MB', 2048))
+        return cls(sources, int(budget_mb * 1024 * 1024), os.environ.get('DASHBOARD_DEFAULT_DATASET'))
+
+    def add_listener(self, callback: Callable[[str], None]):
+        """
+        Register a callback for datasets that were evicted or refreshed
+
+        Caches of per-dataset results use it to drop entries of data that is
+        no longer served.
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, names: List[str]):
+        for name in names:
+            for callback in self._listeners:
+                callback(name)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.sources)
+
+    def resolve(self, name: Optional[str]) -> str:
+        """Return ``name`` if it is a known dataset, otherwise the default"""
+        return name if name in self.sources else self.default
+
+    def get(self, name: Optional[str] = None) -> TicketBackend:
+        """
+        Return the backend of a dataset, loading it on first use
+
+        Args:
+            name: Dataset name; unknown names and None select the default dataset
+        """
+        name = self.resolve(name)
+        backend = self._lookup(name)
+        if backend is not None:
+            return backend
+
+        # Loads run outside the registry lock so other datasets stay available;
+        # concurrent first requests for the same dataset wait for a single load
+        with self._load_locks[name]:
+            backend = self._lookup(name)
+            if backend is not None:
+                return backend
+
+            start = time.perf_counter()
+            backend = self.loader(self.sources[name])
+            elapsed = time.perf_counter() - start
+            memory = backend.memory_bytes()
+            with self._lock:
+                stats = self._stats[name]
+                stats['loads'] += 1
+                stats['load_seconds'] += elapsed
+                self._backends[name] = backend
+                self._memory[name] = memory
+                evicted = self._evict(keep=name)
+            self._notify(evicted)
+            return backend
+
+    def _lookup(self, name: str) -> Optional[TicketBackend]:
+        """Return a loaded backend and mark it most recently used"""
+        with self._lock:
+            self._stats[name]['last_used'] = time.time()
+            backend = self._backends.get(name)
+            if backend is not None:
+                self._stats[name]['hits'] += 1
+                self._backends.move_to_end(name)
+            return backend
+
+    def loaded(self) -> Dict[str, TicketBackend]:
+        """Return the currently loaded backends by name"""
+        with self._lock:
+            return dict(self._backends)
+
+    def versions(self) -> Dict[str, str]:
+        """Return the data version of every loaded dataset"""
+        with self._lock:
+            return {name: self._backends[name].version for name in sorted(self._backends)}
+
+    def measure(self, name: str):
+        """Re-measure a loaded dataset's memory, e.g. after it was refreshed or indexed"""
+        with self._lock:
+            backend = self._backends.get(name)
+        if backend is None:
+            return
+        memory = backend.memory_bytes()
+        evicted = []
+        with self._lock:
+            if name in self._backends:
+                self._memory[name] = memory
+                evicted = self._evict(keep=name)
+        self._notify(evicted)
+
+    def refresh(self, name: str) -> bool:
+        """
+        Reload a loaded dataset whose source changed
+
+        Returns:
+            True if the dataset's data changed
+        """
+        with self._lock:
+            backend = self._backends.get(name)
+        if backend is None or not backend.refresh():
+            return False
+        self._notify([name])
+        self.measure(name)
+        return True
+
+    def _evict(self, keep: str) -> List[str]:
+        """Drop least recently used datasets until the loaded ones fit the budget, returning their names"""
+        evicted = []
+        for name in list(self._backends):
+            if sum(self._memory.values()) <= self.memory_budget_bytes:
+                break
+            if name in (keep, self.default):
+                continue
+            # Callbacks still holding the backend finish normally; it is freed afterwards
+            del self._backends[name]
+            del self._memory[name]
+            self._stats[name]['evictions'] += 1
+            evicted.append(name)
+        return evicted
+
+    def stats(self) -> Dict:
+        """Return per-dataset load, hit, eviction and memory statistics"""
+        with self._lock:
+            datasets = {
+                name: {
+                    'path': path,
+                    'loaded': name in self._backends,
+                    'memory_bytes': self._memory.get(name, 0),
+                    'version': self._backends[name].version if name in self._backends else None,
+                    **self._stats[name]
+                }
+                for name, path in self.sources.items()
+            }
+            return {
+                'default': self.default,
+                'memory_budget_bytes': self.memory_budget_bytes,
+                'memory_bytes': sum(self._memory.values()),
+                'datasets': datasets
+            }
@@ -0,0 +1,265 @@
+"""
+Figure Cache
+Caches rendered chart figures keyed by chart, filter selection and data version,
+with an in-process LRU tier and an optional on-disk tier shared across workers.
+Each entry keeps the figure's serialized JSON and structure digest, so a hit
+is answered without serializing the figure again
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from response_encoding import dumps, figure_to_dict, loads
+
+
+# Trace attributes that a filter change may alter without changing the chart's structure
+PATCHABLE_TRACE_KEYS = ('x', 'y', 'values', 'text', 'pull')
+
+
+class CachedFigure(NamedTuple):
+    figure: Dict  # JSON-ready dictionary; numeric arrays stay NumPy arrays
+    body: bytes  # The figure serialized as JSON
+    structure: str  # Digest of everything but the patchable data arrays
+    trace_arrays: List[Dict]  # Per trace, the data arrays a dash.Patch may replace
+
+
+def split_figure(figure: Dict) -> Tuple[str, List[Dict]]:
+    """Split a figure dict into its structure digest and the data arrays a Patch may replace"""
+    structure_traces, trace_arrays = [], []
+    for trace in figure.get('data', []):
+        structure, arrays = {}, {}
+        for key, value in trace.items():
+            if key in PATCHABLE_TRACE_KEYS:
+                arrays[key] = value
+            elif key == 'marker' and isinstance(value.get('color'), (list, np.ndarray)):
+                structure[key] = {k: v for k, v in value.items() if k != 'color'}
+                arrays['marker.color'] = value['color']
+            else:
+                structure[key] = value
+        structure_traces.append(structure)
+        trace_arrays.append(arrays)
+
+    layout = {k: v for k, v in figure.get('layout', {}).items() if k != 'uirevision'}
+    digest = hashlib.sha1(dumps([structure_traces, layout], sort_keys=True)).hexdigest()
+    return digest, trace_arrays
+
+
+def prepare_figure(fig: go.Figure, body: Optional[bytes] = None) -> CachedFigure:
+    """
+    Serialize a figure and digest its structure once, for every later response
+
+    Args:
+        fig: Figure, or the dictionary parsed from ``body``
+        body: The figure's JSON when it was already serialized
+    """
+    figure = figure_to_dict(fig) if isinstance(fig, go.Figure) else fig
+    structure, trace_arrays = split_figure(figure)
+    return CachedFigure(figure, body if body is not None else dumps(figure), structure, trace_arrays)
+
+
+def normalize_filters(filters: Tuple) -> Tuple:
+    """Normalize filter values so equivalent selections share a cache entry"""
+    normalized = []
+    for value in filters:
+        if isinstance(value, str) and value[:1].isdigit():
+            # Dates arrive as 'YYYY-MM-DD' or full ISO timestamps depending on the picker
+            try:
+                value = pd.Timestamp(value).isoformat()
+            except ValueError:
+                pass
+        normalized.append(value)
+    return tuple(normalized)
+
+
+class FigureCache:
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, disk_dir: Optional[str] = None,
+                 disk_max_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize the figure cache
+
+        Args:
+            max_bytes: Size budget of the in-process tier (serialized figure bytes)
+            disk_dir: Directory for the shared on-disk tier, or None to disable it
+            disk_max_bytes: Size budget of the on-disk tier
+        """
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+        self._entries: 'OrderedDict[str, CachedFigure]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(chart_id: str, filters: Tuple, data_version: str) -> str:
+        """
+        Build a cache key
+
+        Args:
+            chart_id: Id of the chart the figure is rendered for
+            filters: Filter values the figure was built from
+            data_version: Version of the underlying data
+
+        Returns:
+            Stable hex digest usable as a file name
+        """
+        raw = json.dumps([chart_id, normalize_filters(filters), data_version], default=str)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f'{key}.json')
+
+    def get(self, key: str) -> Optional[CachedFigure]:
+        """Return a cached figure, checking memory first and then the disk tier"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        if self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                with open(path, 'rb') as f:
+                    figure_json = f.read()
+                os.utime(path)  # Refresh recency for disk eviction
+            except OSError:
+                figure_json = None
+
+            if figure_json is not None:
+                entry = prepare_figure(loads(figure_json), figure_json)
+                self._store(key, entry)
+                with self._lock:
+                    self.disk_hits += 1
+                return entry
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, fig: go.Figure) -> CachedFigure:
+        """
+        Cache a figure
+
+        Args:
+            key: Cache key from ``make_key``
+            fig: Figure to cache
+
+        Returns:
+            The figure with its serialized JSON and structure digest
+        """
+        entry = prepare_figure(fig)
+        self._store(key, entry)
+
+        if self.disk_dir:
+            self._write_disk(key, entry.body)
+
+        return entry
+
+    def get_or_create(self, key: str, build: Callable[[], go.Figure]) -> CachedFigure:
+        """Return the cached figure for ``key``, building and caching it on a miss"""
+        entry = self.get(key)
+        if entry is None:
+            entry = self.set(key, build())
+        return entry
+
+    def _store(self, key: str, entry: CachedFigure):
+        size = len(entry.body)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous.body)
+
+            self._entries[key] = entry
+            self._bytes += size
+
+            # Evict least recently used entries until the tier fits its budget
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.body)
+                self.evictions += 1
+
+    def _write_disk(self, key: str, figure_json: bytes):
+        path = self._disk_path(key)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(figure_json)
+            # Atomic rename so other workers never read a partial file
+            os.replace(tmp_path, path)
+            self._evict_disk()
+        except OSError as e:
+            print(f"Figure cache disk write error: {e}")
+
+    def _evict_disk(self):
+        entries = []
+        for name in os.listdir(self.disk_dir):
+            if name.endswith('.json'):
+                try:
+                    stat = os.stat(os.path.join(self.disk_dir, name))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.disk_dir, name))
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        """Drop every in-process entry (the disk tier is left to age out)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                'disk_tier': bool(self.disk_dir)
+            }
+
+
+def create_figure_cache() -> FigureCache:
+    """
+    Create the figure cache from configuration
+
+    ``DASHBOARD_FIGURE_CACHE_MB`` sets the in-process budget and
+    ``DASHBOARD_FIGURE_CACHE_DIR`` enables the shared on-disk tier.
+    """
+    max_mb = float(os.environ.get('DASHBOARD_FIGURE_CACHE_MB', '64'))
+    disk_dir = os.environ.get('DASHBOARD_FIGURE_CACHE_DIR') or None
+    disk_max_mb = float(os.environ.get('DASHBOARD_FIGURE_CACHE_DISK_MB', '512'))
+    return FigureCache(int(max_mb * 1024 * 1024), disk_dir, int(disk_max_mb * 1024 * 1024))
@@ -0,0 +1,180 @@
+"""
+Live Updates
+Pushes data-version and alert-state changes to open dashboards over
+server-sent events, so browsers only re-fetch figures when something changed
+"""
+
+import json
+import threading
+from typing import Dict, Iterator, Optional
+
+from n8n_integration import N8nIntegration, get_n8n_integration_status
+from sla_timers import SlaTimerService
+
+
+class EventBroadcaster:
+    def __init__(self, heartbeat_seconds: float = 25):
+        """
+        Initialize the broadcaster
+
+        Args:
+            heartbeat_seconds: Idle interval after which a keep-alive comment is
+                sent, so proxies do not close quiet connections
+        """
+        self.heartbeat_seconds = heartbeat_seconds
+        self._condition = threading.Condition()
+        self._events: Dict[str, tuple] = {}  # event name -> (sequence, payload)
+        self._sequence = 0
+
+    def publish(self, event: str, data) -> bool:
+        """
+        Publish the latest value of an event to every subscriber
+
+        Args:
+            event: Event name, e.g. 'data-version'
+            data: JSON-serializable payload
+
+        Returns:
+            True if the value changed and was broadcast
+        """
+        with self._condition:
+            current = self._events.get(event)
+            if current is not None and current[1] == data:
+                return False
+            self._sequence += 1
+            self._events[event] = (self._sequence, data)
+            self._condition.notify_all()
+            return True
+
+    def latest(self, event: str):
+        with self._condition:
+            current = self._events.get(event)
+            return current[1] if current else None
+
+    def stream(self) -> Iterator[str]:
+        """Yield server-sent event messages: the current state first, then each change"""
+        last_seen = 0
+        while True:
+            with self._condition:
+                if self._sequence == last_seen:
+                    self._condition.wait(timeout=self.heartbeat_seconds)
+
+                changed = sorted(
+                    (sequence, name, data) for name, (sequence, data) in self._events.items()
+                    if sequence > last_seen
+                )
+                last_seen = self._sequence
+
+            if not changed:
+                yield ': keep-alive\n\n'
+            for _, name, data in changed:
+                yield f'event: {name}\ndata: {json.dumps(data, default=str)}\n\n'
+
+
+class DataWatcher(threading.Thread):
+    def __init__(self, registry, broadcaster: EventBroadcaster, n8n: Optional[N8nIntegration] = None,
+                 sla_timers: Optional[SlaTimerService] = None, interval_seconds: float = 5,
+                 alert_interval_seconds: float = 30):
+        """
+        Background thread that detects data and alert-state changes
+
+        One watcher runs per server process regardless of how many browsers are
+        connected; clients only hear from it when something actually changed.
+
+        Args:
+            registry: Dataset registry whose loaded datasets are watched for new versions
+            broadcaster: Where changes are published
+            n8n: Integration whose availability is monitored
+            sla_timers: Timer service kept in sync with each dataset's open tickets
+            interval_seconds: How often the data sources are checked
+            alert_interval_seconds: How often the n8n status is checked
+        """
+        super().__init__(name='dashboard-data-watcher', daemon=True)
+        self.registry = registry
+        self.broadcaster = broadcaster
+        self.n8n = n8n
+        self.sla_timers = sla_timers
+        self.interval_seconds = interval_seconds
+        self.alert_interval_seconds = alert_interval_seconds
+        self._stop_event = threading.Event()
+        # Data version each dataset's SLA timers were last synced with
+        self._timer_versions: Dict[str, str] = {}
+
+        broadcaster.publish('data-version', registry.versions())
+
+    def stop(self):
+        self._stop_event.set()
+        if self.sla_timers is not None:
+            self.sla_timers.stop()
+
+    def check_data(self) -> bool:
+        """Reload datasets whose source changed and broadcast the loaded datasets' versions"""
+        for name in self.registry.loaded():
+            try:
+                self.registry.refresh(name)
+            except Exception as e:
+                print(f"Data refresh error ({name}): {e}")
+        # Also changes when a dataset was loaded or evicted since the last check
+        return self.broadcaster.publish('data-version', self.registry.versions())
+
+    def build_search_indexes(self):
+        """Build missing or outdated search indexes here rather than on a search request"""
+        for name, backend in self.registry.loaded().items():
+            if backend.search_indexed:
+                continue
+            try:
+                backend.search_index(wait=True)
+                self.registry.measure(name)
+            except Exception as e:
+                print(f"Search index error ({name}): {e}")
+
+    def sync_sla_timers(self):
+        """Hand the open tickets of new or changed datasets to the SLA timer service"""
+        # Timers run in one server process; the others retry in case it exits
+        if self.sla_timers is None or not self.sla_timers.claim():
+            return
+        for name, backend in self.registry.loaded().items():
+            if self._timer_versions.get(name) == backend.version or backend.empty:
+                continue
+            try:
+                # Only open tickets can breach or escalate, so fetch just those
+                self.sla_timers.sync(name, backend.open_tickets())
+                self._timer_versions[name] = backend.version
+            except Exception as e:
+                print(f"SLA timer sync error ({name}): {e}")
+
+    def check_alerts(self) -> Dict:
+        """Check the n8n status and broadcast it if it changed"""
+        try:
+            status = get_n8n_integration_status()
+
+            # SLA alerts fire from their timers at breach time; they are held
+            # while n8n is unreachable and sent once it is back
+            if self.sla_timers is not None:
+                self.sla_timers.paused = not (status.get('available', False) and self.n8n)
+        except Exception as e:
+            print(f"n8n status error: {e}")
+            status = {
+                'available': False,
+                'error': str(e),
+                'workflows': []
+            }
+
+        self.broadcaster.publish('alert-state', status)
+        return status
+
+    def run(self):
+        if self.sla_timers is not None and not self.sla_timers.is_alive():
+            self.sla_timers.start()
+        self.sync_sla_timers()
+        self.check_alerts()
+        self.build_search_indexes()
+        elapsed = 0
+        while not self._stop_event.wait(self.interval_seconds):
+            data_changed = self.check_data()
+            self.sync_sla_timers()
+            self.build_search_indexes()
+            elapsed += self.interval_seconds
+            if data_changed or elapsed >= self.alert_interval_seconds:
+                self.check_alerts()
+                elapsed = 0
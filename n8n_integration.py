@@ -8,6 +8,7 @@ import json
 from datetime import datetime, timedelta
 import pandas as pd
 from typing import Dict, List, Optional
+from data_backend import RESOLUTION_PERCENTILES
 
 class N8nIntegration:
     def __init__(self, n8n_url: str = "http://localhost:5678", api_key: Optional[str] = None):
@@ -121,6 +122,8 @@ class N8nIntegration:
             (pd.to_datetime(df['created_date']) <= end_date)
         ]
         
+        resolution_hours = weekly_df['resolution_hours'].dropna() if 'resolution_hours' in weekly_df.columns else pd.Series(dtype=float)
+        
         report_data = {
             'period': {
                 'start': start_date.strftime('%Y-%m-%d'),
@@ -130,7 +133,10 @@ class N8nIntegration:
                 'total_tickets': len(weekly_df),
                 'resolved_tickets': len(weekly_df[weekly_df['status'] == 'Resolved']),
                 'sla_compliance': round((weekly_df['sla_met'].sum() / len(weekly_df) * 100) if len(weekly_df) > 0 else 0, 1),
-                'avg_resolution_time': round(weekly_df['resolution_hours'].mean() if 'resolution_hours' in weekly_df.columns else 0, 1)
+                'avg_resolution_time': round(resolution_hours.mean(), 1) if len(resolution_hours) else 0,
+                # Tail latency says more about SLA risk than the mean; same percentiles as the dashboard card
+                **{f'p{p}_resolution_time': round(resolution_hours.quantile(p / 100), 1) if len(resolution_hours) else 0
+                   for p in RESOLUTION_PERCENTILES}
             },
             'by_priority': weekly_df['priority'].value_counts().to_dict(),
             'by_department': weekly_df['department'].value_counts().to_dict(),
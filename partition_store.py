@@ -0,0 +1,146 @@
+"""
+Partitioned Ticket Store
+Lays the ticket history out in monthly partitions (matching the ``created_month``
+derived column) with a manifest of date bounds and row counts, so loaders can
+skip every partition outside the selected date range
+"""
+
+import json
+import os
+import sys
+from typing import Dict, List, Optional
+import pandas as pd
+
+MANIFEST_FILE = 'manifest.json'
+# Stored as timestamps, so Parquet partitions keep date types for the query engines
+DATE_COLUMNS = ['created_date', 'resolved_date']
+
+
+def write_partitions(df: pd.DataFrame, root: str, file_format: str = 'csv') -> Dict:
+    """
+    Write tickets as one file per ``created_month`` plus a manifest
+
+    Args:
+        df: Ticket dataframe (raw or with derived columns)
+        root: Directory to write the partitions into
+        file_format: 'csv' or 'parquet'
+
+    Returns:
+        The manifest that was written
+    """
+    created = pd.to_datetime(df['created_date'])
+    months = created.dt.strftime('%Y-%m')
+    # Derived columns are recomputed on load, so only the source columns are stored
+    source_columns = [c for c in df.columns if not c.endswith('_bucket') and c not in
+                      ('created_week', 'created_weekday', 'created_month', 'days_to_resolve')]
+
+    partitions = []
+    # Positional indices, so frames with duplicate index labels are split correctly
+    for month, positions in months.groupby(months).indices.items():
+        part = df.iloc[positions][source_columns]
+        for column in DATE_COLUMNS:
+            if column in part.columns:
+                part[column] = pd.to_datetime(part[column])
+        part_created = created.iloc[positions]
+
+        relative_path = os.path.join(f'created_month={month}', f'tickets.{file_format}')
+        path = os.path.join(root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if file_format == 'parquet':
+            part.to_parquet(path, index=False)
+        else:
+            part.to_csv(path, index=False)
+
+        partitions.append({
+            'month': month,
+            'path': relative_path,
+            'min_created': part_created.min().isoformat(),
+            'max_created': part_created.max().isoformat(),
+            'rows': int(len(part))
+        })
+
+    manifest = {
+        'format': file_format,
+        'partitions': sorted(partitions, key=lambda p: p['month']),
+        # Distinct filter values let the layout be built without opening any partition
+        'filter_values': {
+            column: sorted(df[column].dropna().unique().tolist())
+            for column in ('priority', 'department', 'status')
+        }
+    }
+    with open(os.path.join(root, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
+
+
+class PartitionManifest:
+    """Read-side view of a partitioned ticket store"""
+
+    def __init__(self, root: str):
+        """
+        Load the manifest of a partitioned store
+
+        Args:
+            root: Directory containing ``manifest.json``
+        """
+        self.root = root
+        with open(os.path.join(root, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+
+        self.file_format = manifest.get('format', 'csv')
+        self.filter_values = manifest.get('filter_values', {})
+        self.partitions = manifest['partitions']
+        for partition in self.partitions:
+            partition['min_created'] = pd.Timestamp(partition['min_created'])
+            partition['max_created'] = pd.Timestamp(partition['max_created'])
+
+    @staticmethod
+    def exists(root: str) -> bool:
+        return os.path.isfile(os.path.join(root, MANIFEST_FILE))
+
+    @property
+    def total_rows(self) -> int:
+        return sum(p['rows'] for p in self.partitions)
+
+    def path(self, partition: Dict) -> str:
+        return os.path.join(self.root, partition['path'])
+
+    def prune(self, start_date=None, end_date=None) -> List[Dict]:
+        """
+        Return the partitions whose date bounds overlap a date range
+
+        Args:
+            start_date: Range start, or None for unbounded
+            end_date: Range end, or None for unbounded
+
+        Returns:
+            Overlapping partitions, oldest first
+        """
+        if not (start_date and end_date):
+            return list(self.partitions)
+
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        return [p for p in self.partitions if p['max_created'] >= start and p['min_created'] <= end]
+
+    def date_bounds(self):
+        if not self.partitions:
+            return None, None
+        return self.partitions[0]['min_created'], self.partitions[-1]['max_created']
+
+
+def find_manifest(path: str) -> Optional[PartitionManifest]:
+    """Return the manifest if ``path`` is a partitioned store directory"""
+    if os.path.isdir(path) and PartitionManifest.exists(path):
+        return PartitionManifest(path)
+    return None
+
+
+if __name__ == '__main__':
+    # Usage: python partition_store.py [source.csv] [target_dir] [csv|parquet]
+    source = sys.argv[1] if len(sys.argv) > 1 else 'sample_tickets.csv'
+    target = sys.argv[2] if len(sys.argv) > 2 else 'data/tickets'
+    file_format = sys.argv[3] if len(sys.argv) > 3 else 'csv'
+
+    manifest = write_partitions(pd.read_csv(source, parse_dates=DATE_COLUMNS), target, file_format)
+    print(f"Wrote {len(manifest['partitions'])} monthly partitions to {target}")
@@ -0,0 +1,218 @@
+"""
+Response Encoding
+Serializes figures with orjson, keeping NumPy arrays as arrays until the
+response is written, splices JSON serialized ahead of time into callback
+responses, and compresses large callback and layout responses with brotli
+or gzip
+"""
+
+import gzip
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, Optional
+import numpy as np
+import plotly.graph_objects as go
+from _plotly_utils.utils import PlotlyJSONEncoder
+from flask import Flask, Response, g, has_request_context, request
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard json module is used without it
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Prefix of the callback outputs that stand in for JSON serialized ahead of time
+RAW_JSON_PREFIX = '__dashboard_raw_json__:'
+# Array dtypes orjson writes directly (bool, integers, floats, datetimes); others become lists
+NATIVE_ARRAY_KINDS = 'biufM'
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/html', 'text/plain')
+
+
+def _plain(value):
+    """Convert a figure value to JSON-ready types, leaving orjson-native arrays as they are"""
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if isinstance(value, np.ndarray):
+        if orjson is not None and value.dtype.kind in NATIVE_ARRAY_KINDS:
+            return np.ascontiguousarray(value)
+        if value.dtype.kind == 'M':
+            # tolist() turns nanosecond datetimes into integers; datetime objects stay dates
+            return value.astype('datetime64[us]').astype(object).tolist()
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def figure_to_dict(fig: go.Figure) -> Dict:
+    """
+    Convert a figure to the dictionary returned from callbacks
+
+    Unlike a ``to_json``/``json.loads`` round trip, numeric and date arrays
+    stay NumPy arrays; orjson writes them straight from their buffers when
+    Dash serializes the response.
+    """
+    return _plain(fig.to_plotly_json())
+
+
+def dumps(value, sort_keys: bool = False) -> bytes:
+    """Serialize to compact JSON bytes, with NumPy arrays written directly when orjson is installed"""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(value, option=option)
+        except TypeError:
+            pass  # Values orjson does not know (e.g. pandas objects) take the Plotly encoder
+    return json.dumps(value, cls=PlotlyJSONEncoder, separators=(',', ':'), sort_keys=sort_keys).encode('utf-8')
+
+
+def loads(data):
+    """Parse JSON text or bytes"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def raw_json(body: bytes, value):
+    """
+    Return JSON that was serialized ahead of time (e.g. a cached figure) from a callback
+
+    Inside a request the output is a placeholder string that ``splice_raw_json``
+    replaces with ``body`` when the response is written, so the value is not
+    serialized again. Outside a request (a callback called directly) ``value``
+    is returned as it is.
+
+    Args:
+        body: The serialized JSON
+        value: The value ``body`` encodes
+    """
+    if not has_request_context():
+        return value
+    token = f'{RAW_JSON_PREFIX}{uuid.uuid4().hex}'
+    # Chart builds of one request may run in parallel threads; setdefault is atomic
+    g.setdefault('raw_json', {})[token] = body
+    return token
+
+
+def splice_raw_json(response: Response) -> Response:
+    """Swap the placeholders written by ``raw_json`` for their JSON"""
+    bodies = g.pop('raw_json', None)
+    if not bodies or response.status_code != 200 or response.direct_passthrough:
+        return response
+    data = response.get_data()
+    for token, body in bodies.items():
+        data = data.replace(b'"' + token.encode('ascii') + b'"', body)
+    response.set_data(data)
+    return response
+
+
+class ResponseCompressor:
+    def __init__(self, paths: Iterable[str], min_bytes: int = 1024, gzip_level: int = 6,
+                 brotli_quality: int = 5):
+        """
+        Initialize the compressor
+
+        Args:
+            paths: URL paths whose responses are compressed, e.g. the Dash callback endpoint
+            min_bytes: Responses smaller than this are sent as they are, since
+                compressing them saves less than it costs
+            gzip_level: zlib compression level for gzip
+            brotli_quality: Brotli quality (0-11); used when brotli is installed
+                and the client accepts it
+        """
+        self.paths = tuple(paths)
+        self.min_bytes = min_bytes
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+        self._lock = threading.Lock()
+        self.skipped = 0
+        self.encodings = {name: {'responses': 0, 'bytes_in': 0, 'bytes_out': 0, 'seconds': 0.0}
+                          for name in ('br', 'gzip')}
+
+    def init_app(self, server: Flask):
+        """Compress the configured responses of a Flask server, after splicing in pre-serialized JSON"""
+        server.after_request(self.compress)
+        # After-request hooks run in reverse order of registration
+        server.after_request(splice_raw_json)
+
+    def _encoding(self) -> Optional[str]:
+        """Pick the best encoding the client accepts, or None"""
+        if brotli is not None and request.accept_encodings['br'] > 0:
+            return 'br'
+        if request.accept_encodings['gzip'] > 0:
+            return 'gzip'
+        return None
+
+    def compress(self, response: Response) -> Response:
+        """Compress a response in place when its path, type, size and the client allow it"""
+        if request.path not in self.paths or response.status_code != 200:
+            return response
+        # Streams (the event stream, exports) and already encoded bodies pass through untouched
+        if response.is_streamed or response.direct_passthrough or 'Content-Encoding' in response.headers:
+            return response
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = self._encoding()
+        data = response.get_data()
+        if encoding is None or len(data) < self.min_bytes:
+            with self._lock:
+                self.skipped += 1
+            return response
+
+        start = time.perf_counter()
+        if encoding == 'br':
+            compressed = brotli.compress(data, quality=self.brotli_quality)
+        else:
+            compressed = gzip.compress(data, compresslevel=self.gzip_level)
+        elapsed = time.perf_counter() - start
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        with self._lock:
+            stats = self.encodings[encoding]
+            stats['responses'] += 1
+            stats['bytes_in'] += len(data)
+            stats['bytes_out'] += len(compressed)
+            stats['seconds'] += elapsed
+        return response
+
+    def stats(self) -> Dict:
+        """Return per-encoding response counts, bytes saved and compression time"""
+        with self._lock:
+            encodings = {
+                name: {
+                    **stats,
+                    'seconds': round(stats['seconds'], 4),
+                    'bytes_saved': stats['bytes_in'] - stats['bytes_out'],
+                    'ratio': round(stats['bytes_out'] / stats['bytes_in'], 3) if stats['bytes_in'] else None
+                }
+                for name, stats in self.encodings.items()
+            }
+            return {
+                'min_bytes': self.min_bytes,
+                'skipped': self.skipped,
+                'bytes_saved': sum(stats['bytes_saved'] for stats in encodings.values()),
+                'encodings': encodings,
+                'orjson': orjson is not None
+            }
+
+
+def create_response_compressor(paths: Iterable[str]) -> ResponseCompressor:
+    """
+    Create the response compressor from configuration
+
+    ``DASHBOARD_COMPRESS_MIN_BYTES`` sets the size threshold (default 1024).
+    """
+    return ResponseCompressor(paths, int(os.environ.get('DASHBOARD_COMPRESS_MIN_BYTES', '1024')))
@@ -0,0 +1,273 @@
+"""
+Ticket Search
+In-memory inverted index over ticket titles and descriptions: each term maps
+to a compressed posting list of row ids, and queries intersect those lists
+with the row set selected by the dashboard filters
+"""
+
+import bisect
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+SEARCH_COLUMNS = ['title', 'description']
+FACET_COLUMNS = ['priority', 'department', 'status']
+# The last query term is matched as a prefix once it is this long; a prefix
+# matching more terms than MAX_PREFIX_TERMS is too unspecific to be worth a full
+# union, so only the first MAX_PREFIX_TERMS are searched and the match is flagged
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_TERMS = 256
+EPOCH_DAY = np.datetime64('1970-01-01', 'D')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric terms"""
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+def _encoded_sizes(values: np.ndarray) -> np.ndarray:
+    """Number of variable-byte bytes needed for each value"""
+    sizes = np.ones(len(values), dtype=np.int64)
+    for bits in range(7, 64, 7):
+        sizes += values >= (np.uint64(1) << np.uint64(bits))
+    return sizes
+
+
+def encode_postings(gaps: np.ndarray) -> np.ndarray:
+    """
+    Variable-byte encode positive integers, seven bits per byte
+
+    The high bit marks every byte but the last of a value, so small gaps
+    (the common case in a dense posting list) take a single byte.
+    """
+    gaps = gaps.astype(np.uint64)
+    sizes = _encoded_sizes(gaps)
+
+    # Byte i of a value holds bits 7*i .. 7*i+6, least significant first
+    owner = np.repeat(np.arange(len(gaps)), sizes)
+    position = (np.arange(len(owner)) - np.repeat(np.cumsum(sizes) - sizes, sizes)).astype(np.uint64)
+    data = (gaps[owner] >> (np.uint64(7) * position)) & np.uint64(0x7F)
+    more = position < (sizes[owner] - 1).astype(np.uint64)
+    return (data | (more.astype(np.uint64) << np.uint64(7))).astype(np.uint8)
+
+
+def decode_postings(data: np.ndarray) -> np.ndarray:
+    """Decode variable-byte gaps (see ``encode_postings``)"""
+    if not len(data):
+        return np.zeros(0, dtype=np.int64)
+    last = (data & 0x80) == 0
+    ends = np.flatnonzero(last)
+    starts = np.r_[0, ends[:-1] + 1]
+    position = np.arange(len(data)) - np.repeat(starts, ends - starts + 1)
+    values = (data & 0x7F).astype(np.int64) << (7 * position)
+    return np.add.reduceat(values, starts)
+
+
+class SearchIndex:
+    """
+    Inverted index with delta-encoded, variable-byte compressed posting lists
+
+    Row ids are assigned in the order tickets are added, so appending new
+    tickets only extends the posting lists of the terms they contain. Each
+    row also keeps its created day and categorical filter codes, which lets a
+    query intersect its matches with a filter selection without touching the
+    ticket data.
+    """
+
+    def __init__(self):
+        # Guards the posting lists against searches running while new tickets are added
+        self._lock = threading.Lock()
+        self._postings: Dict[str, bytearray] = {}
+        self._last_row: Dict[str, int] = {}
+        self._vocabulary: Optional[List[str]] = None
+        self._categories: Dict[str, Dict[str, int]] = {column: {} for column in FACET_COLUMNS}
+        self._codes: Dict[str, np.ndarray] = {column: np.zeros(0, dtype=np.int32) for column in FACET_COLUMNS}
+        self.days = np.zeros(0, dtype=np.int32)
+        self.ticket_ids = np.zeros(0, dtype=object)
+        self.titles = np.zeros(0, dtype=object)
+
+    @classmethod
+    def from_frames(cls, frames: Iterable[pd.DataFrame]) -> 'SearchIndex':
+        """
+        Build an index from chunks of tickets
+
+        Args:
+            frames: Ticket chunks with the source columns, e.g. from ``iter_select``
+        """
+        index = cls()
+        for frame in frames:
+            index.add(frame)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.ticket_ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the posting lists and per-row columns"""
+        arrays = [self.days, self.ticket_ids, self.titles, *self._codes.values()]
+        return sum(len(data) for data in self._postings.values()) + sum(array.nbytes for array in arrays)
+
+    def add(self, df: pd.DataFrame):
+        """
+        Index new tickets, assigning them the next row ids
+
+        Args:
+            df: Tickets with ticket_id, title, description, created_date and the facet columns
+        """
+        if df.empty:
+            return
+
+        with self._lock:
+            first_row = len(self)
+
+            # Per-row columns go first, so concurrent readers never see row ids they cannot resolve
+            created = pd.to_datetime(df['created_date']).to_numpy().astype('datetime64[D]')
+            self.days = np.concatenate([self.days, (created - EPOCH_DAY).astype(np.int32)])
+            for column in FACET_COLUMNS:
+                categories = self._categories[column]
+                values = df[column].fillna('').astype(str)
+                for value in values.unique():
+                    categories.setdefault(value, len(categories))
+                self._codes[column] = np.concatenate([self._codes[column],
+                                                      values.map(categories).to_numpy(dtype=np.int32)])
+            self.ticket_ids = np.concatenate([self.ticket_ids, df['ticket_id'].astype(object).to_numpy()])
+            self.titles = np.concatenate([self.titles, df['title'].fillna('').astype(object).to_numpy()])
+
+            text = df[SEARCH_COLUMNS[0]].fillna('').astype(str)
+            for column in SEARCH_COLUMNS[1:]:
+                text = text + ' ' + df[column].fillna('').astype(str)
+            terms = text.reset_index(drop=True).str.lower().str.findall(TOKEN_PATTERN.pattern).explode().dropna()
+            if not len(terms):
+                return
+
+            # Distinct (term, row) pairs, sorted by term and then row
+            term_codes, vocabulary = pd.factorize(terms.to_numpy())
+            stride = first_row + len(df)
+            keys = np.unique(term_codes.astype(np.int64) * stride + first_row + terms.index.to_numpy())
+            term_codes, rows = keys // stride, keys % stride
+            starts = np.r_[0, np.flatnonzero(np.diff(term_codes)) + 1]
+            ends = np.r_[starts[1:], len(rows)] - 1
+            added = vocabulary[term_codes[starts]]
+
+            # Gaps to the previous row of the same term; a term's first gap continues its existing list
+            previous = np.r_[-1, rows[:-1]]
+            previous[starts] = [self._last_row.get(term, -1) for term in added]
+            gaps = (rows - previous).astype(np.uint64)
+            data = encode_postings(gaps)
+            offsets = np.r_[0, np.cumsum(_encoded_sizes(gaps))][np.r_[starts, len(rows)]]
+
+            for i, term in enumerate(added):
+                blob = data[offsets[i]:offsets[i + 1]].tobytes()
+                if term in self._postings:
+                    self._postings[term] += blob
+                else:
+                    self._postings[term] = bytearray(blob)
+                self._last_row[term] = int(rows[ends[i]])
+            self._vocabulary = None
+
+    def postings(self, term: str) -> np.ndarray:
+        """Return the sorted row ids containing a term"""
+        data = self._postings.get(term)
+        if data is None:
+            return np.zeros(0, dtype=np.int64)
+        return np.cumsum(decode_postings(np.frombuffer(data, dtype=np.uint8))) - 1
+
+    def _prefix_postings(self, prefix: str) -> Tuple[np.ndarray, bool]:
+        """
+        Return the row ids containing any term starting with ``prefix``
+
+        Returns:
+            (row ids, truncated): truncated when the prefix matches more than
+            MAX_PREFIX_TERMS terms and only the first of them were searched
+        """
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        first = bisect.bisect_left(self._vocabulary, prefix)
+        last = bisect.bisect_left(self._vocabulary, prefix + '\uffff', first)
+        truncated = last - first > MAX_PREFIX_TERMS
+        terms = self._vocabulary[first:min(last, first + MAX_PREFIX_TERMS)]
+        if len(terms) == 1:
+            return self.postings(terms[0]), truncated
+        if not terms:
+            return np.zeros(0, dtype=np.int64), truncated
+        return np.unique(np.concatenate([self.postings(term) for term in terms])), truncated
+
+    def match(self, query: str) -> Optional[Tuple[np.ndarray, bool]]:
+        """
+        Return the row ids containing every query term
+
+        The last term is matched as a prefix (from MIN_PREFIX_LENGTH
+        characters) so results follow the user's typing. Lists are
+        intersected shortest first.
+
+        Returns:
+            (sorted row ids, truncated), or None for a query without terms;
+            truncated when the last term's prefix expansion was capped at
+            MAX_PREFIX_TERMS, so some matches may be missing
+        """
+        terms = tokenize(query)
+        if not terms:
+            return None
+
+        truncated = False
+        with self._lock:
+            lists = [self.postings(term) for term in terms[:-1]]
+            if len(terms[-1]) >= MIN_PREFIX_LENGTH:
+                rows, truncated = self._prefix_postings(terms[-1])
+                lists.append(rows)
+            else:
+                lists.append(self.postings(terms[-1]))
+        lists.sort(key=len)
+        rows = lists[0]
+        for other in lists[1:]:
+            if not len(rows):
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows, truncated
+
+    def select(self, rows: np.ndarray, first_day: Optional[int], last_day: Optional[int],
+               filters: Dict[str, str], weekday: Optional[int] = None) -> np.ndarray:
+        """
+        Intersect matched rows with a filter selection
+
+        Args:
+            rows: Row ids from ``match``
+            first_day: First created day to include, or None for all days
+            last_day: Last created day to include, or None for all days
+            filters: Facet column -> value to keep, or 'all'
+            weekday: Only include tickets created on this weekday (Monday = 0)
+        """
+        days = self.days[rows]
+        mask = np.ones(len(rows), dtype=bool)
+        if first_day is not None and last_day is not None:
+            mask &= (days >= first_day) & (days <= last_day)
+        if weekday is not None:
+            # Day 0 (1970-01-01) was a Thursday; weekdays count from Monday = 0
+            mask &= (days + 3) % 7 == weekday
+        for column, value in filters.items():
+            if value != 'all':
+                code = self._categories[column].get(value, -1)
+                mask &= self._codes[column][rows] == code
+        return rows[mask]
+
+    def results(self, rows: np.ndarray, limit: int) -> pd.DataFrame:
+        """Return the newest ``limit`` of the given rows as a small frame for display"""
+        if len(rows) > limit:
+            # Partial selection of the newest rows, then a sort of just those
+            rows = rows[np.argpartition(-self.days[rows], limit - 1)[:limit]]
+        # Newest day first; later rows first within a day
+        rows = rows[np.lexsort((-rows, -self.days[rows]))]
+
+        frame = pd.DataFrame({
+            'ticket_id': self.ticket_ids[rows],
+            'title': self.titles[rows],
+            'created_date': EPOCH_DAY + self.days[rows]
+        })
+        for column in FACET_COLUMNS:
+            names = np.array(list(self._categories[column]), dtype=object)
+            frame[column] = names[self._codes[column][rows]] if len(names) else []
+        return frame
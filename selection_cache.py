@@ -0,0 +1,101 @@
+"""
+Selection Cache
+LRU cache of per-selection aggregates that computes each key once: callbacks
+asking for the same selection concurrently wait for the first computation
+instead of repeating the scan
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Tuple
+
+
+class SelectionCache:
+    def __init__(self, maxsize: int = 64):
+        """
+        Initialize the cache
+
+        Args:
+            maxsize: Number of results kept; least recently used ones are dropped first
+        """
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[Tuple, object]' = OrderedDict()
+        # Computations in flight, so concurrent callers of a key share one result
+        self._pending: Dict[Tuple, Future] = {}
+        # Bumped by ``discard``; results computed against an older generation are not stored
+        self._generations: Dict[object, int] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+
+    def get_or_compute(self, key: Tuple, compute: Callable[[], object]):
+        """
+        Return the cached result for ``key``, computing it once on a miss
+
+        Args:
+            key: Hashable key of the selection
+            compute: Produces the result; runs in the first caller's thread only
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            waiting = self._pending.get(key)
+            generation = self._generations.get(key[0], 0)
+            if waiting is None:
+                future = self._pending[key] = Future()
+                self.misses += 1
+            else:
+                self.waits += 1
+        if waiting is not None:
+            return waiting.result()
+
+        try:
+            result = compute()
+        except BaseException as e:
+            with self._lock:
+                if self._pending.get(key) is future:
+                    del self._pending[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+            if self._generations.get(key[0], 0) == generation:
+                self._entries[key] = result
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        future.set_result(result)
+        return result
+
+    def discard(self, dataset) -> int:
+        """
+        Drop every result of a dataset, e.g. after it was evicted or its data changed
+
+        Computations already running for the dataset still answer their
+        callers but are not stored.
+
+        Args:
+            dataset: First element of the keys to drop
+
+        Returns:
+            Number of results dropped
+        """
+        with self._lock:
+            self._generations[dataset] = self._generations.get(dataset, 0) + 1
+            for key in [key for key in self._pending if key[0] == dataset]:
+                del self._pending[key]
+            stale = [key for key in self._entries if key[0] == dataset]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def stats(self) -> Dict:
+        """Return hit, miss and shared-computation counters"""
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses, 'waits': self.waits}
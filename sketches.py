@@ -0,0 +1,406 @@
+"""
+Segment Sketches
+Mergeable summaries kept per (month, priority, department, status) segment, so
+a filter selection is answered by combining the matching segments instead of
+scanning the tickets behind them
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# Ticket columns a segment is keyed on; in a segment table the day column
+# holds the first day of the segment's month
+SEGMENT_COLUMNS = ['created_day_bucket', 'priority', 'department', 'status']
+DAY_COLUMN = SEGMENT_COLUMNS[0]
+EPOCH_DAY = np.datetime64('1970-01-01', 'D')
+
+
+def _month_start(days: np.ndarray) -> np.ndarray:
+    """Map day numbers (days since 1970-01-01) to the day number their month starts on"""
+    months = (np.asarray(days).astype('datetime64[D]')).astype('datetime64[M]')
+    return (months.astype('datetime64[D]') - EPOCH_DAY).astype(np.int32)
+
+
+def split_days(first_day: Optional[int], last_day: Optional[int]) -> Tuple[Optional[Tuple], List[Tuple[int, int]]]:
+    """
+    Split an inclusive day range into the whole months sketches answer and the days around them
+
+    Returns:
+        (day span of the whole calendar months inside the range, or None when
+        it holds none; (None, None) for an open range), and the inclusive day
+        spans of the partial months at its edges
+    """
+    if first_day is None or last_day is None:
+        return (None, None), []
+    start = int(_month_start([first_day])[0])
+    if start != first_day:
+        start = int(_month_start([start + 31])[0])
+    end = int(_month_start([last_day + 1])[0]) - 1
+    if start > end:
+        return None, [(first_day, last_day)] if first_day <= last_day else []
+    edges = [(first, last) for first, last in ((first_day, start - 1), (end + 1, last_day)) if first <= last]
+    return (start, end), edges
+
+
+def _segments(df: pd.DataFrame) -> pd.DataFrame:
+    """Key ticket rows by segment: the first day of their month plus the categorical columns"""
+    keys = df[SEGMENT_COLUMNS].reset_index(drop=True)
+    keys[DAY_COLUMN] = _month_start(keys[DAY_COLUMN].to_numpy())
+    # Categorical segment columns keep the table small and the filter masks cheap
+    for column in SEGMENT_COLUMNS[1:]:
+        keys[column] = keys[column].astype('category')
+    return keys
+
+
+def _concat(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate segment tables, keeping the categorical columns categorical"""
+    nonempty = [frame for frame in frames if not frame.empty]
+    if len(nonempty) <= 1:
+        return (nonempty or frames)[0].reset_index(drop=True)
+    frames = nonempty
+    for column in SEGMENT_COLUMNS[1:]:
+        # Differing categories would make concat fall back to object columns
+        categories = pd.api.types.union_categoricals(
+            [frame[column].astype('category') for frame in frames], ignore_order=True).categories
+        frames = [
+            frame if isinstance(frame[column].dtype, pd.CategoricalDtype)
+            and frame[column].cat.categories.equals(categories)
+            else frame.assign(**{column: pd.Categorical(frame[column], categories=categories)})
+            for frame in frames
+        ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def _touched(segments: pd.DataFrame, points: pd.DataFrame) -> np.ndarray:
+    """Select the rows of a segment table belonging to a segment that also appears in ``points``"""
+    touched = np.zeros(len(segments), dtype=bool)
+    if segments.empty or points.empty:
+        return touched
+    # New tickets land in few months, so the exact segment match only runs on those months' rows
+    candidates = np.flatnonzero(np.isin(segments[DAY_COLUMN].to_numpy(), points[DAY_COLUMN].unique()))
+    if len(candidates):
+        pooled = _concat([segments.iloc[candidates][SEGMENT_COLUMNS], points[SEGMENT_COLUMNS]])
+        groups = pooled.groupby(SEGMENT_COLUMNS, sort=False, observed=True).ngroup().to_numpy()
+        touched[candidates] = np.isin(groups[:len(candidates)], groups[len(candidates):])
+    return touched
+
+
+def _segment_mask(segments: pd.DataFrame, first_day: Optional[int], last_day: Optional[int],
+                  filters: Dict[str, str]) -> np.ndarray:
+    """Select the rows of a segment table whose month starts inside a day range and that match the filters"""
+    mask = np.ones(len(segments), dtype=bool)
+    if first_day is not None and last_day is not None:
+        days = segments[DAY_COLUMN].to_numpy()
+        mask &= (days >= first_day) & (days <= last_day)
+    for column, value in filters.items():
+        if value != 'all':
+            mask &= (segments[column] == value).to_numpy()
+    return mask
+
+
+class QuantileSketch:
+    """
+    t-digest centroids per segment
+
+    Each segment holds at most about ``compression / 2`` weighted centroids,
+    sized by the t-digest k1 scale function so the tails stay precise; the
+    sketch therefore grows with months and segments, not with tickets.
+    Centroids are stored as float32. Segments are disjoint, so merging
+    segments is just pooling their centroids, and the mean of a selection is
+    exact up to float32 rounding because centroids preserve total weight and
+    sum. The table is kept sorted by mean, so a selection never has to sort
+    its centroids.
+    """
+
+    def __init__(self, centroids: Optional[pd.DataFrame] = None, compression: int = 100):
+        """
+        Initialize the sketch
+
+        Args:
+            centroids: Frame with the segment columns plus 'mean' and 'weight'
+            compression: t-digest compression parameter (delta)
+        """
+        self.compression = compression
+        self.centroids = self._by_mean(centroids if centroids is not None else self._empty())
+
+    @staticmethod
+    def _empty() -> pd.DataFrame:
+        centroids = pd.DataFrame({column: pd.Series(dtype='category') for column in SEGMENT_COLUMNS})
+        centroids[DAY_COLUMN] = centroids[DAY_COLUMN].astype('int32')
+        centroids['mean'] = pd.Series(dtype='float32')
+        centroids['weight'] = pd.Series(dtype='float32')
+        return centroids
+
+    @staticmethod
+    def _by_mean(centroids: pd.DataFrame) -> pd.DataFrame:
+        """Order centroids by mean; the merge sort only has to interleave already sorted runs"""
+        means = centroids['mean'].to_numpy()
+        if len(means) < 2 or (means[1:] >= means[:-1]).all():
+            return centroids.reset_index(drop=True)
+        return centroids.iloc[np.argsort(means, kind='stable')].reset_index(drop=True)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.centroids.memory_usage(deep=True).sum())
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, value_column: str, compression: int = 100) -> 'QuantileSketch':
+        """
+        Build a sketch from ticket rows
+
+        Args:
+            df: Tickets with the segment columns (see ``add_derived_columns``)
+            value_column: Column to summarize; missing values are skipped
+            compression: t-digest compression parameter (delta)
+        """
+        sketch = cls(compression=compression)
+        sketch.add(df, value_column)
+        return sketch
+
+    @classmethod
+    def merge(cls, sketches: Iterable['QuantileSketch']) -> 'QuantileSketch':
+        """Combine sketches, e.g. one per partition; pooling centroids is all a merge needs"""
+        sketches = [s for s in sketches if not s.centroids.empty]
+        if not sketches:
+            return cls()
+        if len(sketches) == 1:
+            return sketches[0]
+        return cls(_concat([s.centroids for s in sketches]), sketches[0].compression)
+
+    def add(self, df: pd.DataFrame, value_column: str):
+        """
+        Fold new tickets into the segments they belong to, leaving every other segment as it is
+
+        Args:
+            df: New tickets with the segment columns
+            value_column: Column to summarize; missing values are skipped
+        """
+        values = df[value_column].to_numpy(dtype='float64')
+        present = ~np.isnan(values)
+        if not present.any():
+            return
+
+        points = _segments(df[present])
+        points['mean'] = values[present]
+        points['weight'] = 1.0
+        touched = _touched(self.centroids, points)
+        compressed = self._compress(_concat([self.centroids[touched], points]), self.compression)
+        self.centroids = self._by_mean(_concat([self.centroids[~touched], compressed]))
+
+    @staticmethod
+    def _compress(centroids: pd.DataFrame, compression: int) -> pd.DataFrame:
+        """Merge weighted points into t-digest centroids, segment by segment, in one vectorized pass"""
+        segment = centroids.groupby(SEGMENT_COLUMNS, sort=False, observed=True).ngroup().to_numpy()
+        means = centroids['mean'].to_numpy(dtype='float64')
+        weights = centroids['weight'].to_numpy(dtype='float64')
+
+        order = np.lexsort((means, segment))
+        segment, means, weights = segment[order], means[order], weights[order]
+
+        # Quantile of each point's midpoint within its own segment
+        starts = np.r_[0, np.flatnonzero(np.diff(segment)) + 1]
+        sizes = np.diff(np.r_[starts, len(segment)])
+        before = np.cumsum(weights) - weights
+        offset = np.repeat(before[starts], sizes)
+        total = np.repeat(np.add.reduceat(weights, starts), sizes)
+        q = (before - offset + weights / 2) / total
+
+        # Points falling into the same unit of the k1 scale share a centroid
+        k = np.floor(compression / (2 * np.pi) * np.arcsin(2 * q - 1)).astype(np.int64)
+        runs = np.r_[0, np.flatnonzero((np.diff(segment) != 0) | (np.diff(k) != 0)) + 1]
+
+        merged_weights = np.add.reduceat(weights, runs)
+        merged = centroids.iloc[order[runs]][SEGMENT_COLUMNS].reset_index(drop=True)
+        merged['mean'] = (np.add.reduceat(means * weights, runs) / merged_weights).astype('float32')
+        merged['weight'] = merged_weights.astype('float32')
+        return merged
+
+    def summary(self, first_day: Optional[int], last_day: Optional[int], filters: Dict[str, str],
+                percentiles: List[int], values: Optional[np.ndarray] = None) -> Dict:
+        """
+        Answer mean and percentiles for a selection of segments
+
+        Args:
+            first_day: First day of the first month to include, or None for all months
+            last_day: Last day of the last month to include, or None for all months
+            filters: Segment column -> value to keep, or 'all'
+            percentiles: Percentiles to estimate, e.g. [50, 90, 99]
+            values: Values of further tickets to include exactly, e.g. those
+                created in the partial months around the whole months
+
+        Returns:
+            {'count', 'mean', 'percentiles': {p: value}}; zeros when nothing matches
+        """
+        selected = self.centroids[_segment_mask(self.centroids, first_day, last_day, filters)]
+        means = selected['mean'].to_numpy(dtype='float64')
+        weights = selected['weight'].to_numpy(dtype='float64')
+        if values is not None:
+            values = np.asarray(values, dtype='float64')
+            values = values[~np.isnan(values)]
+            if len(values):
+                # The centroids are already sorted by mean, so this only interleaves two runs
+                means = np.concatenate([means, np.sort(values)])
+                weights = np.concatenate([weights, np.ones(len(values))])
+                order = np.argsort(means, kind='stable')
+                means, weights = means[order], weights[order]
+        if not len(means):
+            return {'count': 0, 'mean': 0, 'percentiles': {p: 0 for p in percentiles}}
+        count = weights.sum()
+
+        # Each centroid sits at the middle of its weight; interpolate between neighbours
+        centers = np.cumsum(weights) - weights / 2
+        targets = np.asarray(percentiles, dtype='float64') / 100 * count
+        estimates = np.interp(targets, centers, means)
+
+        return {
+            'count': int(round(count)),
+            'mean': float((means * weights).sum() / count),
+            'percentiles': dict(zip(percentiles, estimates.tolist()))
+        }
+
+
+def _leading_zeros(values: np.ndarray) -> np.ndarray:
+    """Count leading zero bits of uint64 values exactly (64 for zero)"""
+    values = values.copy()
+    zeros = np.zeros(len(values), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        empty = (values >> np.uint64(64 - shift)) == 0
+        zeros += shift * empty
+        values = np.where(empty, values << np.uint64(shift), values)
+    return np.where(values == 0, 64, zeros)
+
+
+class DistinctSketch:
+    """
+    HyperLogLog registers per segment
+
+    Every segment holds a dense, fixed-size array of ``2 ** precision`` one-byte
+    registers, so the sketch grows with months and segments, not with tickets.
+    A selection is estimated by taking the register-wise maximum over the
+    matching segments. Each segment also counts the values added to it, which
+    caps the estimate: a selection never reports more distinct values than it
+    has tickets.
+    """
+
+    def __init__(self, segments: Optional[pd.DataFrame] = None, registers: Optional[np.ndarray] = None,
+                 precision: int = 10):
+        """
+        Initialize the sketch
+
+        Args:
+            segments: Frame with the segment columns plus 'values', the number
+                of values added to each segment
+            registers: uint8 array with one row of registers per segment
+            precision: Register index bits; 10 gives 1024 registers and about 3.2% error
+        """
+        self.precision = precision
+        if segments is None:
+            segments = pd.DataFrame({column: pd.Series(dtype='category') for column in SEGMENT_COLUMNS})
+            segments[DAY_COLUMN] = segments[DAY_COLUMN].astype('int32')
+            segments['values'] = pd.Series(dtype='int64')
+            registers = np.zeros((0, 1 << precision), dtype=np.uint8)
+        self.segments = segments
+        self.registers = registers
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.segments.memory_usage(deep=True).sum() + self.registers.nbytes)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, value_column: str, precision: int = 10) -> 'DistinctSketch':
+        """
+        Build a sketch from ticket rows
+
+        Args:
+            df: Tickets with the segment columns (see ``add_derived_columns``)
+            value_column: Column whose distinct values are counted; missing values are skipped
+            precision: Register index bits
+        """
+        sketch = cls(precision=precision)
+        sketch.add(df, value_column)
+        return sketch
+
+    @classmethod
+    def merge(cls, sketches: Iterable['DistinctSketch']) -> 'DistinctSketch':
+        """Combine sketches of disjoint tickets, e.g. one per partition"""
+        sketches = [s for s in sketches if not s.segments.empty]
+        if not sketches:
+            return cls()
+        if len(sketches) == 1:
+            return sketches[0]
+        return cls(_concat([s.segments for s in sketches]), np.concatenate([s.registers for s in sketches]),
+                   sketches[0].precision)
+
+    def _ranks(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Hash values to (register index, rank) pairs"""
+        # Stable 64-bit hashes: the top bits pick the register, the rest give the rank
+        hashes = pd.util.hash_array(np.asarray(values, dtype=object))
+        remainder = hashes << np.uint64(self.precision)
+        rank = np.minimum(_leading_zeros(remainder), 64 - self.precision) + 1
+        return (hashes >> np.uint64(64 - self.precision)).astype(np.intp), rank.astype(np.uint8)
+
+    def add(self, df: pd.DataFrame, value_column: str):
+        """
+        Fold new tickets into the sketch
+
+        Args:
+            df: New tickets with the segment columns
+            value_column: Column whose distinct values are counted; missing values are skipped
+        """
+        present = df[value_column].notna().to_numpy()
+        if not present.any():
+            return
+
+        register, rank = self._ranks(df[value_column].to_numpy()[present])
+        points = _segments(df[present])
+        # Numbering groups in order of first appearance keeps the known segments at their rows
+        pooled = _concat([self.segments[SEGMENT_COLUMNS], points])
+        ids = pooled.groupby(SEGMENT_COLUMNS, sort=False, observed=True).ngroup().to_numpy()
+        known, ids = len(self.segments), ids[len(self.segments):]
+        total = max(known, int(ids.max()) + 1)
+
+        # New arrays rather than in-place updates, for requests still reading this sketch
+        registers = np.zeros((total, self.registers.shape[1]), dtype=np.uint8)
+        registers[:known] = self.registers
+        np.maximum.at(registers, (ids, register), rank)
+        counts = np.bincount(ids, minlength=total)
+        counts[:known] += self.segments['values'].to_numpy()
+
+        unique, first = np.unique(ids, return_index=True)
+        segments = _concat([self.segments[SEGMENT_COLUMNS], points.iloc[first[unique >= known]]])
+        segments['values'] = counts
+        self.segments, self.registers = segments, registers
+
+    def count(self, first_day: Optional[int], last_day: Optional[int], filters: Dict[str, str],
+              values: Optional[np.ndarray] = None) -> int:
+        """
+        Estimate the number of distinct values in a selection of segments
+
+        Args:
+            first_day: First day of the first month to include, or None for all months
+            last_day: Last day of the last month to include, or None for all months
+            filters: Segment column -> value to keep, or 'all'
+            values: Values of further tickets to include, e.g. those created in
+                the partial months around the whole months; missing values are skipped
+        """
+        mask = _segment_mask(self.segments, first_day, last_day, filters)
+        m = self.registers.shape[1]
+        dense = self.registers[mask].max(axis=0) if mask.any() else np.zeros(m, dtype=np.uint8)
+        limit = int(self.segments['values'].to_numpy()[mask].sum())
+        if values is not None:
+            values = pd.Series(values).dropna().to_numpy()
+            if len(values):
+                register, rank = self._ranks(values)
+                np.maximum.at(dense, register, rank)
+                limit += len(values)
+        if not limit:
+            return 0
+
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-dense.astype(np.float64)))
+        empty_registers = np.count_nonzero(dense == 0)
+        if estimate <= 2.5 * m and empty_registers:
+            # Linear counting is more accurate while many registers are still empty
+            estimate = m * np.log(m / empty_registers)
+        return min(int(round(estimate)), limit)
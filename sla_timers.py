@@ -0,0 +1,381 @@
+"""
+SLA Timers
+Keeps every open ticket's SLA warning and breach deadlines in a min-heap and
+fires n8n alerts when they fall due, instead of rescanning open tickets on a
+fixed interval
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import Dict, Hashable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from n8n_integration import N8nIntegration
+
+try:
+    import fcntl
+except ImportError:  # fcntl is POSIX-only; elsewhere every process runs its own timers
+    fcntl = None
+
+# Fraction of sla_target_hours after which a ticket is reported as approaching breach
+WARNING_FRACTION = 0.8
+ALERT_WORKFLOW = 'sla-breach-alert'
+ESCALATION_WORKFLOW = 'critical-escalation'
+# Breached tickets in these states at these priorities are escalated as well
+ESCALATION_PRIORITIES = ['Critical']
+ESCALATION_STATUSES = ['Open', 'In Progress']
+TICKET_FIELDS = ['ticket_id', 'title', 'priority', 'department', 'status', 'assignee', 'requester']
+# Held by the one server process (e.g. gunicorn worker) that runs the timers;
+# named per set of ticket sources unless DASHBOARD_SLA_LOCK_PATH sets it
+LOCK_FILE_PREFIX = 'dashboard-sla-timers'
+
+
+def timer_lock_path(sources: Dict[str, str]) -> str:
+    """
+    Return the lock file shared by the server processes of one dashboard
+
+    ``DASHBOARD_SLA_LOCK_PATH`` overrides it. Otherwise the file in the temp
+    directory is named after a hash of the dataset names and source paths, so
+    the workers of one dashboard elect a single timer process while other
+    dashboards on the same host, serving other data, run their own.
+
+    Args:
+        sources: Dataset name -> ticket file or partitioned store
+    """
+    configured = os.environ.get('DASHBOARD_SLA_LOCK_PATH')
+    if configured:
+        return configured
+    key = json.dumps(sorted((name, os.path.abspath(path)) for name, path in sources.items()))
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), f'{LOCK_FILE_PREFIX}-{digest}.lock')
+
+
+def _now() -> float:
+    # Ticket dates are naive local times; read the clock the same way so both
+    # sides convert to seconds with the same (UTC-assuming) offset
+    return pd.Timestamp(datetime.now()).timestamp()
+
+
+class DeadlineHeap:
+    """
+    Binary min-heap of deadlines with a position index
+
+    The index maps each key to its slot, so a key can be rescheduled or
+    removed in O(log n) without searching the heap or leaving tombstones.
+    """
+
+    def __init__(self):
+        self._heap: List[list] = []  # [deadline, sequence, key]
+        self._index: Dict[Hashable, int] = {}
+        self._sequence = itertools.count()  # Breaks deadline ties in insertion order
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._index
+
+    def push(self, key: Hashable, deadline: float):
+        """Schedule a key, replacing its previous deadline if it had one"""
+        if key in self._index:
+            self.remove(key)
+        self._heap.append([deadline, next(self._sequence), key])
+        self._index[key] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+
+    def remove(self, key: Hashable) -> bool:
+        """Unschedule a key; returns False if it was not scheduled"""
+        position = self._index.pop(key, None)
+        if position is None:
+            return False
+        last = self._heap.pop()
+        if position < len(self._heap):
+            # Fill the hole with the last entry and restore the heap order around it
+            self._heap[position] = last
+            self._index[last[2]] = position
+            self._sift_down(position)
+            self._sift_up(position)
+        return True
+
+    def peek(self) -> Optional[float]:
+        """Return the earliest deadline, or None when empty"""
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float) -> List[Tuple[Hashable, float]]:
+        """Remove and return the (key, deadline) pairs due by ``now``, earliest first"""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, _, key = self._heap[0]
+            self.remove(key)
+            due.append((key, deadline))
+        return due
+
+    def _swap(self, i: int, j: int):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._index[heap[i][2]] = i
+        self._index[heap[j][2]] = j
+
+    def _sift_up(self, i: int):
+        heap = self._heap
+        while i > 0:
+            parent = (i - 1) // 2
+            if heap[i][:2] >= heap[parent][:2]:
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i: int):
+        heap = self._heap
+        size = len(heap)
+        while True:
+            smallest = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < size and heap[child][:2] < heap[smallest][:2]:
+                    smallest = child
+            if smallest == i:
+                break
+            self._swap(i, smallest)
+            i = smallest
+
+
+class SlaTimerService(threading.Thread):
+    def __init__(self, n8n: N8nIntegration, warning_fraction: float = WARNING_FRACTION,
+                 lock_path: Optional[str] = None):
+        """
+        Background thread that fires SLA alerts at their deadlines
+
+        Each open ticket has two timers, a warning at ``warning_fraction`` of
+        its SLA target and a breach at the target itself, both counted from
+        ``created_date``. The thread sleeps until the earliest deadline, so
+        alerts go out on time and the work done is proportional to the
+        number of alerts rather than the number of open tickets.
+
+        Deadlines that already passed when a dataset is first synced count
+        as fired, so a restart does not re-send them. Only the process
+        holding the lock file runs timers; the others keep trying to take it
+        over (see ``claim``).
+
+        Args:
+            n8n: Integration whose workflows receive the alerts
+            warning_fraction: Fraction of the SLA target that triggers a warning
+            lock_path: File locked by the process that runs the timers (see
+                ``timer_lock_path``); None runs them in every process
+        """
+        super().__init__(name='dashboard-sla-timers', daemon=True)
+        self.n8n = n8n
+        self.warning_fraction = warning_fraction
+
+        self._condition = threading.Condition()
+        self._timers = DeadlineHeap()
+        # (dataset, ticket_id) -> ticket fields and deadlines, for tickets being tracked
+        self._tickets: Dict[Tuple[str, str], Dict] = {}
+        # Dataset -> ticket_id -> hash of the row last synced, to find the tickets that changed
+        self._row_hashes: Dict[str, pd.Series] = {}
+        self.lock_path = lock_path
+        self._lock_file = None
+        # Alerts are held until the integration is known to be reachable
+        self._paused = True
+        self._stopped = False
+        self.fired = {'warning': 0, 'breach': 0, 'escalation': 0}
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    @paused.setter
+    def paused(self, paused: bool):
+        """While paused (e.g. n8n is unreachable) due alerts are held and sent on resume"""
+        with self._condition:
+            self._paused = paused
+            self._condition.notify()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def claim(self) -> bool:
+        """
+        Take the timer lock unless another process holds it
+
+        Returns:
+            True if this process runs the timers
+        """
+        if self._lock_file is not None or fcntl is None or self.lock_path is None:
+            return True
+        lock_file = open(self.lock_path, 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        # Released by the operating system when the process exits
+        self._lock_file = lock_file
+        return True
+
+    def sync(self, dataset: str, open_df: pd.DataFrame) -> Dict[str, int]:
+        """
+        Align the timers of a dataset with its current open tickets
+
+        Only tickets whose rows changed since the last sync are examined:
+        tickets that are no longer open lose their timers, new tickets get
+        them, and changed tickets whose deadlines did not move keep theirs,
+        so a timer that already fired is not fired again. On the first sync
+        of a dataset, deadlines already in the past are taken as fired.
+
+        Args:
+            dataset: Dataset the tickets belong to
+            open_df: The dataset's open tickets (see ``TicketBackend.open_tickets``)
+
+        Returns:
+            {'added', 'removed', 'tracked'} counts
+        """
+        open_df = open_df.drop_duplicates('ticket_id', keep='last')
+        created = pd.to_datetime(open_df['created_date']).to_numpy().astype('datetime64[ns]').astype(np.int64) / 1e9
+        target = open_df['sla_target_hours'].to_numpy(dtype='float64') * 3600
+        valid = ~np.isnan(target) & (created > 0)
+        open_df, created, target = open_df[valid], created[valid], target[valid]
+
+        ticket_ids = open_df['ticket_id'].to_numpy()
+        row_hashes = pd.Series(pd.util.hash_pandas_object(open_df[TICKET_FIELDS + ['created_date', 'sla_target_hours']],
+                                                          index=False).to_numpy(), index=ticket_ids)
+        previous = self._row_hashes.get(dataset)
+        if previous is None:
+            changed = np.ones(len(open_df), dtype=bool)
+            gone = []
+        else:
+            changed = (previous.reindex(ticket_ids) != row_hashes).to_numpy()
+            gone = previous.index.difference(ticket_ids)
+        open_df, created, target = open_df[changed], created[changed], target[changed]
+        records = open_df[TICKET_FIELDS].astype(object).where(open_df[TICKET_FIELDS].notna(), None)
+
+        current = {}
+        for ticket, created_at, seconds in zip(records.to_dict('records'), created, target):
+            ticket['created_at'] = float(created_at)
+            ticket['sla_target'] = seconds / 3600
+            ticket['warning_at'] = float(created_at + seconds * self.warning_fraction)
+            ticket['breach_at'] = float(created_at + seconds)
+            current[(dataset, ticket['ticket_id'])] = ticket
+
+        added = removed = 0
+        now = _now()
+        with self._condition:
+            for ticket_id in gone:
+                if (dataset, ticket_id) in self._tickets:
+                    self.resolve(dataset, ticket_id)
+                    removed += 1
+            for key, ticket in current.items():
+                tracked = self._tickets.get(key)
+                if tracked is not None and (tracked['warning_at'], tracked['breach_at']) == \
+                        (ticket['warning_at'], ticket['breach_at']):
+                    tracked.update(ticket)
+                    continue
+                self._tickets[key] = ticket
+                for stage in ('warning', 'breach'):
+                    if previous is not None or ticket[f'{stage}_at'] > now:
+                        self._timers.push(key + (stage,), ticket[f'{stage}_at'])
+                    else:
+                        self._timers.remove(key + (stage,))
+                added += 1
+            self._row_hashes[dataset] = row_hashes
+            self._condition.notify()
+        return {'added': added, 'removed': removed, 'tracked': len(row_hashes)}
+
+    def resolve(self, dataset: str, ticket_id: str):
+        """Stop tracking a ticket that was resolved or closed, in O(log n)"""
+        with self._condition:
+            self._tickets.pop((dataset, ticket_id), None)
+            self._timers.remove((dataset, ticket_id, 'warning'))
+            self._timers.remove((dataset, ticket_id, 'breach'))
+
+    def run(self):
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    deadline = None if self._paused else self._timers.peek()
+                    if deadline is not None and deadline <= _now():
+                        break
+                    # Sleeps until the earliest deadline; sync, resume and stop wake it early
+                    self._condition.wait(None if deadline is None else deadline - _now())
+                if self._stopped:
+                    return
+                due = self._take_due(_now())
+
+            try:
+                self._fire(due)
+            except Exception as e:
+                print(f"SLA timer error: {e}")
+
+    def _take_due(self, now: float) -> List[Tuple[str, Dict]]:
+        """Pop the due timers as (stage, ticket) pairs; a due breach supersedes the warning"""
+        due = {}
+        for (dataset, ticket_id, stage), _ in self._timers.pop_due(now):
+            ticket = self._tickets.get((dataset, ticket_id))
+            if ticket is not None and due.get((dataset, ticket_id), (None,))[0] != 'breach':
+                due[(dataset, ticket_id)] = (stage, ticket)
+        return list(due.values())
+
+    def _fire(self, due: List[Tuple[str, Dict]]) -> List[Dict]:
+        """Send one alert batch (and one escalation batch) for timers that fell due together"""
+        if not due:
+            return []
+
+        now = _now()
+        timestamp = datetime.now().isoformat()
+        alerts, escalations = [], []
+        for stage, ticket in due:
+            hours_elapsed = (now - ticket['created_at']) / 3600
+            alerts.append({
+                'ticket_id': ticket['ticket_id'],
+                'title': ticket['title'],
+                'priority': ticket['priority'],
+                'department': ticket['department'],
+                'stage': stage,
+                'hours_elapsed': round(hours_elapsed, 1),
+                'sla_target': ticket['sla_target'],
+                'time_remaining': round(ticket['sla_target'] - hours_elapsed, 1),
+                'assignee': ticket['assignee']
+            })
+            self.fired[stage] += 1
+            if stage == 'breach' and ticket['priority'] in ESCALATION_PRIORITIES \
+                    and ticket['status'] in ESCALATION_STATUSES:
+                escalations.append({
+                    'ticket_id': ticket['ticket_id'],
+                    'title': ticket['title'],
+                    'department': ticket['department'],
+                    'assignee': ticket['assignee'],
+                    'hours_overdue': round(hours_elapsed - ticket['sla_target'], 1),
+                    'requester': ticket['requester']
+                })
+
+        results = [self.n8n.trigger_workflow(ALERT_WORKFLOW, {
+            'alerts': alerts,
+            'timestamp': timestamp,
+            'total_warnings': len(alerts)
+        })]
+        if escalations:
+            self.fired['escalation'] += len(escalations)
+            results.append(self.n8n.trigger_workflow(ESCALATION_WORKFLOW, {
+                'tickets': escalations,
+                'timestamp': timestamp,
+                'count': len(escalations)
+            }))
+        return results
+
+    def stats(self) -> Dict:
+        with self._condition:
+            return {
+                'tracked_tickets': len(self._tickets),
+                'pending_timers': len(self._timers),
+                'next_deadline': self._timers.peek(),
+                'active': self._lock_file is not None or fcntl is None or self.lock_path is None,
+                'paused': self._paused,
+                'fired': dict(self.fired)
+            }
@@ -0,0 +1,9 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The dashboard modules live at the repository root
+sys.path.insert(0, ROOT)
+# app.py loads its data at import; point it at the sample file whatever the working directory
+os.environ.setdefault('DASHBOARD_DATA_PATH', os.path.join(ROOT, 'sample_tickets.csv'))
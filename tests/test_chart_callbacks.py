@@ -0,0 +1,60 @@
+import json
+from unittest import mock
+
+import dash
+import plotly
+import pytest
+
+from figure_cache import create_figure_cache
+
+app = pytest.importorskip('app')
+pytestmark = pytest.mark.skipif(not hasattr(app, 'update_charts'), reason="charts are served by split callbacks")
+
+
+class Triggered:
+    def __init__(self, triggered_id):
+        self.triggered_id = triggered_id
+
+
+def serialized(figure):
+    return json.dumps(figure, cls=plotly.utils.PlotlyJSONEncoder, sort_keys=True)
+
+
+def selection(cross_filter):
+    first, latest = app.registry.get().date_bounds()
+    return (None, str(first.date()), str(latest.date()), 'all', 'IT', 'all', app.registry.versions(), cross_filter)
+
+
+@pytest.mark.parametrize('cross_filter', [None, {'priority': 'High'}, {'created_weekday': 'Monday'}])
+def test_combined_callback_returns_the_split_figures(cross_filter):
+    filters = selection(cross_filter)
+    structures = [None] * len(app.CHART_IDS)
+
+    # Fresh caches, so neither mode is answered from figures the other one built
+    with mock.patch.object(dash, 'callback_context', Triggered('department-filter')):
+        with mock.patch.object(app, 'figure_cache', create_figure_cache()):
+            combined = app.update_charts(*filters, None, *structures)
+        with mock.patch.object(app, 'figure_cache', create_figure_cache()):
+            split = [app.CHART_UPDATES[chart_id](*filters, *([None] if chart_id == 'ticket-trends-chart' else []), None)
+                     for chart_id in app.CHART_IDS]
+
+    figures, combined_structures = combined[:len(app.CHART_IDS)], combined[len(app.CHART_IDS):]
+    for chart_id, figure, structure, (split_figure, split_structure) in zip(
+            app.CHART_IDS, figures, combined_structures, split):
+        assert figure['data'] and serialized(figure) == serialized(split_figure), chart_id
+        assert structure == split_structure, chart_id
+
+
+def test_combined_callback_only_rebuilds_the_trend_on_zoom():
+    filters = selection(None)
+    first, latest = app.registry.get().date_bounds()
+    quarter = (latest - first) / 4
+    relayout = {'xaxis.range[0]': str(first + quarter), 'xaxis.range[1]': str(latest - quarter)}
+
+    with mock.patch.object(dash, 'callback_context', Triggered('ticket-trends-chart')):
+        outputs = app.update_charts(*filters, relayout, *[None] * len(app.CHART_IDS))
+        trend = app.update_ticket_trends(*filters, relayout, None)
+
+    count = len(app.CHART_IDS)
+    assert serialized(outputs[0]) == serialized(trend[0]) and outputs[count] == trend[1]
+    assert all(output is dash.no_update for output in outputs[1:count] + outputs[count + 1:])
@@ -0,0 +1,41 @@
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from response_encoding import dumps
+
+app = pytest.importorskip('app')
+NODE = shutil.which('node')
+CLIENTSIDE_JS = os.path.join(os.path.dirname(app.__file__), 'assets', 'clientside.js')
+
+# Runs updateFromStore from assets/clientside.js on stdin's [store, selections]
+NODE_SCRIPT = """
+global.window = {dash_clientside: {no_update: null}};
+require(process.argv[1]);
+const [store, selections] = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const update = window.dash_clientside.dashboard.updateFromStore;
+console.log(JSON.stringify(selections.map(s => update(...s, store, {}).slice(0, 5))));
+"""
+
+
+@pytest.mark.skipif(NODE is None, reason="node is not installed")
+def test_client_and_server_kpis_match():
+    backend = app.registry.get()
+    first, last = backend.date_bounds()
+    # Picker values: plain dates (midnight ends), a timestamp end, and a filtered selection
+    selections = [
+        [str(first.date()), str(last.date()), 'all', 'all', 'all'],
+        ['2025-03-01', '2025-03-31', 'all', 'all', 'all'],
+        ['2025-03-01', '2025-03-31T12:00:00', 'High', 'all', 'Open'],
+        [None, None, 'all', 'all', 'all']
+    ]
+    store = {**backend.aggregate_store(), 'template': None}
+    result = subprocess.run([NODE, '-e', NODE_SCRIPT, CLIENTSIDE_JS], input=dumps([store, selections]),
+                            capture_output=True, check=True)
+
+    for selection, client in zip(selections, json.loads(result.stdout)):
+        server = app.update_kpis(None, *selection, None, {})
+        assert client == list(server[:5]), selection
@@ -0,0 +1,42 @@
+import gzip
+import io
+
+import pandas as pd
+import pytest
+
+app = pytest.importorskip('app')
+
+
+@pytest.fixture
+def client():
+    return app.app.server.test_client()
+
+
+def export(client, **params):
+    return client.get('/_dashboard/export', query_string=params, headers={'Accept-Encoding': 'gzip'})
+
+
+@pytest.mark.parametrize('name, value', [('start_date', 'not-a-date'), ('end_date', '2025-13-40')])
+def test_unparseable_dates_are_rejected_before_streaming(client, name, value):
+    dates = {'start_date': '2025-03-01', 'end_date': '2025-03-31', name: value}
+    response = export(client, **dates)
+    assert response.status_code == 400
+    assert response.get_json() == {'error': f"Invalid {name} '{value}'"}
+
+
+def test_unknown_format_and_dataset(client):
+    assert export(client, format='xlsx').status_code == 400
+    assert export(client, dataset='missing').status_code == 404
+
+
+def test_csv_export_applies_the_filters(client):
+    response = export(client, start_date='2025-03-01', end_date='2025-03-31', priority='High', status='Open')
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    exported = pd.read_csv(io.BytesIO(gzip.decompress(response.data)), parse_dates=['created_date'])
+
+    expected = app.registry.get().select('2025-03-01', '2025-03-31', 'High', 'all', 'Open')
+    assert len(exported) == len(expected) > 0
+    assert set(exported['ticket_id']) == set(expected['ticket_id'])
+    assert (exported['priority'] == 'High').all() and (exported['status'] == 'Open').all()
+    assert exported['created_date'].between('2025-03-01', '2025-03-31').all()
@@ -0,0 +1,34 @@
+import json
+from unittest import mock
+
+import plotly.graph_objects as go
+from flask import Flask, Response
+
+import figure_cache
+from figure_cache import FigureCache
+from response_encoding import raw_json, splice_raw_json
+
+
+def bar_figure():
+    return go.Figure(go.Bar(x=['Low', 'High'], y=[3, 5]))
+
+
+def test_hit_reuses_the_serialized_body_and_structure():
+    cache = FigureCache()
+    built = cache.get_or_create('key', bar_figure)
+    with mock.patch.object(figure_cache, 'dumps', side_effect=AssertionError('serialized again')):
+        hit = cache.get_or_create('key', bar_figure)
+    assert hit.body is built.body and hit.structure == built.structure
+    assert json.loads(hit.body)['data'][0]['y'] == [3, 5]
+
+
+def test_raw_json_is_spliced_into_the_response():
+    entry = FigureCache().get_or_create('key', bar_figure)
+    # Called directly, outside a request, the figure itself comes back
+    assert raw_json(entry.body, entry.figure) is entry.figure
+
+    server = Flask(__name__)
+    with server.test_request_context('/_dash-update-component'):
+        placeholder = raw_json(entry.body, entry.figure)
+        response = splice_raw_json(Response(json.dumps({'figure': placeholder}), mimetype='application/json'))
+    assert json.loads(response.get_data())['figure'] == json.loads(entry.body)
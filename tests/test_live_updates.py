@@ -0,0 +1,84 @@
+import json
+import os
+from unittest import mock
+
+import dash
+import pandas as pd
+import pytest
+
+from data_backend import PandasBackend
+from dataset_registry import DatasetRegistry
+from live_updates import DataWatcher, EventBroadcaster
+
+app = pytest.importorskip('app')
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'sample_tickets.csv')
+
+
+class Triggered:
+    def __init__(self, triggered_id):
+        self.triggered_id = triggered_id
+
+
+@pytest.fixture
+def growing_source(tmp_path):
+    """A ticket file holding the oldest 900 sample tickets; call the result to append the rest"""
+    tickets = pd.read_csv(SAMPLE).sort_values('created_date')
+    path = tmp_path / 'tickets.csv'
+    tickets.iloc[:900].to_csv(path, index=False)
+
+    def append():
+        tickets.iloc[900:].to_csv(path, mode='a', header=False, index=False)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    append.path = str(path)
+    return append
+
+
+def event(message):
+    name, data = message.strip().split('\n')
+    return name[len('event: '):], json.loads(data[len('data: '):])
+
+
+def test_data_change_is_pushed_to_the_event_stream(growing_source):
+    registry = DatasetRegistry({'support': growing_source.path}, loader=PandasBackend.from_path)
+    registry.get()
+    broadcaster = EventBroadcaster(heartbeat_seconds=1)
+    watcher = DataWatcher(registry, broadcaster)
+    stream = broadcaster.stream()
+
+    name, versions = event(next(stream))
+    assert name == 'data-version' and versions == registry.versions()
+
+    assert not watcher.check_data()
+    growing_source()
+    assert watcher.check_data()
+    name, updated = event(next(stream))
+    assert name == 'data-version' and updated['support'] != versions['support']
+    assert updated == registry.versions()
+
+
+def test_date_range_through_the_latest_ticket_follows_new_tickets(growing_source):
+    registry = DatasetRegistry({'support': growing_source.path}, loader=PandasBackend.from_path)
+    first, latest = registry.get().date_bounds()
+    growing_source()
+    registry.refresh('support')
+    new_latest = registry.get().date_bounds()[1]
+
+    def data_version_change(end_date):
+        with mock.patch.object(app, 'registry', registry), \
+                mock.patch.object(dash, 'callback_context', Triggered('data-version')):
+            return app.update_dataset_filters('support', registry.versions(), end_date, str(latest))
+
+    outputs = data_version_change(str(latest.date()))
+    assert outputs[1] == new_latest and outputs[2] == str(new_latest)
+    assert outputs[0] is dash.no_update and all(value is dash.no_update for value in outputs[3:])
+
+    # A range the user ended earlier stays where it is
+    outputs = data_version_change(str(first.date()))
+    assert outputs[1] is dash.no_update and outputs[2] == str(new_latest)
+
+
+def test_layout_is_built_from_current_data():
+    assert callable(app.app.layout)
+    latest = app.registry.get().date_bounds()[1]
+    assert str(latest) in json.dumps(app.app.layout().to_plotly_json(), default=str)
@@ -0,0 +1,60 @@
+import os
+
+import pandas as pd
+import pytest
+
+from data_backend import OPEN_STATUSES, PandasBackend
+from partition_store import write_partitions
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'sample_tickets.csv')
+
+
+def test_parquet_partitions_store_timestamps(tmp_path):
+    pytest.importorskip('pyarrow')
+    # Read like the CLI's callers might, with dates left as strings
+    manifest = write_partitions(pd.read_csv(SAMPLE), str(tmp_path), 'parquet')
+
+    part = pd.read_parquet(tmp_path / manifest['partitions'][0]['path'])
+    assert pd.api.types.is_datetime64_any_dtype(part['created_date'])
+    assert pd.api.types.is_datetime64_any_dtype(part['resolved_date'])
+
+
+def test_duckdb_backend_over_parquet_store(tmp_path):
+    pytest.importorskip('pyarrow')
+    pytest.importorskip('duckdb')
+    from data_backend import DuckDBBackend
+
+    write_partitions(pd.read_csv(SAMPLE), str(tmp_path), 'parquet')
+    duck = DuckDBBackend(str(tmp_path))
+    pandas = PandasBackend.from_path(str(tmp_path))
+
+    start, end = '2025-02-01', '2025-04-30'
+    for args in [(None, None, 'all', 'all', 'all'), (start, end, 'High', 'all', 'all')]:
+        expected = pandas.aggregate(*args)
+        result = duck.aggregate(*args)
+        assert result['total'] == expected['total'] > 0
+        pd.testing.assert_frame_equal(result['cube'].sort_index(), expected['cube'].sort_index(),
+                                      check_dtype=False, check_index_type=False)
+
+
+def test_partitions_split_frames_with_duplicate_index_labels(tmp_path):
+    df = pd.read_csv(SAMPLE)
+    # Appended batches keep their own index, so labels repeat
+    appended = pd.concat([df, df.head(50)])
+    manifest = write_partitions(appended, str(tmp_path), 'csv')
+
+    assert sum(p['rows'] for p in manifest['partitions']) == len(appended)
+    written = pd.concat(pd.read_csv(tmp_path / p['path']) for p in manifest['partitions'])
+    assert sorted(written['ticket_id']) == sorted(appended['ticket_id'])
+
+
+def test_open_tickets_of_a_store_leave_partitions_unloaded(tmp_path):
+    df = pd.read_csv(SAMPLE)
+    write_partitions(df, str(tmp_path), 'csv')
+    backend = PandasBackend.from_path(str(tmp_path))
+    backend.aggregate('2025-03-01', '2025-03-31')
+    loaded = set(backend._partitions)
+
+    open_tickets = backend.open_tickets()
+    assert sorted(open_tickets['ticket_id']) == sorted(df[df['status'].isin(OPEN_STATUSES)]['ticket_id'])
+    assert set(backend._partitions) == loaded
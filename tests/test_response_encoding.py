@@ -0,0 +1,62 @@
+import gzip
+import json
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from flask import Flask, Response
+
+import response_encoding
+from response_encoding import ResponseCompressor, dumps, figure_to_dict, loads
+
+
+def trend_figure():
+    days = pd.date_range('2025-01-01', periods=30).to_numpy()
+    return go.Figure(go.Scatter(x=days, y=np.arange(30, dtype=np.int64), customdata=np.linspace(0, 1, 30)))
+
+
+def test_figures_serialize_the_same_without_orjson():
+    value = {'figure': figure_to_dict(trend_figure()), 'count': np.int64(3)}
+    encoded = dumps(value, sort_keys=True)
+
+    with mock.patch.object(response_encoding, 'orjson', None):
+        plain = figure_to_dict(trend_figure())
+        assert all(not isinstance(item, np.ndarray) for item in plain['data'][0].values())
+        # Dates stay dates rather than nanosecond integers
+        assert plain['data'][0]['x'][0] == pd.Timestamp('2025-01-01')
+        fallback = dumps({**value, 'figure': plain}, sort_keys=True)
+        assert loads(fallback) == json.loads(fallback)
+
+    assert json.loads(fallback) == json.loads(encoded)
+
+
+def compressed_response(accept_encoding):
+    server = Flask(__name__)
+    compressor = ResponseCompressor(['/_dash-update-component'], min_bytes=100)
+    body = json.dumps({'response': {'values': list(range(500))}})
+    with server.test_request_context('/_dash-update-component', headers={'Accept-Encoding': accept_encoding}):
+        response = compressor.compress(Response(body, mimetype='application/json'))
+    return response, body, compressor
+
+
+def test_gzip_is_used_without_brotli():
+    with mock.patch.object(response_encoding, 'brotli', None):
+        response, body, compressor = compressed_response('br, gzip')
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.get_data()).decode('utf-8') == body
+    assert compressor.stats()['encodings']['gzip']['responses'] == 1
+
+    # Nothing the client accepts: the response goes out as it is
+    with mock.patch.object(response_encoding, 'brotli', None):
+        response, body, compressor = compressed_response('br')
+    assert 'Content-Encoding' not in response.headers and response.get_data().decode('utf-8') == body
+
+
+def test_brotli_is_preferred_when_installed():
+    fake = mock.Mock()
+    fake.compress.side_effect = lambda data, quality: b'br:' + data[:10]
+    with mock.patch.object(response_encoding, 'brotli', fake):
+        response, body, _ = compressed_response('br, gzip')
+    assert response.headers['Content-Encoding'] == 'br'
+    assert response.get_data() == b'br:' + body.encode('utf-8')[:10]
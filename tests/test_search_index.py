@@ -0,0 +1,90 @@
+import os
+import threading
+from unittest import mock
+
+import pandas as pd
+import pytest
+
+from data_backend import DuckDBBackend, PandasBackend, duckdb, load_data
+from search_index import MAX_PREFIX_TERMS, SearchIndex
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'sample_tickets.csv')
+
+
+def build_index(words):
+    index = SearchIndex()
+    index.add(pd.DataFrame({
+        'ticket_id': [f'TKT-{i:06d}' for i in range(len(words))],
+        'title': words,
+        'description': '',
+        'created_date': pd.Timestamp('2025-01-01'),
+        'priority': 'High',
+        'department': 'IT',
+        'status': 'Open'
+    }))
+    return index
+
+
+def test_prefix_expansion_flags_truncation():
+    words = [f'ab{i:04d}' for i in range(MAX_PREFIX_TERMS + 44)]
+    index = build_index(words)
+
+    rows, truncated = index.match('ab')
+    assert truncated
+    assert len(rows) == MAX_PREFIX_TERMS
+
+    # A longer prefix narrows the expansion below the cap and finds every match
+    rows, truncated = index.match('ab02')
+    assert not truncated
+    assert len(rows) == sum(word.startswith('ab02') for word in words)
+
+
+def write_tickets(path, tickets, mode='w'):
+    tickets.to_csv(path, mode=mode, header=mode == 'w', index=False)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.mark.skipif(duckdb is None, reason="duckdb is not installed")
+def test_duckdb_refresh_extends_the_index_with_appended_tickets(tmp_path):
+    tickets = pd.read_csv(SAMPLE).sort_values('created_date')
+    path = tmp_path / 'tickets.csv'
+    write_tickets(path, tickets.iloc[:900])
+    backend = DuckDBBackend(str(path))
+    index = backend.search_index(wait=True)
+    assert len(index) == 900
+
+    write_tickets(path, tickets.iloc[900:], mode='a')
+    assert backend.refresh()
+    assert backend.search_indexed and backend.search_index() is index
+    assert len(index) == 1000
+    newest = tickets.iloc[-1]
+    result = backend.search(newest['title'], None, None)
+    assert newest['ticket_id'] in set(result['tickets']['ticket_id'])
+
+
+def test_rebuild_runs_once_and_keeps_serving_the_previous_index():
+    backend = PandasBackend(load_data(SAMPLE))
+    term = backend.df['title'].iloc[0].split()[0]
+    previous = backend.search_index(wait=True)
+    backend.version = 'rewritten'
+
+    release, builds = threading.Event(), []
+    original = SearchIndex.from_frames
+
+    def slow_build(frames):
+        builds.append(1)
+        release.wait(5)
+        return original(frames)
+
+    with mock.patch.object(SearchIndex, 'from_frames', side_effect=slow_build):
+        answers = [backend.search_index() for _ in range(5)]
+        result = backend.search(term, None, None)
+        assert all(answer is previous for answer in answers)
+        assert result['indexing'] and result['count'] > 0
+        release.set()
+        rebuilt = backend.search_index(wait=True)
+
+    assert len(builds) == 1
+    assert rebuilt is not previous and backend.search_indexed
+    assert not backend.search(term, None, None)['indexing']
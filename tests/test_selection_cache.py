@@ -0,0 +1,17 @@
+from selection_cache import SelectionCache
+
+
+def test_discard_drops_dataset_entries_and_in_flight_results():
+    cache = SelectionCache()
+    cache.get_or_compute(('support', 1), lambda: 'support')
+    cache.get_or_compute(('hr', 1), lambda: 'hr')
+
+    def compute_then_discard():
+        # The dataset is dropped while its selection is still being computed
+        assert cache.discard('support') == 1
+        return 'stale'
+
+    assert cache.get_or_compute(('support', 2), compute_then_discard) == 'stale'
+    assert cache.stats()['entries'] == 1
+    assert cache.get_or_compute(('support', 2), lambda: 'fresh') == 'fresh'
+    assert cache.get_or_compute(('hr', 1), lambda: 'recomputed') == 'hr'
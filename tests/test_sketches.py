@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from data_backend import PandasBackend, day_range, load_data
+from sketches import DistinctSketch, QuantileSketch, SEGMENT_COLUMNS, split_days
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'sample_tickets.csv')
+ALL = {'priority': 'all', 'department': 'all', 'status': 'all'}
+
+
+def test_quantile_sketch_add_matches_rebuild():
+    df = load_data(SAMPLE).sort_values('created_date')
+    sketch = QuantileSketch.from_frame(df.iloc[:-50], 'resolution_hours')
+    sketch.add(df.iloc[-50:], 'resolution_hours')
+
+    rebuilt = QuantileSketch.from_frame(df, 'resolution_hours')
+    assert sketch.summary(None, None, ALL, [50, 90, 99]) == rebuilt.summary(None, None, ALL, [50, 90, 99])
+
+
+def test_quantile_sketch_caps_centroids_per_segment():
+    df = load_data(SAMPLE)
+    df = pd.concat([df] * 20, ignore_index=True)
+    df['resolution_hours'] = np.random.default_rng(0).exponential(24, len(df))
+    sketch = QuantileSketch.from_frame(df, 'resolution_hours', compression=20)
+
+    per_segment = sketch.centroids.groupby(SEGMENT_COLUMNS, observed=True).size()
+    assert per_segment.max() <= 20 // 2 + 1
+    assert sketch.centroids['weight'].sum() == df['resolution_hours'].notna().sum()
+
+
+def test_split_days_separates_whole_months_from_edges():
+    first_day, last_day = day_range('2025-02-10', '2025-06-20')
+    months, edges = split_days(first_day, last_day)
+
+    assert months == day_range('2025-03-01', '2025-06-01')
+    assert edges == [day_range('2025-02-10', '2025-03-01'), day_range('2025-06-01', '2025-06-20')]
+    assert split_days(*day_range('2025-02-10', '2025-02-20')) == (None, [day_range('2025-02-10', '2025-02-20')])
+
+
+def test_resolution_summary_combines_months_and_edge_days():
+    backend = PandasBackend(load_data(SAMPLE))
+    df = backend.df
+
+    for start, end, predicates in [('2025-02-10', '2025-06-20', None),
+                                   ('2025-02-10', '2025-06-20', {'created_weekday': 'Tuesday'})]:
+        selected = df[(df['created_date'] >= start) & (df['created_date'] < end)]
+        if predicates:
+            selected = selected[selected['created_weekday'] == predicates['created_weekday']]
+        selected = selected['resolution_hours'].dropna()
+        summary = backend.resolution_summary(start, end, predicates=predicates)
+
+        assert summary['count'] == len(selected)
+        assert np.isclose(summary['mean'], selected.mean())
+        expected = np.percentile(selected, [50, 90, 99])
+        assert np.allclose(list(summary['percentiles'].values()), expected, rtol=0.05)
+
+
+def test_distinct_sketch_add_matches_rebuild():
+    df = load_data(SAMPLE).sort_values('created_date')
+    sketch = DistinctSketch.from_frame(df.iloc[:-50], 'requester')
+    sketch.add(df.iloc[-50:], 'requester')
+
+    rebuilt = DistinctSketch.from_frame(df, 'requester')
+    order = sketch.segments.astype({column: object for column in SEGMENT_COLUMNS[1:]}) \
+        .sort_values(SEGMENT_COLUMNS).index
+    rebuilt_order = rebuilt.segments.astype({column: object for column in SEGMENT_COLUMNS[1:]}) \
+        .sort_values(SEGMENT_COLUMNS).index
+    np.testing.assert_array_equal(sketch.registers[order], rebuilt.registers[rebuilt_order])
+    np.testing.assert_array_equal(sketch.segments['values'].to_numpy()[order],
+                                  rebuilt.segments['values'].to_numpy()[rebuilt_order])
+    assert sketch.count(None, None, ALL) == rebuilt.count(None, None, ALL)
+
+
+def test_distinct_counts_never_exceed_tickets():
+    backend = PandasBackend(load_data(SAMPLE))
+    df = backend.df
+
+    counts = backend.distinct_counts(None, None)
+    assert counts['requesters'] <= len(df)
+    assert abs(counts['requesters'] - df['requester'].nunique()) <= 0.05 * df['requester'].nunique()
+    assert backend.distinct_counts('2025-03-03', '2025-03-04')['requesters'] == \
+        df[df['created_date'].dt.strftime('%Y-%m-%d') == '2025-03-03']['requester'].nunique()
@@ -0,0 +1,55 @@
+import pandas as pd
+
+from sla_timers import SlaTimerService, timer_lock_path
+
+
+class RecordingN8n:
+    def __init__(self):
+        self.payloads = []
+
+    def trigger_workflow(self, workflow, payload):
+        self.payloads.append((workflow, payload))
+
+
+def open_tickets(hours_ago, ticket_ids):
+    now = pd.Timestamp.now()
+    return pd.DataFrame({
+        'ticket_id': ticket_ids,
+        'title': 'Printer offline',
+        'priority': 'Critical',
+        'department': 'IT',
+        'status': 'Open',
+        'assignee': 'agent',
+        'requester': 'user',
+        'created_date': [now - pd.Timedelta(hours=hours) for hours in hours_ago],
+        'sla_target_hours': 4.0
+    })
+
+
+def test_first_sync_takes_past_deadlines_as_fired(tmp_path):
+    timers = SlaTimerService(RecordingN8n(), lock_path=str(tmp_path / 'sla.lock'))
+    # Breached before the process started: no timers; warned but not yet breached: breach only
+    tickets = open_tickets([10, 3.5, 10], ['T-1', 'T-2', 'T-3'])
+    assert timers.sync('support', tickets.iloc[:2])['added'] == 2
+    assert timers.stats()['pending_timers'] == 1
+
+    # A later sync only looks at changed rows; a new overdue ticket still fires
+    result = timers.sync('support', tickets.iloc[1:])
+    assert result == {'added': 1, 'removed': 1, 'tracked': 2}
+    assert timers._take_due(pd.Timestamp.now().timestamp())[0][1]['ticket_id'] == 'T-3'
+
+
+def test_one_process_claims_the_timers(tmp_path):
+    first = SlaTimerService(RecordingN8n(), lock_path=str(tmp_path / 'sla.lock'))
+    second = SlaTimerService(RecordingN8n(), lock_path=str(tmp_path / 'sla.lock'))
+    assert first.claim() and not second.claim()
+
+
+def test_lock_path_is_named_after_the_sources(monkeypatch):
+    monkeypatch.delenv('DASHBOARD_SLA_LOCK_PATH', raising=False)
+    support = timer_lock_path({'default': 'data/support.csv'})
+    assert support == timer_lock_path({'default': 'data/support.csv'})
+    assert support != timer_lock_path({'default': 'data/hr_tickets'})
+
+    monkeypatch.setenv('DASHBOARD_SLA_LOCK_PATH', '/run/dashboard/sla.lock')
+    assert timer_lock_path({'default': 'data/support.csv'}) == '/run/dashboard/sla.lock'
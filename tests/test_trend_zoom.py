@@ -0,0 +1,45 @@
+from unittest import mock
+
+import dash
+import numpy as np
+import pandas as pd
+import pytest
+
+app = pytest.importorskip('app')
+
+
+class TrendRelayout:
+    """Callback context of a relayout event on the trend chart"""
+    triggered_id = 'ticket-trends-chart'
+
+
+def trend_update(relayout_data):
+    first, last = app.registry.get().date_bounds()
+    filters = (None, str(first.date()), str(last.date()), 'all', 'all', 'all', None, {})
+    with mock.patch.object(dash, 'callback_context', TrendRelayout()):
+        figure, _ = app.update_ticket_trends(*filters, relayout_data, None)
+    return figure
+
+
+def trace_dates(figure):
+    return pd.to_datetime(np.asarray(figure['data'][0]['x']))
+
+
+def test_zoom_then_reset_restores_full_range():
+    full = trace_dates(trend_update({'xaxis.autorange': True}))
+
+    zoomed = trace_dates(trend_update({'xaxis.range[0]': '2025-03-01', 'xaxis.range[1]': '2025-03-15'}))
+    assert zoomed.min() >= pd.Timestamp('2025-03-01')
+    # The day bucket holding the window's end is included
+    assert zoomed.max() <= pd.Timestamp('2025-03-16')
+    assert len(zoomed) < len(full)
+
+    # Double-click and the "all" button send autorange; clearing the range resets too
+    for reset in ({'xaxis.autorange': True, 'yaxis.autorange': True}, {'xaxis.range': None}):
+        restored = trace_dates(trend_update(reset))
+        assert restored.equals(full)
+
+
+def test_relayout_without_x_axis_change_skips_update():
+    assert trend_update({'autosize': True}) is dash.no_update
+    assert trend_update({'yaxis.range[0]': 0, 'yaxis.range[1]': 10}) is dash.no_update